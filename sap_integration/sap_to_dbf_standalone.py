@@ -34,108 +34,221 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ============================================================================
-# Iran System Encoding (کپی شده از iran_system_encoding.py)
+# Iran System Encoding (کپی شده از iran_system_encoding.py با tools/vendor_encoder.py)
 # ============================================================================
 
-class IranSystemEncoder:
-    """تبدیل متن فارسی به Iran System encoding"""
-
-    def __init__(self):
-        # جدول تبدیل حروف فارسی به Iran System encoding
-        self.persian_map = {
-            # حروف اصلی
-            'ا': {'isolated': 0x80, 'final': 0x81},
-            'آ': {'isolated': 0x82, 'final': 0x83},
-            'ب': {'isolated': 0x84, 'final': 0x85, 'initial': 0x86, 'medial': 0x87},
-            'پ': {'isolated': 0x88, 'final': 0x89, 'initial': 0x8A, 'medial': 0x8B},
-            'ت': {'isolated': 0x8C, 'final': 0x8D, 'initial': 0x8E, 'medial': 0x8F},
-            'ث': {'isolated': 0x90, 'final': 0x91, 'initial': 0x92, 'medial': 0x93},
-            'ج': {'isolated': 0x94, 'final': 0x95, 'initial': 0x96, 'medial': 0x97},
-            'چ': {'isolated': 0x98, 'final': 0x99, 'initial': 0x9A, 'medial': 0x9B},
-            'ح': {'isolated': 0x9C, 'final': 0x9D, 'initial': 0x9E, 'medial': 0x9F},
-            'خ': {'isolated': 0xA0, 'final': 0xA1, 'initial': 0xA2, 'medial': 0xA3},
-            'د': {'isolated': 0xA4, 'final': 0xA5},
-            'ذ': {'isolated': 0xA6, 'final': 0xA7},
-            'ر': {'isolated': 0xA8, 'final': 0xA9},
-            'ز': {'isolated': 0xAA, 'final': 0xAB},
-            'ژ': {'isolated': 0xAC, 'final': 0xAD},
-            'س': {'isolated': 0xAE, 'final': 0xAF, 'initial': 0xB0, 'medial': 0xB1},
-            'ش': {'isolated': 0xB2, 'final': 0xB3, 'initial': 0xB4, 'medial': 0xB5},
-            'ص': {'isolated': 0xB6, 'final': 0xB7, 'initial': 0xB8, 'medial': 0xB9},
-            'ض': {'isolated': 0xBA, 'final': 0xBB, 'initial': 0xBC, 'medial': 0xBD},
-            'ط': {'isolated': 0xBE, 'final': 0xBF, 'initial': 0xC0, 'medial': 0xC1},
-            'ظ': {'isolated': 0xC2, 'final': 0xC3, 'initial': 0xC4, 'medial': 0xC5},
-            'ع': {'isolated': 0xC6, 'final': 0xC7, 'initial': 0xC8, 'medial': 0xC9},
-            'غ': {'isolated': 0xCA, 'final': 0xCB, 'initial': 0xCC, 'medial': 0xCD},
-            'ف': {'isolated': 0xCE, 'final': 0xCF, 'initial': 0xD0, 'medial': 0xD1},
-            'ق': {'isolated': 0xD2, 'final': 0xD3, 'initial': 0xD4, 'medial': 0xD5},
-            'ک': {'isolated': 0xD6, 'final': 0xD7, 'initial': 0xD8, 'medial': 0xD9},
-            'گ': {'isolated': 0xDA, 'final': 0xDB, 'initial': 0xDC, 'medial': 0xDD},
-            'ل': {'isolated': 0xDE, 'final': 0xDF, 'initial': 0xE0, 'medial': 0xE1},
-            'م': {'isolated': 0xE2, 'final': 0xE3, 'initial': 0xE4, 'medial': 0xE5},
-            'ن': {'isolated': 0xE6, 'final': 0xE7, 'initial': 0xE8, 'medial': 0xE9},
-            'و': {'isolated': 0xEA, 'final': 0xEB},
-            'ه': {'isolated': 0xEC, 'final': 0xED, 'initial': 0xEE, 'medial': 0xEF},
-            'ی': {'isolated': 0xF0, 'final': 0xF1, 'initial': 0xF2, 'medial': 0xF3},
-            'ئ': {'isolated': 0xF4, 'final': 0xF5, 'initial': 0xF6, 'medial': 0xF7},
-        }
-
-        # حروفی که به بعدی وصل می‌شوند
-        self.joining_chars = set(self.persian_map.keys()) - {'ا', 'آ', 'د', 'ذ', 'ر', 'ز', 'ژ', 'و'}
-
-    def normalize_digits(self, text):
-        """تبدیل اعداد فارسی به انگلیسی"""
-        persian_digits = '۰۱۲۳۴۵۶۷۸۹'
-        english_digits = '0123456789'
-        trans_table = str.maketrans(persian_digits, english_digits)
-        return text.translate(trans_table)
-
-    def get_char_form(self, char, prev_char, next_char):
-        """تشخیص فرم حرف (isolated, initial, medial, final)"""
-        if char not in self.persian_map:
-            return 'isolated'
-
-        can_join_prev = prev_char in self.joining_chars if prev_char else False
-        can_join_next = next_char in self.joining_chars if next_char else False
-
-        if can_join_prev and can_join_next:
-            return 'medial'
-        elif can_join_prev:
-            return 'final'
-        elif can_join_next:
-            return 'initial'
-        else:
-            return 'isolated'
-
-    def encode(self, text):
-        """تبدیل متن فارسی به Iran System encoding"""
-        if not text:
-            return b''
-
-        # تبدیل اعداد فارسی
-        text = self.normalize_digits(str(text))
+# BEGIN VENDORED iran_system_encoding
+# Generated by tools/vendor_encoder.py from src/utils/iran_system_encoding.py
+# Do not edit by hand - change the encoder and run the vendor script again.
+
+_IS_NORMALIZATION_TABLE = {
+    160: ' ',
+    1568: 'ي',
+    1595: 'ك',
+    1596: 'ك',
+    1597: 'ي',
+    1598: 'ي',
+    1599: 'ي',
+    1611: None,
+    1612: None,
+    1613: None,
+    1614: None,
+    1615: None,
+    1616: None,
+    1617: None,
+    1618: None,
+    1632: '0',
+    1633: '1',
+    1634: '2',
+    1635: '3',
+    1636: '4',
+    1637: '5',
+    1638: '6',
+    1639: '7',
+    1640: '8',
+    1641: '9',
+    1648: None,
+    1649: 'ا',
+    1705: 'ك',
+    1706: 'ك',
+    1707: 'ك',
+    1708: 'ك',
+    1709: 'ك',
+    1710: 'ك',
+    1728: 'ه',
+    1729: 'ه',
+    1740: 'ي',
+    1741: 'ي',
+    1744: 'ي',
+    1746: 'ي',
+    1749: 'ه',
+    1776: '0',
+    1777: '1',
+    1778: '2',
+    1779: '3',
+    1780: '4',
+    1781: '5',
+    1782: '6',
+    1783: '7',
+    1784: '8',
+    1785: '9',
+    8204: ' ',
+    8205: None,
+}
+
+_IS_PREV_CLASS = tuple(flag << 9 for flag in bytes.fromhex(
+    '00010101010101010000000101000101010101010101010101010100010101010000000000000000000000000000000000000000000000000000000000000000'
+    '00000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000'
+    '01010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010100'
+    '01010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101'))
+
+_IS_NEXT_CLASS = tuple(flag << 8 for flag in bytes.fromhex(
+    '00010101010101010000000101000101010101010101010101010100010101010000000000000000000000000000000000000000000000000000000000000000'
+    '00000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000'
+    '01010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010100'
+    '01010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101010101'))
+
+_IS_FORM_TABLE = bytes.fromhex(
+    '000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f202122232425262729282a2b2c2d2e2f808182838485868788893a3b3c3d3e3f'
+    '404142434445464748494a4b4c4d4e4f505152535455565758595a5d5c5b5e5f606162636465666768696a6b6c6d6e6f707172737475767778797a7d7c7b7e7f'
+    '809482838485868788898a8b8c9ca68fef91929394959697ed999a9b9c9d9e9fa08aa2a3a4a5a6a7a8a9aaabacadaeafb0b1b2b3b4b5b6b7b8b9babbbcbdbe8c'
+    'c08f8d90f890c6c792f996989a9ea0a2a3a4a5a7a9abadd7afe0e1e58be9ebede0f1e2f4f6f9f8e7e8e9eaebfdfdeeeff0f1f2f3f4f5f6f7f8f9fafbfcfdfeff'
+    '000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f202122232425262729282a2b2c2d2e2f808182838485868788893a3b3c3d3e3f'
+    '404142434445464748494a4b4c4d4e4f505152535455565758595a5d5c5b5e5f606162636465666768696a6b6c6d6e6f707172737475767778797a7d7c7b7e7f'
+    '809582838485868788898a8b8c9da68ff091929394959697ee999a9b9c9d9e9fa08aa2a3a4a5a6a7a8a9aaabacadaeafb0b1b2b3b4b5b6b7b8b9babbbcbdbe8c'
+    'c08f8d90f890fe9093fb97999b9fa1a2a3a4a5a8aaacaed7afe0e4e88beaeceee0f3e2f5f7fbf8e7e8e9eaebfefeeeeff0f1f2f3f4f5f6f7f8f9fafbfcfdfeff'
+    '000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f202122232425262729282a2b2c2d2e2f808182838485868788893a3b3c3d3e3f'
+    '404142434445464748494a4b4c4d4e4f505152535455565758595a5d5c5b5e5f606162636465666768696a6b6c6d6e6f707172737475767778797a7d7c7b7e7f'
+    '809482838485868788898a8b8c9ca68fef91929394959697ed999a9b9c9d9e9fa08aa2a3a4a5a6a7a8a9aaabacadaeafb0b1b2b3b4b5b6b7b8b9babbbcbdbe8c'
+    'c08f8d91f891fc9192f996989a9ea0a2a3a4a5a7a9abadd7afe0e2e68be9ebede0f1e2f4f6f9f8e7e8e9eaebfcfceeeff0f1f2f3f4f5f6f7f8f9fafbfcfdfeff'
+    '000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f202122232425262729282a2b2c2d2e2f808182838485868788893a3b3c3d3e3f'
+    '404142434445464748494a4b4c4d4e4f505152535455565758595a5d5c5b5e5f606162636465666768696a6b6c6d6e6f707172737475767778797a7d7c7b7e7f'
+    '809582838485868788898a8b8c9da68ff091929394959697ee999a9b9c9d9e9fa08aa2a3a4a5a6a7a8a9aaabacadaeafb0b1b2b3b4b5b6b7b8b9babbbcbdbe8c'
+    'c08f8d91f8918e9193fa97999b9fa1a2a3a4a5a8aaacaed7afe0e3e78beaeceee0f3e2f5f7faf8e7e8e9eaebfefeeeeff0f1f2f3f4f5f6f7f8f9fafbfcfdfeff')
 
-        # معکوس کردن ترتیب کاراکترها (visual order)
-        text = text[::-1]
 
-        result = bytearray()
-
-        for i, char in enumerate(text):
-            if char in self.persian_map:
-                prev_char = text[i-1] if i > 0 else None
-                next_char = text[i+1] if i < len(text)-1 else None
+class IranSystemEncoder:
+    """تبدیل متن فارسی به Iran System encoding (same engine as iran_system_encoding.py)"""
+
+    def __init__(self, cache_size=8192):
+        self.cache_size = cache_size
+        self.cache = {}
+
+    @staticmethod
+    def unicode_to_iran_system(text):
+        """Convert Unicode Persian text to Iran System encoding"""
+        normalized = text.translate(_IS_NORMALIZATION_TABLE)
+        if not normalized:
+            return b'  '
+
+        src = (" " + normalized + " ").encode('cp1256', errors='replace')
+        prev_class = _IS_PREV_CLASS
+        next_class = _IS_NEXT_CLASS
+        forms = _IS_FORM_TABLE
+        result = bytes([forms[prev_class[p] | next_class[n] | c]
+                        for p, c, n in zip(src, src[1:], src[2:])])
+
+        # لا ligature
+        if b'\xf3\x91' in result:
+            result = result.replace(b'\xf3\x91', b'\xf2')
+
+        # Reverse for RTL (unless it's a number)
+        if not text.strip().replace(' ', '').isdigit():
+            result = result[::-1]
+        return result
 
-                form = self.get_char_form(char, prev_char, next_char)
-                char_map = self.persian_map[char]
+    def encode(self, text):
+        """تبدیل متن فارسی به Iran System encoding (cached)"""
+        result = self.cache.get(text)
+        if result is None:
+            result = self.unicode_to_iran_system(text)
+            if len(self.cache) < self.cache_size:
+                self.cache[text] = result
+        return result
+# END VENDORED iran_system_encoding
 
-                # اگر فرم مورد نظر وجود نداره، از isolated استفاده کن
-                byte_value = char_map.get(form, char_map.get('isolated', 0x20))
-                result.append(byte_value)
-            else:
-                # کاراکترهای غیر فارسی (اعداد، فضا، علائم)
-                result.append(ord(char) if ord(char) < 128 else 0x20)
+# ============================================================================
+# SSO Schema (کپی شده از sso_schema.py با tools/vendor_encoder.py)
+# ============================================================================
 
-        return bytes(result)
+# BEGIN VENDORED sso_schema
+# Generated by tools/vendor_encoder.py from the 'sap-2024' schema of src/utils/sso_schema.py
+# Do not edit by hand - change the schema and run the vendor script again.
+
+_HEADER_FIELDS = [
+    ('DSK_ID', 'C', 10, 0),
+    ('DSK_NAME', 'C', 30, 0),
+    ('DSK_FARM', 'C', 30, 0),
+    ('DSK_ADRS', 'C', 40, 0),
+    ('DSK_KIND', 'N', 1, 0),
+    ('DSK_YY', 'N', 2, 0),
+    ('DSK_MM', 'N', 2, 0),
+    ('DSK_LISTNO', 'C', 12, 0),
+    ('DSK_DISC', 'C', 30, 0),
+    ('DSK_NUM', 'N', 5, 0),
+    ('DSK_TDD', 'N', 6, 0),
+    ('DSK_TROOZ', 'N', 12, 0),
+    ('DSK_TMAH', 'N', 12, 0),
+    ('DSK_TMAZ', 'N', 12, 0),
+    ('DSK_TMASH', 'N', 12, 0),
+    ('DSK_TTOTL', 'N', 12, 0),
+    ('DSK_TBIME', 'N', 12, 0),
+    ('DSK_TKOSO', 'N', 12, 0),
+    ('DSK_BIC', 'N', 12, 0),
+    ('DSK_RATE', 'N', 5, 0),
+    ('DSK_PRATE', 'N', 2, 0),
+    ('DSK_BIMH', 'N', 12, 0),
+    ('MON_PYM', 'C', 3, 0),
+    ('DSK_INC', 'N', 12, 0),
+    ('DSK_SPOUSE', 'N', 12, 0),
+]
+
+_WORKER_FIELDS = [
+    ('DSW_ID', 'C', 10, 0),
+    ('DSW_YY', 'C', 2, 0),
+    ('DSW_MM', 'C', 2, 0),
+    ('DSW_LISTNO', 'C', 11, 0),
+    ('DSW_ID1', 'C', 10, 0),
+    ('DSW_FNAME', 'C', 30, 0),
+    ('DSW_LNAME', 'C', 40, 0),
+    ('DSW_DNAME', 'C', 30, 0),
+    ('DSW_IDNO', 'C', 20, 0),
+    ('DSW_IDPLC', 'C', 30, 0),
+    ('DSW_IDATE', 'C', 8, 0),
+    ('DSW_BDATE', 'C', 8, 0),
+    ('DSW_SEX', 'C', 6, 0),
+    ('DSW_NAT', 'C', 12, 0),
+    ('DSW_OCP', 'C', 40, 0),
+    ('DSW_SDATE', 'C', 8, 0),
+    ('DSW_EDATE', 'C', 8, 0),
+    ('DSW_DD', 'N', 2, 0),
+    ('DSW_ROOZ', 'N', 13, 0),
+    ('DSW_MAH', 'N', 13, 0),
+    ('DSW_MAZ', 'N', 13, 0),
+    ('DSW_MASH', 'N', 13, 0),
+    ('DSW_TOTL', 'N', 13, 0),
+    ('DSW_BIME', 'N', 13, 0),
+    ('DSW_PRATE', 'C', 2, 0),
+    ('DSW_JOB', 'C', 6, 0),
+    ('PER_NATCOD', 'C', 10, 0),
+    ('DSW_INC', 'N', 13, 0),
+    ('DSW_SPOUSE', 'N', 13, 0),
+]
+
+_PERSIAN_FIELDS = {
+    'DSK_ADRS',
+    'DSK_DISC',
+    'DSK_FARM',
+    'DSK_NAME',
+    'DSW_DNAME',
+    'DSW_FNAME',
+    'DSW_IDPLC',
+    'DSW_LNAME',
+    'DSW_NAT',
+    'DSW_OCP',
+    'DSW_SEX',
+}
+# END VENDORED sso_schema
 
 # ============================================================================
 # DBF Creator (کپی شده از csv_to_dbf_complete.py)
@@ -144,6 +257,9 @@ class IranSystemEncoder:
 class DBFCreator:
     """ایجاد فایل DBF با Iran System encoding"""
 
+    # فیلدهای فارسی که با Iran System encode می‌شوند (بقیه ASCII هستند)
+    PERSIAN_FIELDS = _PERSIAN_FIELDS
+
     def __init__(self):
         self.encoder = IranSystemEncoder()
 
@@ -152,33 +268,7 @@ class DBFCreator:
         logger.info(f"Creating header file: {output_file}")
 
         # SSO 2024 structure: 25 fields
-        fields = [
-            ('DSK_ID', 'C', 10, 0),       # Workshop ID
-            ('DSK_NAME', 'C', 30, 0),     # Workshop name (Persian) - Changed: 60→30
-            ('DSK_FARM', 'C', 30, 0),     # Employer name (Persian) - Changed: 60→30
-            ('DSK_ADRS', 'C', 40, 0),     # Address (Persian) - Changed: 100→40
-            ('DSK_KIND', 'N', 1, 0),      # Kind
-            ('DSK_YY', 'N', 2, 0),        # Year - Changed: C→N
-            ('DSK_MM', 'N', 2, 0),        # Month - Changed: C→N
-            ('DSK_LISTNO', 'C', 12, 0),   # List number - Changed: 11→12
-            ('DSK_DISC', 'C', 30, 0),     # Description (Persian) - Changed: 11→30
-            ('DSK_NUM', 'N', 5, 0),       # Number of workers
-            ('DSK_TDD', 'N', 6, 0),       # Total days - Changed: 5→6
-            ('DSK_TROOZ', 'N', 12, 0),    # Total daily wage - Changed: 13→12
-            ('DSK_TMAH', 'N', 12, 0),     # Total monthly wage - Changed: 13→12
-            ('DSK_TMAZ', 'N', 12, 0),     # Total benefits - Changed: 13→12
-            ('DSK_TMASH', 'N', 12, 0),    # Total insurable - Changed: 13→12
-            ('DSK_TTOTL', 'N', 12, 0),    # Total amount - Changed: 13→12
-            ('DSK_TBIME', 'N', 12, 0),    # Total insurance - Changed: 13→12
-            ('DSK_TKOSO', 'N', 12, 0),    # Total deductions - Changed: 13→12
-            ('DSK_BIC', 'N', 12, 0),      # BIC code - Changed: 13→12
-            ('DSK_RATE', 'N', 5, 0),      # Rate - Changed: 2→5
-            ('DSK_PRATE', 'N', 2, 0),     # Rate percentage
-            ('DSK_BIMH', 'N', 12, 0),     # Insurance premium - Changed: 13→12
-            ('MON_PYM', 'C', 3, 0),       # Payment month - Changed: N→C, 2→3
-            ('DSK_INC', 'N', 12, 0),      # Total INC (جمع پایه سنواتی) - Excel: DSK_TINC
-            ('DSK_SPOUSE', 'N', 12, 0),   # Total SPOUS (جمع حق تاهل) - Excel: DSK_TSPOUS
-        ]
+        fields = _HEADER_FIELDS
 
         # Map Excel field names to SSO field names
         mapped_header = dict(header_data)
@@ -199,37 +289,7 @@ class DBFCreator:
         logger.info(f"  Workers count: {len(workers_data)}")
 
         # SSO 2024 structure: 29 fields
-        fields = [
-            ('DSW_ID', 'C', 10, 0),
-            ('DSW_YY', 'C', 2, 0),
-            ('DSW_MM', 'C', 2, 0),
-            ('DSW_LISTNO', 'C', 11, 0),
-            ('DSW_ID1', 'C', 10, 0),
-            ('DSW_FNAME', 'C', 30, 0),
-            ('DSW_LNAME', 'C', 40, 0),
-            ('DSW_DNAME', 'C', 30, 0),
-            ('DSW_IDNO', 'C', 20, 0),
-            ('DSW_IDPLC', 'C', 30, 0),
-            ('DSW_IDATE', 'C', 8, 0),
-            ('DSW_BDATE', 'C', 8, 0),
-            ('DSW_SEX', 'C', 6, 0),
-            ('DSW_NAT', 'C', 12, 0),
-            ('DSW_OCP', 'C', 40, 0),
-            ('DSW_SDATE', 'C', 8, 0),
-            ('DSW_EDATE', 'C', 8, 0),
-            ('DSW_DD', 'N', 2, 0),
-            ('DSW_ROOZ', 'N', 13, 0),
-            ('DSW_MAH', 'N', 13, 0),
-            ('DSW_MAZ', 'N', 13, 0),
-            ('DSW_MASH', 'N', 13, 0),
-            ('DSW_TOTL', 'N', 13, 0),
-            ('DSW_BIME', 'N', 13, 0),
-            ('DSW_PRATE', 'C', 2, 0),
-            ('DSW_JOB', 'C', 6, 0),
-            ('PER_NATCOD', 'C', 10, 0),
-            ('DSW_INC', 'N', 13, 0),
-            ('DSW_SPOUSE', 'N', 13, 0),
-        ]
+        fields = _WORKER_FIELDS
 
         self._write_dbf(output_file, fields, workers_data)
         logger.info(f"✅ Workers file created: {output_file}")
@@ -279,12 +339,15 @@ class DBFCreator:
                     value = record.get(field_name, '')
 
                     if field_type == 'C':
-                        # Text field با Iran System encoding
                         # Special handling for MON_PYM: keep it empty if value is 0 or empty
                         if field_name == 'MON_PYM' and (not value or value == 0 or str(value).strip() == '0'):
                             f.write(b' ' * field_length)
                         elif value and str(value).strip():
-                            encoded = self.encoder.encode(str(value))
+                            if field_name in self.PERSIAN_FIELDS:
+                                # Text field با Iran System encoding
+                                encoded = self.encoder.encode(str(value))
+                            else:
+                                encoded = str(value).encode('ascii', errors='replace')
                             if len(encoded) > field_length:
                                 encoded = encoded[:field_length]
                             elif len(encoded) < field_length:
@@ -5,12 +5,13 @@ SAP XLS to DBF Converter
 تبدیل مستقیم فایل‌های XLS خروجی SAP به DBF با Iran System encoding
 
 Usage:
-    python sap_xls_to_dbf.py <kar_xls> <wor_xls> <output_dir>
+    python sap_xls_to_dbf.py <kar_xls> <wor_xls> <output_dir> [--jobs N]
 
 Arguments:
     kar_xls    : فایل DSKKAR00.XLS از SAP
     wor_xls    : فایل DSKWOR00.XLS از SAP
     output_dir : مسیر خروجی فایل‌های DBF
+    --jobs N   : تعداد process برای encode لیست‌های بزرگ (پیش‌فرض: 1)
 
 Output:
     output_dir/DSKKAR00.DBF
@@ -227,14 +228,25 @@ def main():
     logger.info("=" * 80)
 
     # بررسی آرگومان‌ها
-    if len(sys.argv) != 4:
+    args = sys.argv[1:]
+    jobs = 1
+    if '--jobs' in args:
+        index = args.index('--jobs')
+        try:
+            jobs = int(args[index + 1])
+        except (IndexError, ValueError):
+            logger.error("--jobs needs a number")
+            sys.exit(1)
+        del args[index:index + 2]
+
+    if len(args) != 3:
         logger.error("Expected 3 arguments")
-        logger.error("Usage: sap_xls_to_dbf.py <kar_xls> <wor_xls> <output_dir>")
+        logger.error("Usage: sap_xls_to_dbf.py <kar_xls> <wor_xls> <output_dir> [--jobs N]")
         sys.exit(1)
 
-    kar_xls = Path(sys.argv[1])
-    wor_xls = Path(sys.argv[2])
-    output_dir = Path(sys.argv[3])
+    kar_xls = Path(args[0])
+    wor_xls = Path(args[1])
+    output_dir = Path(args[2])
 
     # بررسی وجود فایل‌ها
     if not kar_xls.exists():
@@ -272,7 +284,7 @@ def main():
         logger.info("Step 3: Converting CSV to DBF with Iran System encoding...")
 
         # ایجاد converter instance
-        converter = CompleteDBFConverter()
+        converter = CompleteDBFConverter(jobs=jobs)
 
         # خواندن CSV ها
         header_data = converter.read_csv(str(temp_kar_csv))[0]  # فقط ردیف اول
@@ -18,7 +18,7 @@ from typing import List, Dict, Any
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.iran_system_encoding import IranSystemEncoder
+from utils.sso_schema import SSOSchema, compile_schema, get_schema
 
 try:
     import dbf
@@ -28,43 +28,22 @@ except ImportError:
     sys.exit(1)
 
 
+# SSO format version of the generated file (see utils/sso_schema.py)
+DSKWOR_SCHEMA = get_schema('pre-2024')
+
+
 class DskworGenerator:
     """Generator for dskwor00.dbf (Worker Details File)"""
 
-    # Exact structure from real SSO DBF file
-    DSKWOR_FIELDS = """
-        DSW_ID C(10);
-        DSW_YY N(2,0);
-        DSW_MM N(2,0);
-        DSW_LISTNO C(12);
-        DSW_ID1 C(8);
-        DSW_FNAME C(20);
-        DSW_LNAME C(25);
-        DSW_DNAME C(20);
-        DSW_IDNO C(15);
-        DSW_IDPLC C(30);
-        DSW_IDATE C(8);
-        DSW_BDATE C(8);
-        DSW_SEX C(3);
-        DSW_NAT C(10);
-        DSW_OCP C(50);
-        DSW_SDATE C(8);
-        DSW_EDATE C(8);
-        DSW_DD N(2,0);
-        DSW_ROOZ N(12,0);
-        DSW_MAH N(12,0);
-        DSW_MAZ N(12,0);
-        DSW_MASH N(12,0);
-        DSW_TOTL N(12,0);
-        DSW_BIME N(12,0);
-        DSW_PRATE N(2,0);
-        DSW_KOSO N(12,0);
-        DSW_BIME20 N(12,0);
-        PER_NATCOD C(10);
-        DSW_JOB C(10);
-        DSW_INC N(19,0);
-        DSW_SPOUSE N(19,0)
-    """
+    # Exact structure from real SSO DBF file (dbf library spec string)
+    DSKWOR_FIELDS = SSOSchema.dbf_spec(DSKWOR_SCHEMA.worker_fields)
+
+    # Persian fields patched with raw Iran System bytes (name -> length)
+    PERSIAN_FIELDS = {
+        field_name: field_length
+        for field_name, field_type, field_length, field_decimal in DSKWOR_SCHEMA.worker_fields
+        if field_name in DSKWOR_SCHEMA.worker_persian_fields
+    }
 
     def __init__(self, output_dir: str = "output"):
         """
@@ -75,7 +54,7 @@ class DskworGenerator:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.encoder = IranSystemEncoder()
+        self.encoder = compile_schema(DSKWOR_SCHEMA.version).encoder
 
     def encode_persian_field(self, text: str, max_length: int) -> bytes:
         """
@@ -92,17 +71,9 @@ class DskworGenerator:
             # Return spaces for empty fields
             return b' ' * max_length
 
-        # Encode using Iran System
-        encoded = self.encoder.unicode_to_iran_system(text.strip())
-
-        # Pad or truncate to exact length
-        if len(encoded) > max_length:
-            encoded = encoded[:max_length]
-        elif len(encoded) < max_length:
-            # Pad with spaces on the right
-            encoded = encoded + (b' ' * (max_length - len(encoded)))
-
-        return encoded
+        # Encode using Iran System, truncated and padded with spaces
+        # on the right to the exact length
+        return self.encoder.encode(text.strip())[:max_length].ljust(max_length, b' ')
 
     def format_date(self, date_str: str) -> str:
         """
@@ -249,18 +220,21 @@ class DskworGenerator:
                 'DSW_SPOUSE': int(processed.get('DSW_SPOUSE', 0)),
             })
 
-            # Store encoded Persian data to patch later
-            if i == 1:  # Initialize on first worker
-                self.persian_patches = []
-
-            self.persian_patches.append({
-                'record_num': i - 1,
-                'DSW_FNAME': self.encode_persian_field(fname, 20),
-                'DSW_LNAME': self.encode_persian_field(lname, 25),
-                'DSW_DNAME': self.encode_persian_field(processed.get('DSW_DNAME', ''), 20),
-                'DSW_IDPLC': self.encode_persian_field(processed.get('DSW_IDPLC', ''), 30),
-                'DSW_OCP': self.encode_persian_field(processed.get('DSW_OCP', ''), 50),
-            })
+        # Encode Persian columns in bulk and store them to patch later
+        persian_columns = {
+            field_name: self.encoder.encode_column(
+                [worker.get(field_name, '') for worker in workers_data],
+                field_length,
+                strip=True
+            )
+            for field_name, field_length in self.PERSIAN_FIELDS.items()
+        }
+        self.persian_patches = []
+        for record_num in range(len(workers_data)):
+            patch = {'record_num': record_num}
+            for field_name, column in persian_columns.items():
+                patch[field_name] = column[record_num]
+            self.persian_patches.append(patch)
 
         # Close table
         table.close()
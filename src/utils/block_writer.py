@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Background Block Writer
+نوشتن بلوک‌های رکورد در یک thread جداگانه
+
+On slow storage (e.g. the NFS-mounted SAP transfer directory) every write
+blocks the thread that encodes the records. BlockWriter moves the writes to
+a dedicated thread: the encoder hands over filled blocks through a bounded
+queue and goes on encoding the next block while the previous one is written.
+
+    with open('dskwor00.dbf', 'wb') as f:
+        write_header(f)
+        with BlockWriter(f, depth=2) as writer:   # file-like: write/seek/tell
+            for chunk in chunks:
+                writer.write(encode(chunk))        # waits only if depth blocks are queued
+        f.write(b'\\x1A')
+
+Blocks are written in the order given, each at the position it was handed
+over at, so seek()/tell() behave as on the file. A block must not be
+changed after write() (bytes objects are safe).
+"""
+
+import queue
+import threading
+import time
+
+
+class BlockWriter:
+    """
+    File-like wrapper that writes blocks on a background thread
+
+    Attributes:
+        depth: Blocks that may wait in the queue (2 = double buffering)
+        blocks: Blocks handed over
+        bytes_written: Bytes handed over
+        wait_time: Seconds the producer waited for a free queue slot
+    """
+
+    def __init__(self, f, depth: int = 2):
+        """
+        Args:
+            f: Open binary file, written only by the writer thread until close()
+            depth: Queue size (at least 1)
+        """
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1, not {depth}")
+        self.depth = depth
+        self.blocks = 0
+        self.bytes_written = 0
+        self.wait_time = 0.0
+
+        self._file = f
+        self._position = f.tell()
+        self._error = None
+        self._queue = queue.Queue(maxsize=depth)
+        self._thread = threading.Thread(target=self._drain, args=(self._position,),
+                                        name='dbf-block-writer', daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'BlockWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except Exception:
+            if exc_type is None:
+                raise
+        return False
+
+    def _drain(self, position: int):
+        """Writer thread: write queued blocks until the end marker (None)"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue  # Keep draining so the producer never blocks
+            offset, block = item
+            try:
+                if offset != position:
+                    self._file.seek(offset)
+                self._file.write(block)
+                position = offset + len(block)
+            except BaseException as e:
+                self._error = e
+
+    def write(self, block) -> int:
+        """Queue block for writing at the current position"""
+        if self._error is not None:
+            raise self._error
+        start = time.perf_counter()
+        self._queue.put((self._position, block))
+        self.wait_time += time.perf_counter() - start
+
+        self._position += len(block)
+        self.blocks += 1
+        self.bytes_written += len(block)
+        return len(block)
+
+    def seek(self, offset: int) -> int:
+        """Set the position of the next block (absolute offsets only)"""
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        """Position of the next block"""
+        return self._position
+
+    def close(self):
+        """
+        Wait until every block is written
+
+        The file is left positioned after the last block. Errors of the
+        writer thread are raised here (or by the next write()).
+        """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            raise self._error
+        self._file.seek(self._position)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columnar DBF Access with NumPy
+خواندن ستونی فایل‌های DBF با NumPy
+
+SSO records have a fixed width, so a mapped DBF file is already a NumPy
+structured array: one S<n> sub-field per column over the file's own bytes,
+without a copy. load_dbf_columns() returns that view with numeric columns
+parsed in vector form and text columns decoded on first use:
+
+    columns = load_dbf_columns('DSKWOR00.DBF', ['DSW_MASH', 'DSW_BIME', 'DSW_LNAME'])
+    columns['DSW_MASH'].sum()          # int64 array (empty fields are 0)
+    columns.blanks('DSW_MASH').sum()   # number of empty fields
+    columns['DSW_LNAME'][:5]           # Iran System decoded to Unicode (only now)
+
+    # A year of archives
+    total = sum(load_dbf_columns(path, ['DSW_MASH'])['DSW_MASH'].sum() for path in paths)
+"""
+
+from collections.abc import Mapping
+from typing import Iterator, List, Optional
+
+try:
+    from .dbf_reader import DBFReader, parse_numeric
+    from .iran_system_decoder import IranSystemDecoder
+    from .sso_schema import all_persian_fields
+except ImportError:
+    from dbf_reader import DBFReader, parse_numeric
+    from iran_system_decoder import IranSystemDecoder
+    from sso_schema import all_persian_fields
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: load_dbf_columns() needs NumPy
+
+# Most digits parsed in vector form (10**18 still fits in int64)
+_MAX_VECTOR_DIGITS = 18
+_INT64_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+def parse_numeric_column(raw, width: int, as_float: bool = False) -> tuple:
+    """
+    Parse a column of right-aligned numeric fields
+
+    Plain integers of up to 18 digits ('   1234', '-12') are parsed in vector
+    form, whatever the field width; other cells go through parse_numeric()
+    one by one. The dtype depends on the field only, never on the data, and
+    empty fields are always 0 with their positions in the blanks mask.
+
+    Args:
+        raw: NumPy array of dtype S<width> (the fields' bytes)
+        width: Field width
+        as_float: Parse as float64 (fields with decimals and F fields)
+
+    Returns:
+        (values, blanks): int64 array (float64 with as_float) and a bool
+        array marking the empty fields
+
+    Raises:
+        ValueError: A cell is not a number, has a fraction (without
+                    as_float) or does not fit in int64
+    """
+    count = len(raw)
+    matrix = np.frombuffer(raw.tobytes(), dtype=np.uint8).reshape(count, width)
+
+    is_digit = (matrix >= 0x30) & (matrix <= 0x39)
+    is_space = matrix == 0x20
+    # Length of the run of digits at the right end of each field
+    digits = np.cumprod(is_digit[:, ::-1], axis=1).sum(axis=1)
+    sign_column = width - digits - 1
+    columns = np.arange(width)
+    is_sign = (matrix == 0x2D) & (columns == sign_column[:, None])
+    in_digits = columns >= (width - digits)[:, None]
+
+    plain = ((is_space | is_sign | in_digits).all(axis=1) &
+             (digits > 0) & (digits <= _MAX_VECTOR_DIGITS))
+    blanks = is_space.all(axis=1)
+
+    # Plain cells have at most 18 digits: only the last columns carry any
+    tail = min(width, _MAX_VECTOR_DIGITS)
+    weights = 10 ** np.arange(tail - 1, -1, -1, dtype=np.int64)
+    values = (((matrix[:, width - tail:].astype(np.int64) - 0x30) *
+               in_digits[:, width - tail:]) * weights).sum(axis=1)
+    values[is_sign.any(axis=1)] *= -1
+    values[~plain] = 0
+    if as_float:
+        values = values.astype(np.float64)
+
+    for row in np.flatnonzero(~plain & ~blanks).tolist():
+        cell = bytes(raw[row])
+        try:
+            value = parse_numeric(cell)
+        except ValueError:
+            raise ValueError(f"row {row}: {cell!r} is not a number")
+        if value is None:
+            blanks[row] = True
+        elif as_float:
+            values[row] = value
+        elif isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"row {row}: {cell!r} has a fraction in an integer field")
+        elif int(value) not in _INT64_RANGE:
+            raise ValueError(f"row {row}: {cell!r} does not fit in int64")
+        else:
+            values[row] = int(value)
+
+    return values, blanks
+
+
+class DBFColumns(Mapping):
+    """
+    Columns of a DBF file over a zero-copy structured array
+
+    Indexing by field name returns a parsed column (computed once):
+    numeric fields as int64 arrays (float64 for fields with decimals and F
+    fields) with empty fields as 0, character fields as arrays of Unicode
+    strings (Persian fields decoded from Iran System). blanks() tells the
+    empty fields apart.
+
+    Attributes:
+        path: DBF file
+        records: Structured array with one S<n> sub-field per selected field
+                 (a view of the mapped file unless deleted records were dropped)
+        fields: DBFField descriptors of the selected fields
+        num_records: Number of records
+    """
+
+    def __init__(self, path: str, records, fields: list):
+        self.path = path
+        self.records = records
+        self.fields = fields
+        self.num_records = len(records)
+        self._fields = {field.name: field for field in fields}
+        self._columns = {}
+        self._blanks = {}
+        self._decoder = None
+
+    def __getitem__(self, name: str):
+        if name not in self._columns:
+            self._columns[name] = self._parse(self._fields[name])
+        return self._columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def blanks(self, name: str):
+        """Bool array marking the empty fields of a column"""
+        if name not in self._blanks:
+            values = self[name]
+            if name not in self._blanks:
+                self._blanks[name] = values == ''
+        return self._blanks[name]
+
+    def raw(self, name: str):
+        """Bytes of a field (S<n> array, trailing NULs dropped by NumPy)"""
+        return self.records[name]
+
+    def _parse(self, field):
+        """Parse one column according to its field type"""
+        raw = self.records[field.name]
+        if field.type in ('N', 'F'):
+            try:
+                values, self._blanks[field.name] = parse_numeric_column(
+                    raw, field.length, as_float=field.type == 'F' or field.decimal > 0)
+            except ValueError as e:
+                raise ValueError(f"{self.path}: {field.name} {e}") from None
+            return values
+
+        values = [value.rstrip(b'\0 ') for value in raw.tolist()]
+        if field.name in all_persian_fields():
+            if self._decoder is None:
+                self._decoder = IranSystemDecoder()
+            return np.array(self._decoder.decode_column(values), dtype=str)
+        # Other text is read as latin-1 (raw bytes, like dbf_to_csv)
+        return np.array([value.decode('latin-1').strip() for value in values], dtype=str)
+
+
+def load_dbf_columns(path: str, columns: Optional[List[str]] = None) -> DBFColumns:
+    """
+    Map a DBF file as a structured array and return its columns
+
+    Args:
+        path: DBF file
+        columns: Field names to expose (default: all)
+
+    Returns:
+        DBFColumns; columns are parsed when first indexed
+
+    Raises:
+        ImportError: NumPy is not installed
+        ValueError: A requested column is not in the file
+    """
+    if np is None:
+        raise ImportError("numpy is required for load_dbf_columns()")
+
+    with DBFReader(path) as dbf:
+        fields = {field.name: field for field in dbf.fields}
+        names = list(fields) if columns is None else list(columns)
+        unknown = [name for name in names if name not in fields]
+        if unknown:
+            raise ValueError(f"{path}: no field {', '.join(unknown)} "
+                             f"(fields: {', '.join(fields)})")
+
+        selected = ['_DELETED'] + names
+        dtype = np.dtype({
+            'names': selected,
+            'formats': ['S1'] + [f'S{fields[name].length}' for name in names],
+            'offsets': [0] + [fields[name].offset for name in names],
+            'itemsize': dbf.record_length,
+        })
+        available = (len(dbf.buffer) - dbf.header_length) // dbf.record_length
+        count = max(0, min(dbf.num_records, available))
+        records = np.frombuffer(dbf.buffer, dtype=dtype, count=count,
+                                offset=dbf.header_length)
+        # The map stays open as long as the array uses it
+
+    active = records['_DELETED'] == b' '
+    if not active.all():
+        # Deleted records ('*') and anything after an EOF marker are dropped
+        end = np.flatnonzero(records['_DELETED'] == b'\x1a')
+        if len(end):
+            active[end[0]:] = False
+        records = records[active]
+
+    return DBFColumns(str(path), records, [fields[name] for name in names])
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precompiled DBF Record Layout
+چیدمان از پیش کامپایل‌شده رکوردهای DBF
+
+Compiles a field list [(name, type, length, decimal), ...] once into a
+RecordLayout: per-field offsets, widths, kinds (Persian / ASCII / numeric),
+a formatter per field and a struct.Struct that packs a whole record (deletion
+flag + every field) into a reusable buffer.
+
+    layout = RecordLayout(fields, persian_fields={'DSW_FNAME'}, encoder=encoder)
+    buffer = bytearray(layout.record_length)
+    layout.pack_into(buffer, [layout.format(i, v) for i, v in enumerate(values)])
+    f.write(buffer)
+
+    # Or format every field straight into the buffer (Persian fields are
+    # encoded into it with IranSystemEncoder.encode_into)
+    layout.format_into(buffer, values)
+
+Numeric columns can also be formatted a whole column at a time
+(format_numeric_column / format_numeric_column_array); cells that are not
+numbers are written as blanks and their row indexes are returned.
+"""
+
+import struct
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: only needed by format_numeric_column_array()
+
+
+# Field kinds
+PERSIAN = 'persian'   # C field in Iran System encoding
+ASCII = 'ascii'       # Plain C field
+NUMERIC = 'numeric'   # N field, right-aligned
+UNKNOWN = 'unknown'   # Other types are written as spaces
+
+
+def _ascii_formatter(width: int) -> Callable[[object], bytes]:
+    """Formatter for a plain C field"""
+    def format_ascii(value) -> bytes:
+        return str(value)[:width].ljust(width).encode('ascii', errors='replace')
+    return format_ascii
+
+
+# Values that are not numbers
+_NUMBER_ERRORS = (TypeError, ValueError, OverflowError)
+
+# Longest digit string a float holds exactly: _format_number() goes through
+# float(), so longer values are rounded and the vector path leaves them to it
+_EXACT_FLOAT_DIGITS = 15
+
+
+def _format_number(value, width: int, decimal: int) -> bytes:
+    """
+    Format one N field value (right-aligned, truncated to width)
+
+    Blank values are 0 when decimal is 0. Raises TypeError, ValueError or
+    OverflowError for values that are not numbers.
+    """
+    if decimal > 0:
+        num_str = f"{float(value):{width}.{decimal}f}"
+    else:
+        num_str = f"{int(float(value) if value else 0):>{width}d}"
+    return num_str[:width].rjust(width).encode('ascii')
+
+
+def _numeric_formatter(width: int, decimal: int) -> Callable[[object], bytes]:
+    """Formatter for an N field (values that are not numbers are written as blanks)"""
+    blank = b' ' * width
+
+    def format_numeric(value) -> bytes:
+        try:
+            return _format_number(value, width, decimal)
+        except _NUMBER_ERRORS:
+            return blank
+    return format_numeric
+
+
+def format_numeric_column(values: Sequence, width: int,
+                          decimal: int = 0) -> Tuple[List[bytes], List[int]]:
+    """
+    Format a whole N column
+
+    Args:
+        values: Cell values (strings from CSV, numbers, None)
+        width: Field width
+        decimal: Decimal places
+
+    Returns:
+        (blocks, bad_rows): one width-byte block per value - identical to the
+        field formatter - and the row indexes of cells that are not numbers
+        (written as blanks)
+    """
+    blank = b' ' * width
+    blocks = []
+    bad_rows = []
+
+    for row, value in enumerate(values):
+        try:
+            blocks.append(_format_number(value, width, decimal))
+        except _NUMBER_ERRORS:
+            blocks.append(blank)
+            bad_rows.append(row)
+
+    return blocks, bad_rows
+
+
+def _has_nul(values: Sequence) -> bool:
+    """True if any string value contains a NUL character"""
+    try:
+        return '\0' in ''.join(values)
+    except TypeError:
+        return any(isinstance(value, str) and '\0' in value for value in values)
+
+
+def format_numeric_column_array(values: Sequence, width: int,
+                                decimal: int = 0) -> Tuple['np.ndarray', List[int]]:
+    """
+    Format a whole N column as an 'S<width>' NumPy array
+
+    Integer columns are parsed and right-aligned as one uint8 matrix: cells
+    that are plain ASCII digit strings (no sign, no leading zero, at most
+    width and at most 15 digits) or empty are moved right in place; every
+    other cell goes through the per-cell formatter, which also rounds longer
+    values through float exactly as format_numeric_column() does. Decimal
+    columns are formatted per cell.
+
+    Returns:
+        (array, bad_rows) - the array's buffer is the blocks of
+        format_numeric_column(), bad_rows are the same row indexes
+    """
+    if np is None:
+        raise ImportError("numpy is required for format_numeric_column_array()")
+
+    dtype = f'S{width}'
+    count = len(values)
+
+    try:
+        # NUL bytes would be lost as 'S' padding
+        if decimal > 0 or count == 0 or _has_nul(values):
+            raise ValueError
+        # One extra byte: longer values show up with width + 1 bytes
+        raw = np.array(values, dtype=f'S{width + 1}')
+    except (TypeError, ValueError, UnicodeEncodeError):
+        blocks, bad_rows = format_numeric_column(values, width, decimal)
+        return np.frombuffer(b''.join(blocks), dtype=dtype).copy(), bad_rows
+
+    matrix = raw.view(np.uint8).reshape(count, width + 1)
+    used = matrix != 0
+    lengths = used.sum(axis=1)
+    digits = (matrix >= 0x30) & (matrix <= 0x39)
+
+    simple = ((digits | ~used).all(axis=1) &
+              (lengths <= min(width, _EXACT_FLOAT_DIGITS)) &
+              ((matrix[:, 0] != 0x30) | (lengths <= 1)))
+
+    # Right-align: output column j takes input column j - (width - length)
+    source = np.arange(width) - (width - lengths)[:, None]
+    aligned = np.take_along_axis(matrix, np.clip(source, 0, width), axis=1)
+    out = np.where(source >= 0, aligned, 0x20).astype(np.uint8)
+    out[lengths == 0, width - 1] = 0x30  # Blank values are 0
+
+    result = out.view(dtype).reshape(count)
+    bad_rows = []
+    blank = b' ' * width
+
+    for row in np.flatnonzero(~simple).tolist():
+        try:
+            result[row] = _format_number(values[row], width, decimal)
+        except _NUMBER_ERRORS:
+            result[row] = blank
+            bad_rows.append(row)
+
+    return result, bad_rows
+
+
+def _persian_formatter(width: int, encoder) -> Callable[[object], bytes]:
+    """Formatter for an Iran System C field (blank values are written as text)"""
+    spaces = b' ' * width
+    format_blank = _ascii_formatter(width)
+
+    def format_persian(value) -> bytes:
+        if not value or not str(value).strip():
+            return format_blank('' if value is None else value)
+        # Don't strip! Spaces are important for Iran System visual order
+        encoded = encoder.encode(str(value))
+        if len(encoded) >= width:
+            return encoded[:width]
+        return encoded + spaces[len(encoded):]
+    return format_persian
+
+
+def _persian_writer(start: int, width: int, encoder) -> Callable[[object, object, int], None]:
+    """Writer of an Iran System C field into a record buffer (see format_into)"""
+    end = start + width
+    format_blank = _ascii_formatter(width)
+
+    def write_persian(buffer, value, offset: int):
+        if not value or not str(value).strip():
+            buffer[offset + start:offset + end] = format_blank('' if value is None else value)
+        else:
+            encoder.encode_into(buffer, offset + start, width, str(value))
+    return write_persian
+
+
+def _block_writer(start: int, width: int,
+                  formatter: Callable[[object], bytes]) -> Callable[[object, object, int], None]:
+    """Writer of a field formatted to bytes into a record buffer"""
+    end = start + width
+
+    def write_block(buffer, value, offset: int):
+        buffer[offset + start:offset + end] = formatter(value)
+    return write_block
+
+
+class RecordLayout:
+    """
+    Precomputed layout of one DBF record
+
+    Attributes:
+        fields: The compiled field list
+        names: Field names, in record order
+        offsets: Byte offset of each field inside the record (after the flag)
+        widths: Field widths in bytes
+        decimals: Decimal places per field
+        kinds: PERSIAN, ASCII, NUMERIC or UNKNOWN per field
+        slices: slice() of each field inside the record buffer
+        record_length: Deletion flag + all fields
+        struct: struct.Struct packing the flag and every field ('<1s10s2s...')
+    """
+
+    def __init__(self, fields: Sequence[tuple], persian_fields: Iterable[str] = (),
+                 encoder=None):
+        """
+        Compile a field list
+
+        Args:
+            fields: [(name, type, length, decimal), ...]
+            persian_fields: Names of C fields written in Iran System encoding
+            encoder: IranSystemEncoder used by the Persian formatters
+                     (required when there are Persian fields)
+        """
+        persian_fields = set(persian_fields)
+
+        self.fields = list(fields)
+        self.names = []
+        self.offsets = []
+        self.widths = []
+        self.decimals = []
+        self.kinds = []
+        self.slices = []
+        self._formatters = []
+        self._writers = []
+
+        offset = 1  # Deletion flag
+        for field_name, field_type, field_length, field_decimal in self.fields:
+            if field_type == 'C' and field_name in persian_fields:
+                if encoder is None:
+                    raise ValueError(f"encoder is required for Persian field {field_name}")
+                kind = PERSIAN
+                formatter = _persian_formatter(field_length, encoder)
+            elif field_type == 'C':
+                kind = ASCII
+                formatter = _ascii_formatter(field_length)
+            elif field_type == 'N':
+                kind = NUMERIC
+                formatter = _numeric_formatter(field_length, field_decimal)
+            else:
+                kind = UNKNOWN
+                blank = b' ' * field_length
+                formatter = lambda value, blank=blank: blank
+
+            self.names.append(field_name)
+            self.offsets.append(offset)
+            self.widths.append(field_length)
+            self.decimals.append(field_decimal)
+            self.kinds.append(kind)
+            self.slices.append(slice(offset, offset + field_length))
+            self._formatters.append(formatter)
+            if kind == PERSIAN:
+                self._writers.append(_persian_writer(offset, field_length, encoder))
+            else:
+                self._writers.append(_block_writer(offset, field_length, formatter))
+            offset += field_length
+
+        self.record_length = offset
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.struct = struct.Struct('<1s' + ''.join(f'{w}s' for w in self.widths))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def format(self, index: int, value) -> bytes:
+        """Format value for field number index (exactly its width in bytes)"""
+        return self._formatters[index](value)
+
+    def formatter(self, field_name: str) -> Callable[[object], bytes]:
+        """Return the formatter of a field"""
+        return self._formatters[self.index[field_name]]
+
+    def pack_into(self, buffer, blocks: Sequence[bytes], deleted: bool = False,
+                  offset: int = 0):
+        """
+        Pack field blocks into a record buffer
+
+        Args:
+            buffer: Writable buffer with room for record_length bytes at offset
+            blocks: One fixed-width block per field, in record order
+            deleted: Write the '*' deletion flag instead of ' '
+            offset: Byte offset of the record inside buffer
+        """
+        self.struct.pack_into(buffer, offset, b'*' if deleted else b' ', *blocks)
+
+    def format_into(self, buffer, values: Sequence, deleted: bool = False,
+                    offset: int = 0):
+        """
+        Format a record's values straight into a record buffer
+
+        Same bytes as pack_into() with format()ed blocks, but Persian fields
+        are encoded into buffer in place, without an intermediate block.
+
+        Args:
+            buffer: Writable buffer with room for record_length bytes at offset
+            values: One value per field, in record order
+            deleted: Write the '*' deletion flag instead of ' '
+            offset: Byte offset of the record inside buffer
+        """
+        buffer[offset] = 0x2A if deleted else 0x20
+        for writer, value in zip(self._writers, values):
+            writer(buffer, value, offset)
+
+    def pack(self, blocks: Sequence[bytes], deleted: bool = False) -> bytes:
+        """Return one packed record"""
+        return self.struct.pack(b'*' if deleted else b' ', *blocks)
+
+    def constant_blocks(self, values: Dict[str, object]) -> Dict[int, bytes]:
+        """
+        Format values that are the same for every record once
+
+        Args:
+            values: Field name -> value
+
+        Returns:
+            Field index -> formatted block (fields not in the layout are ignored)
+        """
+        return {self.index[name]: self.format(self.index[name], value)
+                for name, value in values.items() if name in self.index}
+
+    def unpack(self, record: bytes) -> List[bytes]:
+        """Split one record into its raw field blocks (without the deletion flag)"""
+        return list(self.struct.unpack(record)[1:])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory-Mapped DBF Writer
+نوشتن فایل DBF با mmap
+
+The record count and record length of a DBF file are known before any record
+is written, so its size is exact:
+
+    32 (header) + 32 * fields + 1 (terminator) + records * record_length + 1 (EOF)
+
+MappedDBF preallocates the file to that size and maps it, so records are
+filled in place - in any order, e.g. by parallel producers writing their own
+slices - and the operating system does the flushing.
+
+    with MappedDBF('dskwor00.dbf', layout, len(workers)) as dbf:
+        write_header(dbf.map)                  # mmap is file-like (seek/write)
+        layout.pack_into(dbf.map, blocks, offset=dbf.record_offset(row))
+"""
+
+import os
+import mmap
+
+
+def dbf_file_size(num_fields: int, record_length: int, num_records: int) -> int:
+    """
+    Exact size of a dBase III file in bytes
+
+    Args:
+        num_fields: Number of field descriptors
+        record_length: Record length including the deletion flag
+        num_records: Number of records
+    """
+    return 32 + 32 * num_fields + 1 + num_records * record_length + 1
+
+
+class MappedDBF:
+    """
+    A DBF file preallocated to its final size and mapped into memory
+
+    Attributes:
+        path: Output file
+        size: Exact file size (see dbf_file_size())
+        data_start: Offset of the first record
+        record_length: Record length including the deletion flag
+        num_records: Number of records
+        map: The mmap (None outside the with block). It is file-like:
+             seek(), tell() and write() work as on the open file.
+
+    If the with block raises, the partial file is deleted.
+    """
+
+    def __init__(self, path: str, layout, num_records: int):
+        """
+        Args:
+            path: Output DBF filename (created or truncated)
+            layout: RecordLayout of the records
+            num_records: Number of records the file will hold
+        """
+        self.path = path
+        self.record_length = layout.record_length
+        self.num_records = num_records
+        self.data_start = 32 + 32 * len(layout) + 1
+        self.size = dbf_file_size(len(layout), layout.record_length, num_records)
+        self.map = None
+        self._file = None
+
+    def __enter__(self) -> 'MappedDBF':
+        self._file = open(self.path, 'w+b')
+        try:
+            self._file.truncate(self.size)
+            self.map = mmap.mmap(self._file.fileno(), self.size)
+        except BaseException:
+            self._file.close()
+            raise
+        # EOF marker is known up front
+        self.map[self.size - 1:self.size] = b'\x1A'
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.map.flush()
+            try:
+                self.map.close()
+            except BufferError:
+                # A view of the map is still held by the failing code's
+                # traceback: the map is freed with it
+                if exc_type is None:
+                    raise
+        finally:
+            self.map = None
+            self._file.close()
+            if exc_type is not None:
+                # Preallocated records are zero-filled: do not leave a
+                # file that looks complete
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+        return False
+
+    def record_offset(self, row: int) -> int:
+        """File offset of record number row (0-based)"""
+        return self.data_start + row * self.record_length
+
+    def records(self, start: int = 0, count: int = None) -> memoryview:
+        """
+        Writable view of count records starting at record number start
+
+        The view must be released before the with block ends.
+        """
+        if count is None:
+            count = self.num_records - start
+        begin = self.record_offset(start)
+        return memoryview(self.map)[begin:begin + count * self.record_length]
+
+    def write_records(self, start: int, block: bytes):
+        """Copy a block of whole records into place starting at record number start"""
+        begin = self.record_offset(start)
+        self.map[begin:begin + len(block)] = block
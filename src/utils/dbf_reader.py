@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory-Mapped DBF Reader
+خواندن فایل DBF با mmap (بدون dbfread)
+
+SSO files are plain dBase III: a 32-byte header, 32-byte field descriptors
+and fixed-width records. DBFReader maps the file and yields every record as
+a memoryview slice of the map, so fields are read as raw bytes without
+building a dictionary or a latin-1 string per value:
+
+    with DBFReader('dskwor00.dbf') as dbf:
+        name = dbf.slices['DSW_FNAME']
+        for record in dbf:
+            raw = bytes(record[name]).rstrip(b'\\0 ')   # Iran System bytes
+
+Records follow dbfread's rules: reading starts at the header length, deleted
+records ('*') are skipped and the EOF marker (0x1A) or the end of the file
+ends the table. Record views must not outlive the with block if the map is
+to be closed right away; otherwise it is closed when the last view goes.
+"""
+
+import mmap
+import struct
+from collections import namedtuple
+from datetime import date
+from typing import Iterator, Optional, Union
+
+
+# name, type ('C', 'N', ...), length, decimal count, offset in the record
+# (the deletion flag is byte 0, so the first field starts at 1)
+DBFField = namedtuple('DBFField', 'name type length decimal offset')
+
+_HEADER = struct.Struct('<B3BIHH20x')
+_FIELD = struct.Struct('<11sc4xBB14x')
+
+
+def parse_numeric(data: bytes) -> Optional[Union[int, float]]:
+    """
+    Parse the bytes of a numeric (N) field as dbfread does
+
+    Returns:
+        int, float, or None for an empty field
+    """
+    # In some files * is used for padding
+    data = data.strip().strip(b'*')
+    try:
+        return int(data)
+    except ValueError:
+        if not data.strip():
+            return None
+        # Account for , in numeric fields
+        return float(data.replace(b',', b'.'))
+
+
+def parse_float(data: bytes) -> Optional[float]:
+    """Parse the bytes of a float (F) field as dbfread does (None if empty)"""
+    data = data.strip().strip(b'*')
+    return float(data) if data else None
+
+
+def parse_date(data: bytes) -> Optional[date]:
+    """
+    Parse the bytes of a date (D) field (YYYYMMDD) as dbfread does
+
+    Returns:
+        date, or None for a field of only spaces and zeros
+
+    Raises:
+        ValueError: The field is not a valid date
+    """
+    try:
+        return date(int(data[:4]), int(data[4:6]), int(data[6:8]))
+    except ValueError:
+        if data.strip(b' 0') == b'':
+            return None
+        raise ValueError(f"invalid date {data!r}")
+
+
+def parse_logical(data: bytes) -> Optional[bool]:
+    """
+    Parse the bytes of a logical (L) field as dbfread does
+
+    Returns:
+        True (T/Y), False (F/N) or None (? or space)
+
+    Raises:
+        ValueError: Any other value
+    """
+    if data in b'TtYy':
+        return True
+    if data in b'FfNn':
+        return False
+    if data in b'? ':
+        return None
+    raise ValueError(f"Illegal value for logical field: {data!r}")
+
+
+class DBFReader:
+    """
+    Read-only memory map of a dBase III file
+
+    Attributes:
+        path: DBF file
+        version: Version byte (0x03 for dBase III)
+        date: Last update date from the header as (yy, mm, dd)
+        num_records: Record count from the header (may include deleted records)
+        header_length: Offset of the first record
+        record_length: Record length including the deletion flag
+        fields: DBFField descriptors in file order
+        field_names: Field names in file order
+        slices: Field name -> slice of the field in a record view
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a DBF file
+
+        Args:
+            path: DBF file
+
+        Raises:
+            ValueError: The file is too short for a DBF header
+        """
+        self.path = str(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{self.path}: empty file, not a DBF file")
+        self._view = memoryview(self._map)
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{self.path}: too short for a DBF header")
+
+        (self.version, yy, mm, dd, self.num_records,
+         self.header_length, self.record_length) = _HEADER.unpack_from(self._map)
+        self.date = (yy, mm, dd)
+
+        self.fields = []
+        offset = 1  # Deletion flag
+        position = _HEADER.size
+        while position + _FIELD.size <= len(self._map) and self._map[position] not in (0x0D, 0x0A):
+            name, field_type, length, decimal = _FIELD.unpack_from(self._map, position)
+            field_type = field_type.decode('latin-1')
+            if field_type == 'C':
+                # Character fields longer than 255 bytes keep the high byte in decimal
+                length |= decimal << 8
+                decimal = 0
+            name = name.split(b'\0')[0].decode('latin-1')
+            self.fields.append(DBFField(name, field_type, length, decimal, offset))
+            offset += length
+            position += _FIELD.size
+
+        self.field_names = [field.name for field in self.fields]
+        self.slices = {field.name: slice(field.offset, field.offset + field.length)
+                       for field in self.fields}
+
+    def __enter__(self) -> 'DBFReader':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @property
+    def buffer(self) -> memoryview:
+        """The whole mapped file (e.g. for numpy.frombuffer)"""
+        return self._view
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return self.records()
+
+    def records(self, include_deleted: bool = False) -> Iterator[memoryview]:
+        """
+        Yield each record as a memoryview (deletion flag at index 0)
+
+        Args:
+            include_deleted: Also yield records flagged as deleted ('*')
+        """
+        view = self._view
+        data = self._map
+        record_length = self.record_length
+        end = len(data) - record_length
+
+        position = self.header_length
+        while position <= end:
+            flag = data[position]
+            if flag == 0x20 or (include_deleted and flag == 0x2A):
+                yield view[position:position + record_length]
+            elif flag == 0x1A:
+                break
+            position += record_length
+
+    def close(self):
+        """Unmap the file (deferred until no record view is left)"""
+        if self._map is None:
+            return
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            pass  # Record views still in use: the map is freed with the last one
+        finally:
+            self._view = None
+            self._map = None
+            self._file.close()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Iran System Codec
+کدک Iran System برای پایتون
+
+Registers 'iran-system' (aliases: 'iran_system', 'iransystem') with the
+Python codec registry, so the encoding can be used anywhere an encoding name
+is accepted:
+
+    import iran_system_codec  # registers the codec
+
+    'علی'.encode('iran-system')          # -> b'\\xfc\\xf3\\xe4'
+    b'\\xfc\\xf3\\xe4'.decode('iran-system')  # -> 'یلع' (visual order)
+    DBF('dskwor00.dbf', encoding='iran-system')
+
+Encoding runs the context-sensitive IranSystemEncoder on the whole text,
+which shapes and reverses it into visual order. Characters without an Iran
+System form (after normalization) go through the errors handler: 'strict'
+raises UnicodeEncodeError, 'replace' writes '?' (as IranSystemEncoder
+does), 'ignore' drops them, and other handlers' text replacements are
+encoded in their place.
+
+Decoding is a plain charmap (C speed) and keeps the stored visual order;
+reverse the result of a Persian field to get logical order, exactly as
+IranSystemDecoder.decode() does.
+"""
+
+import codecs
+
+try:
+    from .iran_system_encoding import IranSystemEncoder
+    from .iran_system_decoder import IranSystemDecoder, DECODING_TABLE
+except ImportError:
+    from iran_system_encoding import IranSystemEncoder
+    from iran_system_decoder import IranSystemDecoder, DECODING_TABLE
+
+
+CODEC_NAME = 'iran-system'
+CODEC_ALIASES = ('iran_system', 'iransystem')
+
+# The LAM-ALEF ligature (0xF2) decodes to two characters; DECODING_TABLE
+# carries the presentation form, expanded after decoding.
+LAM_ALEF_PLACEHOLDER = IranSystemDecoder.LAM_ALEF_PLACEHOLDER
+LAM_ALEF = IranSystemDecoder.LAM_ALEF
+
+
+def _is_mappable(char: str) -> bool:
+    """True if the encoder has a form for the (normalized) character"""
+    try:
+        IranSystemEncoder.normalize_persian(char).encode('cp1256')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _handle_unmappable(input: str, errors: str) -> str:
+    """Input with the characters the encoder cannot map passed through the errors handler"""
+    try:
+        IranSystemEncoder.normalize_persian(input).encode('cp1256')
+        return input
+    except UnicodeEncodeError:
+        pass
+
+    handler = codecs.lookup_error(errors)
+    parts = []
+    position = 0
+    while position < len(input):
+        if _is_mappable(input[position]):
+            parts.append(input[position])
+            position += 1
+            continue
+        end = position + 1
+        while end < len(input) and not _is_mappable(input[end]):
+            end += 1
+        replacement, position = handler(UnicodeEncodeError(
+            CODEC_NAME, input, position, end, 'character maps to <undefined>'))
+        if not isinstance(replacement, str):
+            raise TypeError(f"{errors!r} error handler must return text for {CODEC_NAME}")
+        parts.append(replacement)
+    return ''.join(parts)
+
+
+def iran_system_encode(input: str, errors: str = 'strict'):
+    """Encode text to Iran System bytes (codec API: returns (bytes, consumed))"""
+    if not input:
+        return b'', 0
+    text = input
+    if errors != 'replace':
+        # The encoder itself writes '?' for the characters it cannot map
+        text = _handle_unmappable(input, errors)
+    return IranSystemEncoder.unicode_to_iran_system(text), len(input)
+
+
+def iran_system_decode(input, errors: str = 'strict'):
+    """Decode Iran System bytes in visual order (codec API: returns (str, consumed))"""
+    text, length = codecs.charmap_decode(input, errors, DECODING_TABLE)
+    if LAM_ALEF_PLACEHOLDER in text:
+        text = text.replace(LAM_ALEF_PLACEHOLDER, LAM_ALEF)
+    return text, length
+
+
+class Codec(codecs.Codec):
+    """Stateless Iran System codec"""
+
+    def encode(self, input, errors='strict'):
+        return iran_system_encode(input, errors)
+
+    def decode(self, input, errors='strict'):
+        return iran_system_decode(input, errors)
+
+
+class IncrementalEncoder(codecs.BufferedIncrementalEncoder):
+    """
+    Incremental encoder
+
+    Letter forms depend on both neighbours and the output is reversed, so
+    input is buffered and encoded as one text when final=True.
+    """
+
+    def _buffer_encode(self, input, errors, final):
+        if not final:
+            return b'', 0
+        return iran_system_encode(input, errors)
+
+
+class IncrementalDecoder(codecs.IncrementalDecoder):
+    """Incremental decoder (every byte decodes on its own)"""
+
+    def decode(self, input, final=False):
+        return iran_system_decode(input, self.errors)[0]
+
+
+class StreamWriter(Codec, codecs.StreamWriter):
+    """Stream writer (each write() call is encoded as one text)"""
+
+
+class StreamReader(Codec, codecs.StreamReader):
+    """Stream reader"""
+
+
+def search_function(name: str):
+    """Codec search function for codecs.register()"""
+    normalized = name.lower().replace('-', '_').replace(' ', '_')
+    if normalized not in CODEC_ALIASES:
+        return None
+
+    return codecs.CodecInfo(
+        name=CODEC_NAME,
+        encode=iran_system_encode,
+        decode=iran_system_decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader,
+    )
+
+
+def register():
+    """Register the codec (called on import; safe to call more than once)"""
+    try:
+        codecs.lookup(CODEC_NAME)
+    except LookupError:
+        codecs.register(search_function)
+
+
+register()
@@ -10,6 +10,14 @@ Author: Roozbeh Pournader <roozbeh@sina.sharif.ac.ir>
 Date: 21 January 2000
 """
 
+import codecs
+from typing import Dict, Iterable, List
+
+try:
+    from .iran_system_encoding import EncodingCache
+except ImportError:
+    from iran_system_encoding import EncodingCache
+
 
 class IranSystemDecoder:
     """
@@ -26,6 +34,12 @@ class IranSystemDecoder:
     ZWJ = '\u200D'   # Zero Width Joiner
     ZWNJ = '\u200C'  # Zero Width Non-Joiner
 
+    # The LAM-ALEF ligature (0xF2) decodes to two characters. The charmap
+    # table holds one character per byte, so it carries the presentation
+    # form and is expanded after decoding.
+    LAM_ALEF = '\u0644\u0627'       # لا
+    LAM_ALEF_PLACEHOLDER = '\uFEFB'  # ﻻ ARABIC LIGATURE LAM WITH ALEF
+
     # Complete Iran System to Unicode mapping table
     # Based on official specification
     IRAN_SYSTEM_TO_UNICODE = {
@@ -183,6 +197,15 @@ class IranSystemDecoder:
         0xFF: '\u00A0',  # NO-BREAK SPACE
     }
 
+    def __init__(self, cache_size: int = 8192):
+        """
+        Initialize decoder
+
+        Args:
+            cache_size: Maximum number of decoded values kept in the LRU cache
+        """
+        self.cache = EncodingCache(cache_size)
+
     @staticmethod
     def decode(iran_system_bytes: bytes, reverse: bool = True) -> str:
         """
@@ -202,17 +225,10 @@ class IranSystemDecoder:
             >>> result = decoder.decode(b'\\xfc\\xf3\\xe4')
             >>> print(result)  # Should print: علی
         """
-        result = []
-
-        for byte in iran_system_bytes:
-            if byte in IranSystemDecoder.IRAN_SYSTEM_TO_UNICODE:
-                char = IranSystemDecoder.IRAN_SYSTEM_TO_UNICODE[byte]
-                result.append(char)
-            else:
-                # Unknown byte - use replacement character
-                result.append('\uFFFD')  # � REPLACEMENT CHARACTER
-
-        text = ''.join(result)
+        text = codecs.charmap_decode(iran_system_bytes, 'replace', DECODING_TABLE)[0]
+        if IranSystemDecoder.LAM_ALEF_PLACEHOLDER in text:
+            text = text.replace(IranSystemDecoder.LAM_ALEF_PLACEHOLDER,
+                                IranSystemDecoder.LAM_ALEF)
 
         # Iran System stores text in visual (display) order
         # For Persian/Arabic RTL text, we need to reverse it to logical order
@@ -248,6 +264,73 @@ class IranSystemDecoder:
         # Decode to Unicode
         return IranSystemDecoder.decode(iran_bytes)
 
+    def decode_column(self, values: Iterable, encoding: str = 'latin-1',
+                      reverse: bool = True) -> List[str]:
+        """
+        Decode a whole column of DBF field values
+
+        Same result as decode_field() for every value (trailing spaces and
+        NULs stripped), but repeated values are decoded once and served from
+        the cache.
+
+        Args:
+            values: Field values as raw bytes or strings read with `encoding`
+            encoding: Encoding used to read string values (default: 'latin-1')
+            reverse: Whether to reverse to logical order (default: True)
+
+        Returns:
+            List of decoded Unicode strings, one per value
+        """
+        cache = self.cache
+        decode = IranSystemDecoder.decode
+        seen = {}
+        result = []
+
+        for value in values:
+            if not value:
+                result.append('')
+                continue
+
+            if isinstance(value, str):
+                value = value.encode(encoding)
+            elif not isinstance(value, bytes):
+                value = bytes(value)
+            key = value.rstrip(b' \x00')
+
+            # Repeats within the column skip the LRU bookkeeping
+            text = seen.get(key)
+            if text is None:
+                text = cache.get((key, reverse))
+                if text is None:
+                    text = decode(key, reverse)
+                    cache.put((key, reverse), text)
+                seen[key] = text
+            else:
+                cache.hits += 1
+            result.append(text)
+
+        return result
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Return decoding cache statistics (hits, misses, hit rate, ...)"""
+        return self.cache.stats()
+
+
+def _build_decoding_table() -> str:
+    """Build the 256-character charmap table from IRAN_SYSTEM_TO_UNICODE"""
+    table = []
+    for byte in range(256):
+        char = IranSystemDecoder.IRAN_SYSTEM_TO_UNICODE.get(byte, '\ufffe')
+        if char == IranSystemDecoder.LAM_ALEF:
+            char = IranSystemDecoder.LAM_ALEF_PLACEHOLDER
+        table.append(char)
+    return ''.join(table)
+
+
+# Byte -> character table for codecs.charmap_decode ('\ufffe' marks
+# undefined bytes, which decode to U+FFFD with errors='replace')
+DECODING_TABLE = _build_decoding_table()
+
 
 # Convenience function
 def decode_iran_system(iran_system_bytes: bytes) -> str:
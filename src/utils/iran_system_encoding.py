@@ -11,7 +11,77 @@ Based on the C# implementation from:
 https://github.com/amirfahmideh/InsuranceToDbf/blob/master/InsuranceToDbf/Convertor/ConvertWindowsPersianToDos.cs
 """
 
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: only needed by encode_column_array()
+
+
+class EncodingCache:
+    """
+    Bounded LRU cache of encoded field values
+
+    Most Persian fields in a payroll run repeat heavily (sex, nationality,
+    issue place, occupation, common first names), so caching the encoded
+    bytes per input string skips most of the encoding work.
+    """
+
+    def __init__(self, maxsize: int = 8192):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of cached values (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached value for key (or None) and update statistics"""
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: bytes):
+        """Store value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all cached values and reset statistics"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hits, misses, evictions, current size and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
 
 
 class IranSystemEncoder:
@@ -130,6 +200,222 @@ class IranSystemEncoder:
     # Final letters that don't connect to the left
     FINAL_LETTERS = "ءآأؤإادذرزژو"
 
+    # Normalization applied in one str.translate() call by normalize_persian().
+    # Maps Persian-specific characters to the Arabic ones in Windows-1256 and
+    # covers characters that Windows-1256 lacks (they would become '?') or
+    # encodes to bytes the mappers don't handle (they would become wrong letters).
+    NORMALIZATION_TABLE = str.maketrans({
+        '\u06CC': '\u064A',  # ی Persian -> ي Arabic
+        '\u06A9': '\u0643',  # ک Persian -> ك Arabic
+        # گ پ چ ژ are kept as is (handled in mapper)
+
+        # Persian/Extended Arabic-Indic Digits (۰-۹) → ASCII digits (0-9)
+        **{chr(0x06F0 + i): str(i) for i in range(10)},
+        # Arabic-Indic Digits (٠-٩) → ASCII digits (0-9)
+        **{chr(0x0660 + i): str(i) for i in range(10)},
+
+        # Yeh variants -> ي
+        '\u0620': '\u064A',  # ؠ KASHMIRI YEH
+        '\u063D': '\u064A',  # ؽ FARSI YEH WITH INVERTED V
+        '\u063E': '\u064A',  # ؾ FARSI YEH WITH TWO DOTS ABOVE
+        '\u063F': '\u064A',  # ؿ FARSI YEH WITH THREE DOTS ABOVE
+        '\u06CD': '\u064A',  # ۍ YEH WITH TAIL
+        '\u06D0': '\u064A',  # ې E
+        '\u06D2': '\u064A',  # ے YEH BARREE
+
+        # Kaf variants -> ك
+        '\u063B': '\u0643',  # ػ KEHEH WITH TWO DOTS ABOVE
+        '\u063C': '\u0643',  # ؼ KEHEH WITH THREE DOTS BELOW
+        '\u06AA': '\u0643',  # ڪ SWASH KAF
+        '\u06AB': '\u0643',  # ګ KAF WITH RING
+        '\u06AC': '\u0643',  # ڬ KAF WITH DOT ABOVE
+        '\u06AD': '\u0643',  # ڭ NG
+        '\u06AE': '\u0643',  # ڮ KAF WITH THREE DOTS BELOW
+
+        # Heh and alef variants
+        '\u06C0': '\u0647',  # ۀ HEH WITH YEH ABOVE -> ه
+        '\u06C1': '\u0647',  # ہ HEH GOAL -> ه
+        '\u06D5': '\u0647',  # ە AE -> ه
+        '\u0671': '\u0627',  # ٱ ALEF WASLA -> ا
+
+        # Joiners and spaces
+        '\u200C': ' ',       # ZWNJ -> space (letters on both sides stay unjoined)
+        '\u200D': None,      # ZWJ -> removed
+        '\u00A0': ' ',       # NO-BREAK SPACE -> space
+
+        # Diacritics (harakat) are dropped
+        **{chr(c): None for c in range(0x064B, 0x0653)},
+        '\u0670': None,      # SUPERSCRIPT ALEF
+    })
+
+    # Separator used to normalize a whole column in one call
+    COLUMN_SEPARATOR = '\x00'
+
+    def __init__(self, cache_size: int = 8192):
+        """
+        Initialize the encoder
+
+        Args:
+            cache_size: Size of the LRU cache used by encode() (0 disables it)
+        """
+        self.cache = EncodingCache(cache_size)
+
+    def encode(self, text: str) -> bytes:
+        """
+        Convert text to Iran System encoding through the LRU cache
+
+        Args:
+            text: Persian text in Unicode
+
+        Returns:
+            Bytes in Iran System encoding (same as unicode_to_iran_system)
+        """
+        result = self.cache.get(text)
+        if result is None:
+            result = IranSystemEncoder.unicode_to_iran_system(text)
+            self.cache.put(text, result)
+        return result
+
+    def encode_many(self, texts: Iterable[str]) -> List[bytes]:
+        """
+        Convert a column of texts to Iran System encoding
+
+        Identical values are encoded once (repeats count as cache hits), and
+        all values missing from the cache are normalized together in a single
+        normalize_persian() call.
+
+        Args:
+            texts: Persian texts in Unicode
+
+        Returns:
+            List of encoded bytes, in input order
+        """
+        texts = list(texts)
+        distinct = list(dict.fromkeys(texts))
+        encoded = {}
+        pending = []
+        for text in distinct:
+            cached = self.cache.get(text)
+            if cached is None:
+                pending.append(text)
+            else:
+                encoded[text] = cached
+
+        # Repeated values within the column are served without encoding too
+        self.cache.hits += len(texts) - len(distinct)
+
+        if pending:
+            # Normalize the whole column at once; fall back to per-value
+            # normalization if a value contains the separator itself
+            normalized = IranSystemEncoder.normalize_persian(
+                self.COLUMN_SEPARATOR.join(pending)
+            ).split(self.COLUMN_SEPARATOR)
+            if len(normalized) != len(pending):
+                normalized = [IranSystemEncoder.normalize_persian(text)
+                              for text in pending]
+
+            for text, norm in zip(pending, normalized):
+                result = IranSystemEncoder._encode_normalized(
+                    norm, IranSystemEncoder.is_number(text)
+                )
+                self.cache.put(text, result)
+                encoded[text] = result
+
+        return [encoded[text] for text in texts]
+
+    def encode_column(self, values: Iterable, width: int,
+                      strip: bool = False) -> List[bytes]:
+        """
+        Convert a column of field values to fixed-width DBF field blocks
+
+        Non-blank values are encoded to Iran System, truncated to width and
+        padded with spaces. Blank values (empty or whitespace only) are
+        written as plain text, the same way the DBF writers do.
+
+        Args:
+            values: Field values of one column, one per record
+            width: DBF field length
+            strip: Strip surrounding whitespace before encoding
+
+        Returns:
+            List of bytes blocks, each exactly width bytes long
+        """
+        values = list(values)
+        texts = [(str(value).strip() if strip else str(value))
+                 if value and str(value).strip() else None
+                 for value in values]
+
+        nonblank = [text for text in texts if text is not None]
+        padded = {}
+        for text, encoded in zip(nonblank, self.encode_many(nonblank)):
+            if text not in padded:
+                padded[text] = encoded[:width].ljust(width, b' ')
+
+        blocks = []
+        for value, text in zip(values, texts):
+            if text is None:
+                text = str(value or '')[:width].ljust(width)
+                blocks.append(text.encode('ascii', errors='replace'))
+            else:
+                blocks.append(padded[text])
+        return blocks
+
+    def encode_into(self, buffer, offset: int, width: int, text: str) -> int:
+        """
+        Encode text straight into a caller-owned record buffer
+
+        Writes the encoded bytes, truncated to width and padded with spaces,
+        into buffer[offset:offset + width] without building intermediate
+        bytes objects (the encoded value itself comes from the cache). Blank
+        values are written as plain text, like encode_column() does.
+
+        Args:
+            buffer: Writable bytearray or memoryview (e.g. one DBF record)
+            offset: Start of the field in buffer
+            width: DBF field length (at most 255)
+            text: Persian text in Unicode
+
+        Returns:
+            Number of encoded bytes written before the padding
+        """
+        if not (text and str(text).strip()):
+            plain = str(text or '')[:width].ljust(width)
+            buffer[offset:offset + width] = plain.encode('ascii', errors='replace')
+            return 0
+
+        encoded = self.encode(str(text))
+        length = min(len(encoded), width)
+        buffer[offset:offset + length] = memoryview(encoded)[:length]
+        if length < width:
+            buffer[offset + length:offset + width] = _SPACES[:width - length]
+        return length
+
+    def encode_column_array(self, values: Iterable, width: int,
+                            strip: bool = False):
+        """
+        Convert a column of field values to a NumPy fixed-width bytes array
+
+        Same blocks as encode_column(), returned as a read-only array of
+        dtype 'S<width>' that can be assigned to a structured record array.
+
+        Args:
+            values: Field values of one column, one per record
+            width: DBF field length
+            strip: Strip surrounding whitespace before encoding
+
+        Returns:
+            numpy.ndarray with dtype 'S<width>'
+        """
+        if np is None:
+            raise ImportError("numpy is required for encode_column_array()")
+
+        blocks = self.encode_column(values, width, strip=strip)
+        return np.frombuffer(b''.join(blocks), dtype=f'S{width}')
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Return statistics of the encoding cache"""
+        return self.cache.stats()
+
     @staticmethod
     def is_latin_letter(c: int) -> bool:
         """Check if byte is a Latin letter"""
@@ -182,31 +468,7 @@ class IranSystemEncoder:
     @staticmethod
     def normalize_persian(text: str) -> str:
         """Normalize Persian characters to Windows-1256 compatible ones"""
-        # Map Persian-specific chars to Arabic equivalents in Windows-1256
-        replacements = {
-            '\u06CC': '\u064A',  # ی Persian -> ي Arabic
-            '\u06A9': '\u0643',  # ک Persian -> ك Arabic
-            '\u06AF': '\u06AF',  # گ (keep as is, handled in mapper)
-            '\u067E': '\u067E',  # پ (keep as is, handled in mapper)
-            '\u0686': '\u0686',  # چ (keep as is, handled in mapper)
-            '\u0698': '\u0698',  # ژ (keep as is, handled in mapper)
-            # Persian/Extended Arabic-Indic Digits (۰-۹) → ASCII digits (0-9)
-            # These are not in Windows-1256, so convert to ASCII for encoding
-            '\u06F0': '0',  # ۰ → 0
-            '\u06F1': '1',  # ۱ → 1
-            '\u06F2': '2',  # ۲ → 2
-            '\u06F3': '3',  # ۳ → 3
-            '\u06F4': '4',  # ۴ → 4
-            '\u06F5': '5',  # ۵ → 5
-            '\u06F6': '6',  # ۶ → 6
-            '\u06F7': '7',  # ۷ → 7
-            '\u06F8': '8',  # ۸ → 8
-            '\u06F9': '9',  # ۹ → 9
-        }
-        result = text
-        for old, new in replacements.items():
-            result = result.replace(old, new)
-        return result
+        return text.translate(IranSystemEncoder.NORMALIZATION_TABLE)
 
     @staticmethod
     def unicode_to_iran_system(text: str) -> bytes:
@@ -221,52 +483,46 @@ class IranSystemEncoder:
         """
         # Normalize Persian characters
         normalized = IranSystemEncoder.normalize_persian(text)
+        return IranSystemEncoder._encode_normalized(
+            normalized, IranSystemEncoder.is_number(text)
+        )
 
-        # Add spaces at beginning and end
-        padded_text = " " + normalized + " "
-
-        # Convert to Windows-1256
-        try:
-            win1256_bytes = padded_text.encode('windows-1256', errors='replace')
-        except:
-            # Fallback to cp1256
-            win1256_bytes = padded_text.encode('cp1256', errors='replace')
-
-        result = []
-        prev_char = 0
-
-        for i in range(len(win1256_bytes)):
-            byte_val = win1256_bytes[i]
+    @staticmethod
+    def _encode_normalized(normalized: str, is_number: bool) -> bytes:
+        """
+        Encode already normalized text (core of unicode_to_iran_system)
 
-            if IranSystemEncoder.is_latin_letter(byte_val):
-                cur = IranSystemEncoder.get_latin_letter(byte_val)
-                result.append(cur)
-                prev_char = cur
-            elif i > 0 and i < len(win1256_bytes) - 1:
-                prev_byte = win1256_bytes[i - 1]
-                next_byte = win1256_bytes[i + 1]
+        Args:
+            normalized: Output of normalize_persian()
+            is_number: Whether the original text is numeric (kept unreversed)
 
-                cur = IranSystemEncoder.get_iran_system_char(
-                    prev_byte, byte_val, next_byte
-                )
+        Returns:
+            Bytes in Iran System encoding
+        """
+        if not normalized:
+            # Only the two padding spaces survive for empty input
+            return b'  '
 
-                # Special handling for لا (LA)
-                if cur == 145 and prev_char == 243:
-                    result[-1] = 242
-                else:
-                    result.append(cur)
+        # Add spaces at beginning and end, convert to Windows-1256
+        src = (" " + normalized + " ").encode('cp1256', errors='replace')
 
-                prev_char = cur
+        # Single pass over (prev, cur, next) byte triples using the tables
+        # compiled at import time; the padding spaces are never emitted
+        prev_class = _PREV_CLASS
+        next_class = _NEXT_CLASS
+        forms = _FORM_TABLE
+        result = bytes([forms[prev_class[p] | next_class[n] | c]
+                        for p, c, n in zip(src, src[1:], src[2:])])
 
-        # Remove padding
-        if len(result) > 2:
-            result = result[1:-1]
+        # Special handling for لا (LA): final LAM followed by ALEF
+        if b'\xf3\x91' in result:
+            result = result.replace(b'\xf3\x91', b'\xf2')
 
         # Reverse for RTL (unless it's a number)
-        if not IranSystemEncoder.is_number(text):
-            result.reverse()
+        if not is_number:
+            result = result[::-1]
 
-        return bytes(result)
+        return result
 
     @staticmethod
     def get_iran_system_char(prev_char: int, cur_char: int, next_char: int) -> int:
@@ -299,6 +555,53 @@ class IranSystemEncoder:
             return IranSystemEncoder.MAPPER_GROUP4.get(cur_char, cur_char)
 
 
+# ---------------------------------------------------------------------------
+# Compiled encoder tables
+#
+# Built once at import time from the predicates and mapper groups above, so
+# unicode_to_iran_system() does a single table lookup per byte. The form of a
+# byte is selected by OR-ing the class of its left neighbour, the class of its
+# right neighbour and the byte itself into an index of _FORM_TABLE:
+#   0x000 isolated (group 1), 0x100 final (group 2),
+#   0x200 initial (group 3),  0x300 medial (group 4)
+# Latin bytes map to the same value in all four rows.
+# ---------------------------------------------------------------------------
+
+def _compile_tables():
+    """Precompute the 256-entry class tables and the 1024-entry form table"""
+    prev_class = [0] * 256
+    next_class = [0] * 256
+    for c in range(256):
+        if not (IranSystemEncoder.char_cond(c) or
+                IranSystemEncoder.is_final_letter(c)):
+            prev_class[c] = 0x200
+        if not IranSystemEncoder.char_cond(c):
+            next_class[c] = 0x100
+
+    groups = (
+        IranSystemEncoder.MAPPER_GROUP1,
+        IranSystemEncoder.MAPPER_GROUP2,
+        IranSystemEncoder.MAPPER_GROUP3,
+        IranSystemEncoder.MAPPER_GROUP4,
+    )
+    forms = bytearray(1024)
+    for row, mapper in enumerate(groups):
+        for c in range(256):
+            if IranSystemEncoder.is_latin_letter(c):
+                forms[(row << 8) | c] = IranSystemEncoder.get_latin_letter(c)
+            else:
+                forms[(row << 8) | c] = mapper.get(c, c)
+
+    return tuple(prev_class), tuple(next_class), bytes(forms)
+
+
+_PREV_CLASS, _NEXT_CLASS, _FORM_TABLE = _compile_tables()
+
+
+# Padding source for encode_into() (DBF fields are at most 255 bytes long)
+_SPACES = memoryview(b' ' * 255)
+
+
 def test_encoder():
     """Test the encoder with some examples"""
     encoder = IranSystemEncoder()
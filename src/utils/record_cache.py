@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Encoded Record Cache
+کش رکوردهای کدگذاری‌شده برای اجرای ماهانه
+
+Most worker rows are the same from one monthly run to the next except for
+the year, month and list number. RecordCache keeps the encoded record bytes
+of every worker row in a local SQLite file, keyed by a hash of the row's
+input values, so unchanged rows skip normalization and encoding entirely;
+only the per-run workshop fields are patched into the cached bytes. The
+numeric fields that were written as blanks (values that are not numbers)
+are stored with each record, so cached rows report them like encoded ones.
+
+    with RecordCache('.sso_records.sqlite') as cache:
+        keys = [cache.key(fingerprint, values) for values in rows]
+        found = cache.get_many(keys)      # key -> (record bytes, bad fields)
+        ...
+        cache.put_many(new_records)       # [(key, record bytes, bad fields), ...]
+
+Keys are salted with a fingerprint of the record layout and the encoder
+tables (layout_fingerprint()), so a changed schema or encoder never reads
+stale records; old entries are pruned least recently used first.
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Dict, Iterable, Sequence, Tuple
+
+try:
+    from . import iran_system_encoding
+except ImportError:
+    import iran_system_encoding
+
+
+# SQLite limits the number of bound parameters per statement
+_BATCH_SIZE = 500
+
+# Salted into the keys: entries of an older cache format are never read
+_FORMAT_VERSION = b'2'
+
+
+def layout_fingerprint(layout) -> bytes:
+    """
+    Digest of everything that decides a record's bytes besides its values
+
+    Args:
+        layout: RecordLayout of the records
+
+    Returns:
+        32-byte digest of the field list, field kinds and encoder tables
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(_FORMAT_VERSION)
+    digest.update(repr(list(zip(layout.names, layout.kinds,
+                                layout.widths, layout.decimals))).encode('utf-8'))
+    digest.update(repr(sorted(iran_system_encoding.IranSystemEncoder.NORMALIZATION_TABLE.items()))
+                  .encode('utf-8'))
+    digest.update(bytes(c >> 9 for c in iran_system_encoding._PREV_CLASS))
+    digest.update(bytes(c >> 8 for c in iran_system_encoding._NEXT_CLASS))
+    digest.update(iran_system_encoding._FORM_TABLE)
+    return digest.digest()
+
+
+class RecordCache:
+    """
+    SQLite cache of encoded records keyed by a hash of the input row
+
+    Attributes:
+        path: SQLite database file
+        max_entries: Entries kept by prune() (least recently used go first)
+        hits / misses: Lookups of the current session
+        stored: Records written in the current session
+    """
+
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        """
+        Open (or create) a cache file
+
+        Args:
+            path: SQLite database file
+            max_entries: Size limit applied when the cache is closed
+        """
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self._now = int(time.time())
+
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " key BLOB PRIMARY KEY,"
+            " record BLOB NOT NULL,"
+            " last_used INTEGER NOT NULL,"
+            " bad_fields TEXT NOT NULL DEFAULT ''"
+            ") WITHOUT ROWID"
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(records)")]
+        if 'bad_fields' not in columns:
+            # Cache file of the first format (its keys no longer match)
+            self._db.execute(
+                "ALTER TABLE records ADD COLUMN bad_fields TEXT NOT NULL DEFAULT ''"
+            )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS records_last_used ON records (last_used)"
+        )
+
+    def __enter__(self) -> 'RecordCache':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    @staticmethod
+    def key(fingerprint: bytes, values: Sequence) -> bytes:
+        """
+        Cache key of one input row
+
+        Args:
+            fingerprint: layout_fingerprint() of the layout
+            values: The row's values of every field that is not patched per run
+        """
+        return hashlib.blake2b(repr(tuple(values)).encode('utf-8'),
+                               digest_size=16, key=fingerprint).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, Tuple[bytes, Tuple[str, ...]]]:
+        """
+        Look up records and mark them as used
+
+        Returns:
+            key -> (record bytes, names of the fields written as blanks)
+            for the keys that are cached
+        """
+        found = {}
+        unique = list(dict.fromkeys(keys))
+
+        for start in range(0, len(unique), _BATCH_SIZE):
+            batch = unique[start:start + _BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            for key, record, bad_fields in self._db.execute(
+                    f"SELECT key, record, bad_fields FROM records WHERE key IN ({placeholders})",
+                    batch):
+                found[key] = (record, tuple(bad_fields.split(',')) if bad_fields else ())
+
+        self._db.executemany("UPDATE records SET last_used = ? WHERE key = ?",
+                             ((self._now, key) for key in found))
+
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, bytes, Sequence[str]]]):
+        """Store (key, record bytes, names of the fields written as blanks) triples"""
+        rows = [(key, record, self._now, ','.join(bad_fields))
+                for key, record, bad_fields in items]
+        self._db.executemany(
+            "INSERT OR REPLACE INTO records (key, record, last_used, bad_fields) "
+            "VALUES (?, ?, ?, ?)", rows
+        )
+        self.stored += len(rows)
+
+    def prune(self, max_entries: int = None) -> int:
+        """
+        Drop the least recently used entries beyond max_entries
+
+        Returns:
+            Number of entries removed
+        """
+        if max_entries is None:
+            max_entries = self.max_entries
+        cursor = self._db.execute(
+            "DELETE FROM records WHERE key IN ("
+            " SELECT key FROM records ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (max_entries,)
+        )
+        return cursor.rowcount
+
+    def commit(self):
+        """Write pending changes to the database file"""
+        self._db.commit()
+
+    def close(self):
+        """Prune to max_entries, commit and close the database"""
+        if self._db is None:
+            return
+        self.prune()
+        self._db.commit()
+        self._db.close()
+        self._db = None
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Return hit/miss statistics of the current session"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stored': self.stored,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
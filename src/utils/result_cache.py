@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-Addressed Result Cache
+کش فایل‌های DBF خروجی بر اساس محتوای ورودی
+
+Re-running an unchanged workshop gives the same DBF pair, so the pair can be
+stored under a hash of everything that decides its bytes - the input files,
+the schema/encoder fingerprints and the run parameters - and copied back
+instead of being converted again.
+
+    cache = ResultCache('.sso_results')
+    key = cache.key([header_csv, workers_csv], schema.version, fingerprint,
+                    workshop_id, year, month, list_no, file_date.isoformat())
+    if not cache.get(key, output_dir, NAMES):
+        convert(...)
+        cache.put(key, output_dir, NAMES)
+
+Only deterministic output may be cached: the DBF header date must be one
+of the parameters (see CompleteDBFConverter.file_date).
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+
+# Bytes read at a time while hashing input files
+_READ_SIZE = 1 << 20
+
+
+class ResultCache:
+    """
+    Directory of converted file sets, one subdirectory per key
+
+    Attributes:
+        directory: Cache directory
+        hits / misses: get() results of the current session
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Cache directory (created if missing)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(files: Iterable[str], *params) -> str:
+        """
+        Key of a conversion
+
+        Args:
+            files: Input files (their contents are hashed, not their names)
+            params: Everything else the output depends on
+
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr(params).encode('utf-8'))
+        for path in files:
+            file_digest = hashlib.blake2b(digest_size=20)
+            with open(path, 'rb') as f:
+                for data in iter(lambda: f.read(_READ_SIZE), b''):
+                    file_digest.update(data)
+            digest.update(file_digest.digest())
+        return digest.hexdigest()
+
+    def get(self, key: str, output_dir: str, names: Iterable[str]) -> bool:
+        """
+        Copy a cached file set into output_dir
+
+        Returns:
+            True on a hit, False when the key (or one of its files) is not cached
+        """
+        entry = self.directory / key
+        names = list(names)
+        if not all((entry / name).is_file() for name in names):
+            self.misses += 1
+            return False
+
+        for name in names:
+            shutil.copyfile(entry / name, Path(output_dir) / name)
+        self.hits += 1
+        return True
+
+    def put(self, key: str, output_dir: str, names: Iterable[str]):
+        """
+        Store the files of output_dir under key
+
+        The entry appears atomically, so concurrent runs (e.g. batch
+        processes) never see a partial set; the first one stored is kept.
+        """
+        staging = Path(tempfile.mkdtemp(prefix=f'.{key}.', dir=self.directory))
+        try:
+            for name in names:
+                shutil.copyfile(Path(output_dir) / name, staging / name)
+            os.rename(staging, self.directory / key)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            # Renaming onto an existing entry fails: another run stored it first
+            if not (self.directory / key).is_dir():
+                raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
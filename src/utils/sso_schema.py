@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SSO DBF Schema Registry
+ساختار فایل‌های DBF سازمان تامین اجتماعی بر اساس نسخه
+
+The field layouts of dskkar00.dbf (header) and dskwor00.dbf (workers) per
+SSO format version. Every writer and reader takes its fields from here, so
+the next SSO format change is a new entry in SCHEMAS.
+
+    schema = compile_schema('sso-2024')     # compiled once per process
+    schema.worker_layout.pack(...)          # RecordLayout (see dbf_layout.py)
+    schema.validate_worker(record)          # ['DSW_FNAME: ...', ...]
+
+Versions:
+    pre-2024  Structure before Azar 1403 (26 header / 31 worker fields)
+    sso-2024  Current structure (25 header / 29 worker fields),
+              see docs/NEW_STRUCTURE_2024.md
+    sap-2024  Widths written by sap_integration/sap_to_dbf_standalone.py
+              (vendored into the script by tools/vendor_encoder.py)
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+try:
+    from .dbf_layout import RecordLayout, PERSIAN, ASCII, NUMERIC
+    from .iran_system_encoding import IranSystemEncoder
+except ImportError:
+    from dbf_layout import RecordLayout, PERSIAN, ASCII, NUMERIC
+    from iran_system_encoding import IranSystemEncoder
+
+
+DEFAULT_SCHEMA = 'sso-2024'
+
+
+class SSOSchema:
+    """
+    Field lists of one SSO format version
+
+    Attributes:
+        version: Registry key (e.g. 'sso-2024')
+        description: One line description
+        header_fields: dskkar00.dbf fields [(name, type, length, decimal), ...]
+        worker_fields: dskwor00.dbf fields
+        header_persian_fields: Header C fields in Iran System encoding
+        worker_persian_fields: Worker C fields in Iran System encoding
+    """
+
+    def __init__(self, version: str, description: str,
+                 header_fields: Sequence[tuple], worker_fields: Sequence[tuple],
+                 header_persian_fields: Iterable[str],
+                 worker_persian_fields: Iterable[str]):
+        self.version = version
+        self.description = description
+        self.header_fields = list(header_fields)
+        self.worker_fields = list(worker_fields)
+        self.header_persian_fields = frozenset(header_persian_fields)
+        self.worker_persian_fields = frozenset(worker_persian_fields)
+
+    def __repr__(self) -> str:
+        return f"SSOSchema({self.version!r})"
+
+    @property
+    def persian_fields(self) -> frozenset:
+        """Persian fields of both files"""
+        return self.header_persian_fields | self.worker_persian_fields
+
+    @staticmethod
+    def dbf_spec(fields: Sequence[tuple]) -> str:
+        """
+        Field list as a dbf library table spec
+
+        Returns:
+            'DSW_ID C(10); DSW_YY N(2,0); ...'
+        """
+        specs = []
+        for field_name, field_type, field_length, field_decimal in fields:
+            if field_type == 'N':
+                specs.append(f"{field_name} N({field_length},{field_decimal})")
+            else:
+                specs.append(f"{field_name} {field_type}({field_length})")
+        return '; '.join(specs)
+
+
+# Header file (dskkar00.dbf) - NEW SSO 2024 FORMAT (25 fields)
+# ⚠️  DSK_TBIM20 REMOVED in new structure!
+_HEADER_FIELDS_2024 = [
+    ('DSK_ID', 'C', 10, 0),       # Workshop ID
+    ('DSK_NAME', 'C', 30, 0),     # Workshop name (Persian) - Changed: 100→30
+    ('DSK_FARM', 'C', 30, 0),     # Employer name (Persian) - Changed: 100→30
+    ('DSK_ADRS', 'C', 40, 0),     # Address (Persian) - Changed: 100→40
+    ('DSK_KIND', 'N', 1, 0),      # Kind
+    ('DSK_YY', 'N', 2, 0),        # Year
+    ('DSK_MM', 'N', 2, 0),        # Month
+    ('DSK_LISTNO', 'C', 12, 0),   # List number
+    ('DSK_DISC', 'C', 30, 0),     # Description (Persian) - Changed: 100→30
+    ('DSK_NUM', 'N', 5, 0),       # Number of workers
+    ('DSK_TDD', 'N', 6, 0),       # Total days
+    ('DSK_TROOZ', 'N', 12, 0),    # Total daily wage
+    ('DSK_TMAH', 'N', 12, 0),     # Total monthly wage - Changed: 13→12
+    ('DSK_TMAZ', 'N', 12, 0),     # Total benefits
+    ('DSK_TMASH', 'N', 12, 0),    # Total insurable
+    ('DSK_TTOTL', 'N', 12, 0),    # Total amount - Changed: 13→12
+    ('DSK_TBIME', 'N', 12, 0),    # Total insurance
+    ('DSK_TKOSO', 'N', 12, 0),    # Total deductions
+    ('DSK_BIC', 'N', 12, 0),      # Unknown
+    ('DSK_RATE', 'N', 5, 0),      # Rate
+    ('DSK_PRATE', 'N', 2, 0),     # Rate percentage
+    # DSK_TBIM20 DELETED in new structure!
+    ('DSK_BIMH', 'N', 12, 0),     # Insurance premium
+    ('MON_PYM', 'C', 3, 0),       # Payment month
+    ('DSK_INC', 'N', 12, 0),      # Total INC (جمع پایه سنواتی) - Excel: DSK_TINC
+    ('DSK_SPOUSE', 'N', 12, 0),   # Total SPOUS (جمع حق تاهل) - Excel: DSK_TSPOUS
+]
+
+# Workers file (dskwor00.dbf) - NEW SSO 2024 FORMAT (29 fields)
+# ⚠️  DSW_KOSO and DSW_BIME20 REMOVED in new structure!
+# ⚠️  Field order changed: DSW_JOB and PER_NATCOD positions swapped
+# ⚠️  DSW_SPOUSE type changed: N→C (Number to Character!)
+_WORKER_FIELDS_2024 = [
+    ('DSW_ID', 'C', 10, 0),
+    ('DSW_YY', 'N', 2, 0),
+    ('DSW_MM', 'N', 2, 0),
+    ('DSW_LISTNO', 'C', 12, 0),
+    ('DSW_ID1', 'C', 8, 0),
+    ('DSW_FNAME', 'C', 60, 0),    # Changed: 20→60 (3x larger!)
+    ('DSW_LNAME', 'C', 60, 0),    # Changed: 25→60
+    ('DSW_DNAME', 'C', 60, 0),    # Changed: 20→60
+    ('DSW_IDNO', 'C', 15, 0),
+    ('DSW_IDPLC', 'C', 30, 0),
+    ('DSW_IDATE', 'C', 8, 0),
+    ('DSW_BDATE', 'C', 8, 0),
+    ('DSW_SEX', 'C', 3, 0),
+    ('DSW_NAT', 'C', 10, 0),
+    ('DSW_OCP', 'C', 50, 0),
+    ('DSW_SDATE', 'C', 8, 0),
+    ('DSW_EDATE', 'C', 8, 0),
+    ('DSW_DD', 'N', 2, 0),
+    ('DSW_ROOZ', 'N', 12, 0),
+    ('DSW_MAH', 'N', 12, 0),
+    ('DSW_MAZ', 'N', 12, 0),
+    ('DSW_MASH', 'N', 12, 0),
+    ('DSW_TOTL', 'N', 12, 0),
+    ('DSW_BIME', 'N', 12, 0),
+    ('DSW_PRATE', 'N', 2, 0),
+    # DSW_KOSO DELETED in new structure!
+    # DSW_BIME20 DELETED in new structure!
+    ('DSW_JOB', 'C', 6, 0),       # Changed: position 29→26, length 10→6
+    ('PER_NATCOD', 'C', 10, 0),   # Changed: position 28→27
+    ('DSW_INC', 'N', 12, 0),      # Changed: 19→12
+    ('DSW_SPOUSE', 'C', 10, 0),   # Changed: N19→C10 (type and length!)
+]
+
+# Header file before 1403 (26 fields, 609 bytes per record)
+_HEADER_FIELDS_PRE_2024 = [
+    ('DSK_ID', 'C', 10, 0),
+    ('DSK_NAME', 'C', 100, 0),
+    ('DSK_FARM', 'C', 100, 0),
+    ('DSK_ADRS', 'C', 100, 0),
+    ('DSK_KIND', 'N', 1, 0),
+    ('DSK_YY', 'N', 2, 0),
+    ('DSK_MM', 'N', 2, 0),
+    ('DSK_LISTNO', 'C', 12, 0),
+    ('DSK_DISC', 'C', 100, 0),
+    ('DSK_NUM', 'N', 5, 0),
+    ('DSK_TDD', 'N', 6, 0),
+    ('DSK_TROOZ', 'N', 12, 0),
+    ('DSK_TMAH', 'N', 13, 0),
+    ('DSK_TMAZ', 'N', 12, 0),
+    ('DSK_TMASH', 'N', 12, 0),
+    ('DSK_TTOTL', 'N', 13, 0),
+    ('DSK_TBIME', 'N', 12, 0),
+    ('DSK_TKOSO', 'N', 12, 0),
+    ('DSK_BIC', 'N', 12, 0),
+    ('DSK_RATE', 'N', 5, 0),
+    ('DSK_PRATE', 'N', 2, 0),
+    ('DSK_TBIM20', 'N', 12, 0),
+    ('DSK_BIMH', 'N', 12, 0),
+    ('MON_PYM', 'C', 3, 0),
+    ('DSK_INC', 'N', 19, 0),
+    ('DSK_SPOUSE', 'N', 19, 0),
+]
+
+# Workers file before 1403 (31 fields, 398 bytes per record)
+_WORKER_FIELDS_PRE_2024 = [
+    ('DSW_ID', 'C', 10, 0),
+    ('DSW_YY', 'N', 2, 0),
+    ('DSW_MM', 'N', 2, 0),
+    ('DSW_LISTNO', 'C', 12, 0),
+    ('DSW_ID1', 'C', 8, 0),
+    ('DSW_FNAME', 'C', 20, 0),
+    ('DSW_LNAME', 'C', 25, 0),
+    ('DSW_DNAME', 'C', 20, 0),
+    ('DSW_IDNO', 'C', 15, 0),
+    ('DSW_IDPLC', 'C', 30, 0),
+    ('DSW_IDATE', 'C', 8, 0),
+    ('DSW_BDATE', 'C', 8, 0),
+    ('DSW_SEX', 'C', 3, 0),
+    ('DSW_NAT', 'C', 10, 0),
+    ('DSW_OCP', 'C', 50, 0),
+    ('DSW_SDATE', 'C', 8, 0),
+    ('DSW_EDATE', 'C', 8, 0),
+    ('DSW_DD', 'N', 2, 0),
+    ('DSW_ROOZ', 'N', 12, 0),
+    ('DSW_MAH', 'N', 12, 0),
+    ('DSW_MAZ', 'N', 12, 0),
+    ('DSW_MASH', 'N', 12, 0),
+    ('DSW_TOTL', 'N', 12, 0),
+    ('DSW_BIME', 'N', 12, 0),
+    ('DSW_PRATE', 'N', 2, 0),
+    ('DSW_KOSO', 'N', 12, 0),
+    ('DSW_BIME20', 'N', 12, 0),
+    ('PER_NATCOD', 'C', 10, 0),
+    ('DSW_JOB', 'C', 10, 0),
+    ('DSW_INC', 'N', 19, 0),
+    ('DSW_SPOUSE', 'N', 19, 0),
+]
+
+# Workers file as written by the SAP standalone script (29 fields)
+_WORKER_FIELDS_SAP_2024 = [
+    ('DSW_ID', 'C', 10, 0),
+    ('DSW_YY', 'C', 2, 0),
+    ('DSW_MM', 'C', 2, 0),
+    ('DSW_LISTNO', 'C', 11, 0),
+    ('DSW_ID1', 'C', 10, 0),
+    ('DSW_FNAME', 'C', 30, 0),
+    ('DSW_LNAME', 'C', 40, 0),
+    ('DSW_DNAME', 'C', 30, 0),
+    ('DSW_IDNO', 'C', 20, 0),
+    ('DSW_IDPLC', 'C', 30, 0),
+    ('DSW_IDATE', 'C', 8, 0),
+    ('DSW_BDATE', 'C', 8, 0),
+    ('DSW_SEX', 'C', 6, 0),
+    ('DSW_NAT', 'C', 12, 0),
+    ('DSW_OCP', 'C', 40, 0),
+    ('DSW_SDATE', 'C', 8, 0),
+    ('DSW_EDATE', 'C', 8, 0),
+    ('DSW_DD', 'N', 2, 0),
+    ('DSW_ROOZ', 'N', 13, 0),
+    ('DSW_MAH', 'N', 13, 0),
+    ('DSW_MAZ', 'N', 13, 0),
+    ('DSW_MASH', 'N', 13, 0),
+    ('DSW_TOTL', 'N', 13, 0),
+    ('DSW_BIME', 'N', 13, 0),
+    ('DSW_PRATE', 'C', 2, 0),
+    ('DSW_JOB', 'C', 6, 0),
+    ('PER_NATCOD', 'C', 10, 0),
+    ('DSW_INC', 'N', 13, 0),
+    ('DSW_SPOUSE', 'N', 13, 0),
+]
+
+_HEADER_PERSIAN_FIELDS = {'DSK_NAME', 'DSK_FARM', 'DSK_ADRS', 'DSK_DISC'}
+
+_WORKER_PERSIAN_FIELDS_2024 = {
+    'DSW_FNAME',   # First name
+    'DSW_LNAME',   # Last name
+    'DSW_DNAME',   # Father's name
+    'DSW_IDPLC',   # ID issue place
+    'DSW_OCP',     # Occupation
+    'DSW_SEX',     # Sex (مرد/زن)
+    'DSW_NAT',     # Nationality (ایرانی)
+    # Note: DSW_JOB is a numeric job code, not Persian text
+}
+
+# Older files wrote sex and nationality as plain text
+_WORKER_PERSIAN_FIELDS_PRE_2024 = {'DSW_FNAME', 'DSW_LNAME', 'DSW_DNAME', 'DSW_IDPLC', 'DSW_OCP'}
+
+
+SCHEMAS: Dict[str, SSOSchema] = {
+    schema.version: schema for schema in [
+        SSOSchema('pre-2024', 'SSO structure before Azar 1403',
+                  _HEADER_FIELDS_PRE_2024, _WORKER_FIELDS_PRE_2024,
+                  _HEADER_PERSIAN_FIELDS, _WORKER_PERSIAN_FIELDS_PRE_2024),
+        SSOSchema('sso-2024', 'SSO structure from Azar 1403',
+                  _HEADER_FIELDS_2024, _WORKER_FIELDS_2024,
+                  _HEADER_PERSIAN_FIELDS, _WORKER_PERSIAN_FIELDS_2024),
+        SSOSchema('sap-2024', 'Widths written by the SAP standalone script',
+                  _HEADER_FIELDS_2024, _WORKER_FIELDS_SAP_2024,
+                  _HEADER_PERSIAN_FIELDS, _WORKER_PERSIAN_FIELDS_2024),
+    ]
+}
+
+
+def get_schema(version: str = DEFAULT_SCHEMA) -> SSOSchema:
+    """
+    Look up a schema by version
+
+    Raises:
+        ValueError: Unknown version
+    """
+    try:
+        return SCHEMAS[version]
+    except KeyError:
+        raise ValueError(f"Unknown SSO schema {version!r} "
+                         f"(known: {', '.join(SCHEMAS)})") from None
+
+
+def all_persian_fields() -> frozenset:
+    """Persian fields of every schema (for readers that accept any version)"""
+    return frozenset().union(*(schema.persian_fields for schema in SCHEMAS.values()))
+
+
+def find_schema(field_names: Sequence[str], field_lengths: Sequence[int] = None) -> Optional[str]:
+    """
+    Identify the schema version of a DBF file from its fields
+
+    Args:
+        field_names: Field names in file order
+        field_lengths: Field lengths (optional; distinguishes versions with
+                       the same names)
+
+    Returns:
+        Version of the first schema whose header or worker fields match, or None
+    """
+    field_names = list(field_names)
+    for schema in SCHEMAS.values():
+        for fields in (schema.header_fields, schema.worker_fields):
+            if [field[0] for field in fields] != field_names:
+                continue
+            if field_lengths is None or [field[2] for field in fields] == list(field_lengths):
+                return schema.version
+    return None
+
+
+def _field_check(kind: str, width: int, encoder) -> Callable[[object], Optional[str]]:
+    """Compile the validator of one field (returns a problem or None)"""
+    def is_blank(value) -> bool:
+        return value is None or not str(value).strip()
+
+    if kind == PERSIAN:
+        def check(value):
+            if is_blank(value):
+                return None
+            length = len(encoder.encode(str(value)))
+            if length > width:
+                return f"{length} bytes encoded, truncated to {width}"
+            return None
+    elif kind == ASCII:
+        def check(value):
+            text = '' if value is None else str(value)
+            if len(text) > width:
+                return f"{len(text)} characters, truncated to {width}"
+            if not text.isascii():
+                return "non-ASCII characters written as '?'"
+            return None
+    elif kind == NUMERIC:
+        def check(value):
+            if is_blank(value):
+                return None
+            try:
+                digits = len(str(int(float(value))))
+            except (TypeError, ValueError, OverflowError):
+                return f"not a number: {value!r}"
+            if digits > width:
+                return f"{digits} digits, field is {width}"
+            return None
+    else:
+        def check(value):
+            return None
+    return check
+
+
+class CompiledSchema:
+    """
+    A schema compiled for writing: record layouts, encoder and validators
+
+    Use compile_schema() - it returns the same instance for the same
+    arguments, so layouts and the encoding cache are built once per process.
+
+    Attributes:
+        schema: The SSOSchema definition
+        version: Schema version
+        encoder: IranSystemEncoder shared by both layouts
+        header_layout: RecordLayout of dskkar00.dbf
+        worker_layout: RecordLayout of dskwor00.dbf
+    """
+
+    def __init__(self, schema: SSOSchema, cache_size: int = 8192):
+        self.schema = schema
+        self.version = schema.version
+        self.encoder = IranSystemEncoder(cache_size=cache_size)
+        self.header_layout = RecordLayout(schema.header_fields,
+                                          schema.header_persian_fields, self.encoder)
+        self.worker_layout = RecordLayout(schema.worker_fields,
+                                          schema.worker_persian_fields, self.encoder)
+        self._header_checks = self._compile_checks(self.header_layout)
+        self._worker_checks = self._compile_checks(self.worker_layout)
+
+    def __repr__(self) -> str:
+        return f"CompiledSchema({self.version!r})"
+
+    def _compile_checks(self, layout: RecordLayout) -> Dict[str, Callable]:
+        return {name: _field_check(kind, width, self.encoder)
+                for name, kind, width in zip(layout.names, layout.kinds, layout.widths)}
+
+    @staticmethod
+    def _validate(checks: Dict[str, Callable], record: dict) -> List[str]:
+        problems = []
+        for field_name, value in record.items():
+            check = checks.get(field_name)
+            if check is None:
+                continue
+            problem = check(value)
+            if problem:
+                problems.append(f"{field_name}: {problem}")
+        return problems
+
+    def validate_header(self, record: dict) -> List[str]:
+        """
+        Check header values against the field widths and types
+
+        Args:
+            record: Field name -> value (names not in the schema are ignored)
+
+        Returns:
+            Problems as 'FIELD: reason' (empty when the record fits)
+        """
+        return self._validate(self._header_checks, record)
+
+    def validate_worker(self, record: dict) -> List[str]:
+        """Check worker values against the field widths and types (see validate_header)"""
+        return self._validate(self._worker_checks, record)
+
+
+@lru_cache(maxsize=None)
+def compile_schema(version: str = DEFAULT_SCHEMA, cache_size: int = 8192) -> CompiledSchema:
+    """
+    Compile a schema once per process
+
+    Args:
+        version: Schema version (see SCHEMAS)
+        cache_size: Size of the shared Persian field encoding cache
+
+    Returns:
+        The CompiledSchema for version (the same object on every call)
+    """
+    return CompiledSchema(get_schema(version), cache_size=cache_size)
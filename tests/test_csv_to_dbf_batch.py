@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the batch (multi-workshop) converter
+تست تبدیل دسته‌ای کارگاه‌ها
+"""
+
+import io
+import csv
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add tools directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from csv_to_dbf_batch import read_manifest, run_batch
+from csv_to_dbf_complete import CompleteDBFConverter
+from dbf_reader import DBFReader
+
+
+def write_csv(path: Path, rows: list):
+    """Write dictionaries as a CSV file"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class TestBatchConverter(unittest.TestCase):
+    """Test cases for converting a manifest of workshops"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+
+        for workshop, count in (('1001', 3), ('1002', 12)):
+            write_csv(self.base / f'kar{workshop}.csv', [{
+                'DSK_ID': workshop, 'DSK_NAME': 'کارگاه نمونه', 'DSK_YY': '4',
+                'DSK_MM': '7', 'DSK_LISTNO': '5',
+            }])
+            write_csv(self.base / f'wor{workshop}.csv', [{
+                'DSW_ID1': f'{i:08d}', 'DSW_FNAME': 'علی', 'DSW_LNAME': 'احمدی',
+                'DSW_DD': '30', 'DSW_MASH': str(32000000 + i),
+            } for i in range(count)])
+
+        write_csv(self.base / 'manifest.csv', [
+            {'header_csv': 'kar1001.csv', 'workers_csv': 'wor1001.csv',
+             'output_dir': 'out/1001', 'workshop_id': '1234567890', 'year': '3',
+             'month': '9', 'list_no': '1'},
+            {'header_csv': 'kar1002.csv', 'workers_csv': 'wor1002.csv',
+             'output_dir': 'out/1002', 'workshop_id': '', 'year': '', 'month': '',
+             'list_no': ''},
+            {'header_csv': 'kar1001.csv', 'workers_csv': 'missing.csv',
+             'output_dir': 'out/missing', 'workshop_id': '', 'year': '', 'month': '',
+             'list_no': ''},
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _expected(self, workshop: str, *args) -> bytes:
+        """Workers file written directly by the converter"""
+        path = self.base / f'expected{workshop}.dbf'
+        converter = CompleteDBFConverter(use_numpy=False)
+        with redirect_stdout(io.StringIO()):
+            converter.create_workers_file(
+                str(path), converter.read_csv(self.base / f'wor{workshop}.csv'), *args)
+        return path.read_bytes()
+
+    def test_manifest_paths(self):
+        """Test manifest paths are resolved from the manifest's directory"""
+        jobs = read_manifest(self.base / 'manifest.csv')
+        self.assertEqual([job['row'] for job in jobs], [1, 2, 3])
+        self.assertEqual(jobs[0]['workers_csv'], str(self.base.resolve() / 'wor1001.csv'))
+
+    def test_missing_column(self):
+        """Test a manifest without the required columns is rejected"""
+        write_csv(self.base / 'bad.csv', [{'header_csv': 'kar1001.csv'}])
+        with self.assertRaises(ValueError):
+            read_manifest(self.base / 'bad.csv')
+
+    def test_empty_output_dir(self):
+        """Test a row without an output directory is rejected"""
+        write_csv(self.base / 'bad.csv', [
+            {'header_csv': 'kar1001.csv', 'workers_csv': 'wor1001.csv', 'output_dir': ' '},
+        ])
+        with self.assertRaises(ValueError):
+            read_manifest(self.base / 'bad.csv')
+
+    def test_list_no_from_header(self):
+        """Test an empty manifest list_no is the header's, padded to 11 digits"""
+        jobs = read_manifest(self.base / 'manifest.csv')[1:2]
+        self.assertEqual(jobs[0]['list_no'], '')
+        run_batch(jobs, use_numpy=False)
+
+        with DBFReader(self.base / 'out' / '1002' / 'dskwor00.dbf') as dbf:
+            values = {bytes(record[dbf.slices['DSW_LISTNO']]).strip() for record in dbf}
+        self.assertEqual(values, {b'00000000005'})
+
+    def test_batch_matches_single_runs(self):
+        """Test pooled and in-process batches write the files of single runs"""
+        jobs = read_manifest(self.base / 'manifest.csv')
+        expected = {
+            '1001': self._expected('1001', '1234567890', 3, 9, '1'),
+            '1002': self._expected('1002', '0000001002', 4, 7, '00000000005'),
+        }
+
+        for processes in (1, 2):
+            results = run_batch(jobs, processes=processes, use_numpy=False)
+            self.assertEqual([result['status'] for result in results], ['ok', 'ok', 'error'])
+            self.assertEqual([result['workers'] for result in results], [3, 12, ''])
+            self.assertIn('FileNotFoundError', results[2]['error'])
+            for workshop, data in expected.items():
+                output = self.base / 'out' / workshop
+                self.assertEqual((output / 'dskwor00.dbf').read_bytes(), data, processes)
+                self.assertTrue((output / 'convert.log').exists())
+
+    def test_unchanged_workshops_from_result_cache(self):
+        """Test a deterministic rerun copies unchanged workshops from the cache"""
+        jobs = read_manifest(self.base / 'manifest.csv')[:2]
+        options = {'use_numpy': False, 'deterministic': True,
+                   'result_cache': str(self.base / 'results')}
+
+        first = run_batch(jobs, **options)
+        files = (self.base / 'out' / '1002' / 'dskkar00.dbf').read_bytes()
+        self.assertEqual([result['cached'] for result in first], [False, False])
+
+        (self.base / 'out' / '1002' / 'dskkar00.dbf').unlink()
+        with open(self.base / 'wor1001.csv', 'a', encoding='utf-8') as f:
+            f.write('99999999,رضا,کریمی,30,32000000\n')
+        second = run_batch(jobs, **options)
+        self.assertEqual([result['cached'] for result in second], [False, True])
+        self.assertEqual([result['workers'] for result in second], [4, 12])
+        self.assertEqual((self.base / 'out' / '1002' / 'dskkar00.dbf').read_bytes(), files)
+
+
+if __name__ == '__main__':
+    unittest.main()
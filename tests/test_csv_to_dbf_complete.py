@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the complete CSV to DBF converter
+تست تبدیل کامل CSV به DBF
+"""
+
+import io
+import sys
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+# Add tools directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from csv_to_dbf_complete import CompleteDBFConverter
+from utils.block_writer import BlockWriter
+from utils.record_cache import RecordCache
+from utils.result_cache import ResultCache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def sample_workers(count: int) -> list:
+    """Worker records with repeating Persian values"""
+    first_names = ['علی', 'محمد', 'فاطمه', 'زهرا', '']
+    return [
+        {
+            'DSW_ID1': f'{i:08d}',
+            'DSW_FNAME': first_names[i % len(first_names)],
+            'DSW_LNAME': 'احمدی' if i % 2 else 'کریمی',
+            'DSW_SEX': 'مرد' if i % 3 else 'زن',
+            'DSW_NAT': 'ایرانی',
+            'DSW_DD': str(30 - i % 5),
+            'DSW_ROOZ': str(1000000 + i),
+            'DSW_MAH': str(30000000 + i * 7),
+            'DSW_MASH': str(32000000 + i),
+            'DSW_TOTL': str(32000000 + i),
+            'DSW_BIME': str(2240000 + i),
+            'PER_NATCOD': f'{i:010d}',
+        }
+        for i in range(count)
+    ]
+
+
+def small_chunk_converter(**options) -> CompleteDBFConverter:
+    """Converter that uses the process pool (jobs > 1) from 10 workers in chunks of 7"""
+    converter = CompleteDBFConverter(**options)
+    converter.PARALLEL_MIN_WORKERS = 10
+    converter.PARALLEL_CHUNK_SIZE = 7
+    return converter
+
+
+def write_workers(path: Path, workers: list, month: int = 7, list_no: str = '1',
+                  **options) -> bytes:
+    """Write a workers file with small_chunk_converter(**options) and return its bytes"""
+    with redirect_stdout(io.StringIO()):
+        converter = small_chunk_converter(**options)
+        converter.create_workers_file(str(path), workers, '1234567890', 4, month, list_no)
+    return path.read_bytes()
+
+
+def converter_totals(workers: list) -> dict:
+    """Header totals computed from the whole list"""
+    return CompleteDBFConverter(use_numpy=False)._calculate_totals(workers)
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Base class for tests that write files to a temporary directory (self.out)"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class TestStreamingWorkersFile(TempDirTestCase):
+    """Test cases for create_workers_file_streaming()"""
+
+    def _write_both(self, workers: list, use_numpy: bool, chunk_size: int):
+        """Write the workers file in memory and streaming; return both files and totals"""
+        args = ('1234567890', 4, 7, '1')
+        with redirect_stdout(io.StringIO()):
+            converter = CompleteDBFConverter(use_numpy=use_numpy)
+            converter.create_workers_file(str(self.out / 'list.dbf'), workers, *args)
+
+            converter = CompleteDBFConverter(use_numpy=use_numpy)
+            totals = converter.create_workers_file_streaming(
+                str(self.out / 'stream.dbf'), iter(workers), *args, chunk_size=chunk_size)
+
+        return ((self.out / 'list.dbf').read_bytes(),
+                (self.out / 'stream.dbf').read_bytes(),
+                totals)
+
+    def test_identical_to_in_memory_writer(self):
+        """Test streaming output equals create_workers_file() across chunk boundaries"""
+        workers = sample_workers(23)
+        for use_numpy in (False, None):
+            listed, streamed, totals = self._write_both(workers, use_numpy, chunk_size=5)
+            self.assertEqual(listed, streamed)
+            self.assertEqual(struct.unpack('<I', streamed[4:8])[0], 23)
+            self.assertEqual(totals, converter_totals(workers))
+
+    def test_empty_workers(self):
+        """Test an empty stream still produces a valid empty file"""
+        listed, streamed, totals = self._write_both([], False, chunk_size=5)
+        self.assertEqual(listed, streamed)
+        self.assertEqual(totals['num_workers'], 0)
+
+
+class TestBadNumericCells(unittest.TestCase):
+    """Test cases for reporting numeric cells that are not numbers"""
+
+    def test_rows_reported(self):
+        """Test bad cells are reported by row index on every write path"""
+        workers = sample_workers(20)
+        workers[3]['DSW_INC'] = 'n/a'
+        workers[17]['DSW_INC'] = '12,000'
+        workers[9]['DSW_PRATE'] = 'x'
+        expected = {'DSW_PRATE': [9], 'DSW_INC': [3, 17]}
+
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()) as out:
+            path = str(Path(tmp) / 'dskwor00.dbf')
+            for options in ({'use_numpy': False}, {'use_numpy': None},
+                            {'use_numpy': False, 'jobs': 2}):
+                converter = CompleteDBFConverter(**options)
+                converter.create_workers_file(path, workers, '1234567890', 4, 7)
+                self.assertEqual(converter.bad_cells, expected, options)
+
+                converter.create_workers_file_streaming(path, iter(workers), '1234567890',
+                                                        4, 7, chunk_size=4)
+                self.assertEqual({name: sorted(rows) for name, rows in
+                                  converter.bad_cells.items()}, expected, options)
+
+        self.assertIn('DSW_INC: 2 values are not numbers, written as blanks (workers 4, 18)',
+                      out.getvalue())
+
+
+class TestMappedBackend(TempDirTestCase):
+    """Test cases for the preallocated mmap writer (backend='mmap')"""
+
+    def test_identical_to_file_backend(self):
+        """Test every record path gives the same file through mmap"""
+        workers = sample_workers(23)
+        for options in ({'use_numpy': False}, {'use_numpy': None},
+                        {'use_numpy': False, 'jobs': 2}):
+            mapped = write_workers(self.out / 'mmap.dbf', workers, backend='mmap', **options)
+            self.assertEqual(mapped, write_workers(self.out / 'file.dbf', workers, **options),
+                             options)
+
+    def test_exact_size(self):
+        """Test the preallocated size is the final file size"""
+        for count in (0, 1, 5):
+            data = write_workers(self.out / 'mmap.dbf', sample_workers(count),
+                                 use_numpy=False, backend='mmap')
+            layout = CompleteDBFConverter.WORKER_FIELDS
+            record_length = 1 + sum(field[2] for field in layout)
+            self.assertEqual(len(data), 32 + 32 * len(layout) + 1 + count * record_length + 1)
+            self.assertEqual(data[-1:], b'\x1A')
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_failure_removes_file(self):
+        """Test an error while filling the map surfaces as is and leaves no file"""
+        path = self.out / 'mmap.dbf'
+        converter = CompleteDBFConverter(use_numpy=True, backend='mmap')
+        with patch('csv_to_dbf_complete.format_numeric_column_array',
+                   side_effect=RuntimeError('encoding failed')), \
+                redirect_stdout(io.StringIO()), self.assertRaises(RuntimeError) as raised:
+            converter.create_workers_file(str(path), sample_workers(5), '1234567890', 4, 7)
+        self.assertIsNone(raised.exception.__context__)
+        self.assertFalse(path.exists())
+
+    def test_unknown_backend(self):
+        """Test unknown backends are rejected"""
+        with self.assertRaises(ValueError):
+            CompleteDBFConverter(backend='async')
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Test cases for writing blocks on a background thread (write_queue)"""
+
+    def test_blocks_at_their_positions(self):
+        """Test blocks are written where they were handed over, as on a file"""
+        f = io.BytesIO(b'HEADER')
+        f.seek(6)
+        with BlockWriter(f, depth=1) as writer:
+            writer.write(b'aaa')
+            writer.seek(12)
+            writer.write(b'ccc')
+            writer.seek(9)
+            writer.write(b'bbb')
+            self.assertEqual(writer.tell(), 12)
+        self.assertEqual(f.getvalue(), b'HEADERaaabbbccc')
+        self.assertEqual(f.tell(), 12)
+        self.assertEqual((writer.blocks, writer.bytes_written), (3, 9))
+
+    def test_write_error_raised(self):
+        """Test an error of the writer thread reaches the producer"""
+        class FullDisk(io.BytesIO):
+            def write(self, data):
+                raise OSError('No space left on device')
+
+        writer = BlockWriter(FullDisk(), depth=1)
+        writer.write(b'lost')
+        with self.assertRaises(OSError):
+            for _ in range(3):
+                writer.write(b'more')
+            writer.close()
+
+    def test_identical_output(self):
+        """Test the workers file does not change with a write queue"""
+        workers = sample_workers(23)
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+            for options in ({'use_numpy': False}, {'use_numpy': None}, {'jobs': 2}):
+                files = []
+                for write_queue in (0, 2):
+                    converter = small_chunk_converter(write_queue=write_queue, **options)
+                    path = Path(tmp) / f'queue{write_queue}.dbf'
+                    converter.create_workers_file(str(path), workers, '1234567890', 4, 7, '1')
+                    files.append(path.read_bytes())
+                    converter.create_workers_file_streaming(str(path), iter(workers),
+                                                            '1234567890', 4, 7, '1',
+                                                            chunk_size=5)
+                    files.append(path.read_bytes())
+                self.assertEqual(files[:2], files[2:], options)
+                self.assertEqual(files[0], files[1], options)
+
+
+class TestRecordCache(TempDirTestCase):
+    """Test cases for reusing encoded records between runs"""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = RecordCache(self.out / 'records.sqlite')
+
+    def tearDown(self):
+        self.cache.close()
+        super().tearDown()
+
+    def _write(self, workers: list, month: int, **options) -> bytes:
+        """Write the workers file of the given month (and list number)"""
+        return write_workers(self.out / 'dskwor00.dbf', workers, month, str(month), **options)
+
+    def test_next_month_from_cache(self):
+        """Test cached records get the new month's workshop fields"""
+        workers = sample_workers(23)
+        self._write(workers, 6, record_cache=self.cache, use_numpy=False)
+        self.assertEqual(self.cache.cache_stats()['misses'], 23)
+
+        for options in ({'use_numpy': False}, {'use_numpy': None, 'backend': 'mmap'}):
+            cached = self._write(workers, 7, record_cache=self.cache, **options)
+            self.assertEqual(cached, self._write(workers, 7, use_numpy=False), options)
+        self.assertEqual(self.cache.cache_stats()['hits'], 46)
+
+    def test_changed_rows_encoded(self):
+        """Test only changed rows miss and the file matches an uncached run"""
+        workers = sample_workers(23)
+        self._write(workers, 6, record_cache=self.cache, use_numpy=False)
+
+        workers[3]['DSW_LNAME'] = 'رضایی'
+        workers[20]['DSW_MASH'] = 'n/a'
+        workers.append(sample_workers(30)[29])
+        cache_stats = self.cache.cache_stats()
+        converter_options = {'use_numpy': False, 'jobs': 2}
+        cached = self._write(workers, 7, record_cache=self.cache, **converter_options)
+        self.assertEqual(cached, self._write(workers, 7, **converter_options))
+        self.assertEqual(self.cache.cache_stats()['misses'] - cache_stats['misses'], 3)
+
+    def test_bad_cells_use_file_rows(self):
+        """Test bad cells among the encoded rows are reported by file row"""
+        workers = sample_workers(5)
+        self._write(workers[:3], 6, record_cache=self.cache, use_numpy=False)
+        workers[4]['DSW_MASH'] = 'n/a'
+        with redirect_stdout(io.StringIO()):
+            converter = CompleteDBFConverter(use_numpy=False, record_cache=self.cache)
+            converter.create_workers_file(str(self.out / 'dskwor00.dbf'), workers,
+                                          '1234567890', 4, 7, '1')
+        self.assertEqual(converter.bad_cells, {'DSW_MASH': [4]})
+
+    def test_cached_bad_cells(self):
+        """Test cached records report their bad cells like an uncached run"""
+        workers = sample_workers(6)
+        workers[1]['DSW_MASH'] = 'n/a'
+        workers[4]['DSW_INC'] = 'x'
+        self._write(workers[:3], 6, record_cache=self.cache, use_numpy=False)
+
+        reports = []
+        for options in ({'record_cache': self.cache}, {}):
+            with redirect_stdout(io.StringIO()) as out:
+                converter = CompleteDBFConverter(use_numpy=False, **options)
+                converter.create_workers_file(str(self.out / 'dskwor00.dbf'), workers,
+                                              '1234567890', 4, 7, '1')
+            reports.append((converter.bad_cells,
+                            [line for line in out.getvalue().splitlines() if 'blanks' in line]))
+        self.assertEqual(reports[0], reports[1])
+        self.assertEqual(reports[0][0], {'DSW_MASH': [1], 'DSW_INC': [4]})
+
+    def test_prune(self):
+        """Test the least recently used entries are dropped first"""
+        self.cache.put_many([(b'old', b'1', ())])
+        self.cache._now += 1
+        self.cache.put_many([(b'new', b'2', ('DSW_MASH', 'DSW_INC'))])
+        self.assertEqual(self.cache.prune(1), 1)
+        self.assertEqual(self.cache.get_many([b'old', b'new']),
+                         {b'new': (b'2', ('DSW_MASH', 'DSW_INC'))})
+
+
+class TestDeterministicOutput(TempDirTestCase):
+    """Test cases for the fixed header date and the result cache"""
+
+    def test_period_date(self):
+        """Test the Jalali period maps to the Gregorian date of its first day"""
+        self.assertEqual(CompleteDBFConverter.period_date(4, 1), date(2025, 3, 21))
+        self.assertEqual(CompleteDBFConverter.period_date(4, 7), date(2025, 9, 23))
+        self.assertEqual(CompleteDBFConverter.period_date(99, 12), date(2021, 2, 20))
+        with self.assertRaises(ValueError):
+            CompleteDBFConverter.period_date(4, 13)
+
+    def test_file_date_in_header(self):
+        """Test the header date bytes come from file_date"""
+        converter = CompleteDBFConverter(use_numpy=False, file_date=date(2025, 9, 23))
+        path = self.out / 'dskwor00.dbf'
+        with redirect_stdout(io.StringIO()):
+            converter.create_workers_file(str(path), sample_workers(3), '1234567890', 4, 7)
+        self.assertEqual(path.read_bytes()[1:4], bytes([25, 9, 23]))
+
+    def test_result_key(self):
+        """Test the result key follows input contents, arguments and date"""
+        inputs = [self.out / 'header.csv', self.out / 'workers.csv']
+        for path in inputs:
+            path.write_text('DSW_ID1\n12345678\n', encoding='utf-8')
+        converter = CompleteDBFConverter(file_date=date(2025, 9, 23))
+        key = converter.result_key(inputs, '1234567890', 4, 7)
+
+        self.assertEqual(converter.result_key(inputs, '1234567890', 4, 7), key)
+        self.assertNotEqual(converter.result_key(inputs, '1234567890', 4, 8), key)
+        self.assertNotEqual(CompleteDBFConverter(file_date=date(2025, 9, 24))
+                            .result_key(inputs, '1234567890', 4, 7), key)
+        self.assertNotEqual(CompleteDBFConverter(file_date=date(2025, 9, 23), schema='pre-2024')
+                            .result_key(inputs, '1234567890', 4, 7), key)
+        inputs[1].write_text('DSW_ID1\n12345679\n', encoding='utf-8')
+        self.assertNotEqual(converter.result_key(inputs, '1234567890', 4, 7), key)
+
+    def test_result_cache(self):
+        """Test a stored file set is copied back on a hit"""
+        cache = ResultCache(self.out / 'results')
+        (self.out / 'a.dbf').write_bytes(b'first')
+        self.assertFalse(cache.get('k', self.out, ['a.dbf']))
+        cache.put('k', self.out, ['a.dbf'])
+        cache.put('k', self.out, ['a.dbf'])  # Already stored: kept
+
+        (self.out / 'a.dbf').write_bytes(b'changed')
+        self.assertTrue(cache.get('k', self.out, ['a.dbf']))
+        self.assertEqual((self.out / 'a.dbf').read_bytes(), b'first')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual([path.name for path in (self.out / 'results').iterdir()], ['k'])
+
+
+class TestSchemaVersions(unittest.TestCase):
+    """Test cases for writing other SSO schema versions"""
+
+    def test_pre_2024_layout(self):
+        """Test schema='pre-2024' writes the 31-field workers file"""
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+            path = Path(tmp) / 'dskwor00.dbf'
+            converter = CompleteDBFConverter(use_numpy=False, schema='pre-2024')
+            converter.create_workers_file(str(path), sample_workers(3), '1234567890', 2, 7)
+            data = path.read_bytes()
+
+        header_length, record_length = struct.unpack('<HH', data[8:12])
+        self.assertEqual(header_length, 32 + 31 * 32 + 1)
+        self.assertEqual(record_length, 398)
+        self.assertEqual(len(data), header_length + 3 * record_length + 1)
+        self.assertEqual(data[32:42].rstrip(b'\0'), b'DSW_ID')
+
+
+class TestEncodingCacheStats(unittest.TestCase):
+    """Test cases for the per-file statistics of the shared encoding cache"""
+
+    def test_stats_per_file(self):
+        """Test each converter reports only the lookups of its last file"""
+        workers = sample_workers(23)
+        with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+            path = str(Path(tmp) / 'dskwor00.dbf')
+            first = CompleteDBFConverter(use_numpy=False)
+            first.create_workers_file(path, workers, '1234567890', 4, 7)
+            second = CompleteDBFConverter(use_numpy=False)
+            self.assertEqual(second.cache_stats()['hits'], 0)
+            second.create_workers_file(path, workers, '1234567890', 4, 7)
+
+        first_stats, second_stats = first.cache_stats(), second.cache_stats()
+        self.assertEqual(second_stats['hits'] + second_stats['misses'],
+                         first_stats['hits'] + first_stats['misses'])
+        self.assertGreater(second_stats['hits'], 0)
+        self.assertEqual(second_stats['misses'], 0)  # Warm from the first file
+
+
+class TestParallelWorkersFile(TempDirTestCase):
+    """Test cases for process-pool encoding (jobs > 1)"""
+
+    def test_blocks_written_in_order(self):
+        """Test parallel blocks land at their record offsets"""
+        workers = sample_workers(40)
+        self.assertEqual(write_workers(self.out / 'parallel.dbf', workers, use_numpy=False, jobs=2),
+                         write_workers(self.out / 'serial.dbf', workers, use_numpy=False, jobs=1))
+
+    def _stream(self, name: str, workers: list) -> CompleteDBFConverter:
+        """Stream a workers file in chunks of 6 with jobs=2"""
+        path = self.out / name
+        with redirect_stdout(io.StringIO()):
+            converter = small_chunk_converter(use_numpy=False, jobs=2)
+            with patch.object(converter, '_write_worker_blocks_parallel',
+                              wraps=converter._write_worker_blocks_parallel) as pool:
+                converter.totals = converter.create_workers_file_streaming(
+                    str(path), iter(workers), '1234567890', 4, 7, '1', chunk_size=6)
+        converter.pool_calls = pool.call_count
+        return converter
+
+    def test_streaming_parallel(self):
+        """Test streamed chunks encoded in the pool match the serial writer"""
+        workers = sample_workers(40)
+        converter = self._stream('stream.dbf', workers)
+
+        self.assertEqual(converter.pool_calls, 1)
+        self.assertEqual((self.out / 'stream.dbf').read_bytes(),
+                         write_workers(self.out / 'serial.dbf', workers, use_numpy=False))
+        self.assertEqual(converter.totals['num_workers'], 40)
+
+    def test_short_stream_is_serial(self):
+        """Test streams below PARALLEL_MIN_WORKERS skip the process pool"""
+        workers = sample_workers(9)
+        converter = self._stream('stream.dbf', workers)
+
+        self.assertEqual(converter.pool_calls, 0)
+        self.assertEqual((self.out / 'stream.dbf').read_bytes(),
+                         write_workers(self.out / 'serial.dbf', workers, use_numpy=False))
+
+    def test_pool_cache_stats(self):
+        """Test the cache lookups of the pool processes are reported"""
+        workers = sample_workers(40)
+        pooled = self._stream('stream.dbf', workers).cache_stats()
+        with redirect_stdout(io.StringIO()):
+            converter = CompleteDBFConverter(use_numpy=False, jobs=1)
+            converter.create_workers_file(str(self.out / 'serial.dbf'), workers,
+                                          '1234567890', 4, 7, '1')
+        serial = converter.cache_stats()
+
+        self.assertGreater(pooled['hits'] + pooled['misses'], 0)
+        self.assertEqual(pooled['hits'] + pooled['misses'],
+                         serial['hits'] + serial['misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
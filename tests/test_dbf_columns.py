@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for columnar DBF access with NumPy
+تست خواندن ستونی DBF
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from dbf_columns import load_dbf_columns, parse_numeric_column
+from dbf_reader import DBFReader
+from csv_to_dbf_complete import CompleteDBFConverter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestDBFColumns(unittest.TestCase):
+    """Test cases for load_dbf_columns()"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'dskwor00.dbf'
+        self.workers = [
+            {'DSW_ID1': f'{i:08d}', 'DSW_LNAME': ['احمدی', 'کریمی', ''][i % 3],
+             'DSW_DD': str(30 - i), 'DSW_MASH': str(32000000 * i)}
+            for i in range(5)
+        ]
+        self.workers[2]['DSW_MASH'] = ''
+        with redirect_stdout(io.StringIO()):
+            CompleteDBFConverter(use_numpy=False).create_workers_file(
+                str(self.path), self.workers, '1234567890', 4, 7)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _set_field(self, row: int, name: str, data: bytes):
+        """Overwrite one field of the test file with raw bytes"""
+        with DBFReader(self.path) as dbf:
+            field = dbf.slices[name]
+            start = dbf.header_length + row * dbf.record_length + field.start
+        contents = bytearray(self.path.read_bytes())
+        contents[start:start + field.stop - field.start] = data.rjust(field.stop - field.start)
+        self.path.write_bytes(bytes(contents))
+
+    def test_numeric_columns(self):
+        """Test numeric columns are int64 with empty fields as 0"""
+        columns = load_dbf_columns(self.path, ['DSW_MASH', 'DSW_DD', 'DSW_YY'])
+        self.assertEqual(list(columns), ['DSW_MASH', 'DSW_DD', 'DSW_YY'])
+        self.assertEqual(columns['DSW_MASH'].dtype, np.int64)
+        self.assertEqual(columns['DSW_MASH'].tolist(), [0, 32000000, 0, 96000000, 128000000])
+        self.assertEqual(columns['DSW_DD'].sum(), 140)
+        self.assertEqual(set(columns['DSW_YY'].tolist()), {4})
+
+    def test_blanks_do_not_depend_on_data(self):
+        """Test an irregular cell keeps the column int64 with blanks as 0"""
+        self._set_field(1, 'DSW_MASH', b'')
+        self._set_field(3, 'DSW_MASH', b'***96000000')
+        columns = load_dbf_columns(self.path, ['DSW_MASH'])
+        self.assertEqual(columns['DSW_MASH'].dtype, np.int64)
+        self.assertEqual(columns['DSW_MASH'].tolist(), [0, 0, 0, 96000000, 128000000])
+        self.assertEqual(columns.blanks('DSW_MASH').tolist(), [False, True, False, False, False])
+
+        self._set_field(3, 'DSW_MASH', b'abc')
+        with self.assertRaises(ValueError):
+            load_dbf_columns(self.path, ['DSW_MASH'])['DSW_MASH']
+
+    def test_text_columns(self):
+        """Test Persian fields are decoded and other text is kept"""
+        columns = load_dbf_columns(self.path)
+        self.assertEqual(columns.num_records, 5)
+        self.assertEqual(columns['DSW_LNAME'].tolist(), ['احمدی', 'کریمی', '', 'احمدی', 'کریمی'])
+        self.assertEqual(columns['DSW_ID1'][4], '00000004')
+
+    def test_zero_copy(self):
+        """Test the records are a view of the mapped file"""
+        columns = load_dbf_columns(self.path, ['DSW_ID1'])
+        self.assertFalse(columns.records.flags.owndata)
+        self.assertEqual(columns.raw('DSW_ID1')[1], b'00000001')
+
+    def test_deleted_records_dropped(self):
+        """Test deleted records are not part of the columns"""
+        data = bytearray(self.path.read_bytes())
+        header_length = int.from_bytes(data[8:10], 'little')
+        data[header_length] = ord('*')
+        self.path.write_bytes(bytes(data))
+        self.assertEqual(load_dbf_columns(self.path, ['DSW_DD'])['DSW_DD'].tolist(),
+                         [29, 28, 27, 26])
+
+    def test_unknown_column(self):
+        """Test unknown field names are rejected"""
+        with self.assertRaises(ValueError):
+            load_dbf_columns(self.path, ['DSW_SALARY'])
+
+    def test_parse_numeric_column(self):
+        """Test plain and irregular numeric cells"""
+        raw = np.array([b'   12', b'  -34', b'     ', b'00007', b' 12,0'], dtype='S5')
+        values, blanks = parse_numeric_column(raw, 5)
+        self.assertEqual(values.tolist(), [12, -34, 0, 7, 12])
+        self.assertEqual(blanks.tolist(), [False, False, True, False, False])
+
+        raw = np.array([b'   12', b' 12.5', b'     '], dtype='S5')
+        values, blanks = parse_numeric_column(raw, 5, as_float=True)
+        self.assertEqual(values.tolist(), [12.0, 12.5, 0.0])
+        self.assertEqual(blanks.tolist(), [False, False, True])
+        for cell in (b' 12.5', b'  abc'):
+            with self.assertRaises(ValueError):
+                parse_numeric_column(np.array([cell], dtype='S5'), 5)
+
+    def test_wide_numeric_column(self):
+        """Test N19 fields: vector form up to 18 digits, clean errors past int64"""
+        raw = np.array([b'12'.rjust(19), b'-' + b'9' * 18, str(2 ** 62).encode()], dtype='S19')
+        values, _ = parse_numeric_column(raw, 19)
+        self.assertEqual(values.tolist(), [12, 1 - 10 ** 18, 2 ** 62])
+        with self.assertRaises(ValueError):
+            parse_numeric_column(np.array([b'9' * 19], dtype='S19'), 19)
+
+
+if __name__ == '__main__':
+    unittest.main()
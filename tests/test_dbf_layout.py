@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the precompiled DBF record layout
+تست چیدمان رکورد DBF
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+
+from iran_system_encoding import IranSystemEncoder
+from dbf_layout import (RecordLayout, PERSIAN, ASCII, NUMERIC, UNKNOWN,
+                        format_numeric_column, format_numeric_column_array)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FIELDS = [
+    ('DSW_ID', 'C', 10, 0),
+    ('DSW_YY', 'N', 2, 0),
+    ('DSW_FNAME', 'C', 8, 0),
+    ('DSW_RATE', 'N', 6, 2),
+    ('DSW_FLAG', 'L', 1, 0),
+]
+
+
+def reference_field(value, field_type, length, decimal, persian=False):
+    """Field formatting of the original per-field writer"""
+    if field_type == 'C' and persian and value and str(value).strip():
+        encoded = IranSystemEncoder.unicode_to_iran_system(str(value))[:length]
+        return encoded.ljust(length, b' ')
+    if field_type == 'C':
+        return str(value)[:length].ljust(length).encode('ascii', errors='replace')
+    if field_type == 'N':
+        try:
+            if decimal > 0:
+                num_str = f"{float(value):{length}.{decimal}f}"
+            else:
+                num_str = f"{int(float(value) if value else 0):>{length}d}"
+        except (TypeError, ValueError, OverflowError):
+            num_str = ' ' * length
+        return num_str[:length].rjust(length).encode('ascii')
+    return b' ' * length
+
+
+class TestRecordLayout(unittest.TestCase):
+    """Test cases for RecordLayout"""
+
+    def setUp(self):
+        self.layout = RecordLayout(FIELDS, {'DSW_FNAME'}, IranSystemEncoder())
+
+    def test_compiled_layout(self):
+        """Test offsets, widths, kinds and struct size"""
+        layout = self.layout
+        self.assertEqual(layout.offsets, [1, 11, 13, 21, 27])
+        self.assertEqual(layout.widths, [10, 2, 8, 6, 1])
+        self.assertEqual(layout.kinds, [ASCII, NUMERIC, PERSIAN, NUMERIC, UNKNOWN])
+        self.assertEqual(layout.record_length, 28)
+        self.assertEqual(layout.struct.size, layout.record_length)
+
+    def test_matches_reference_formatting(self):
+        """Test packed records equal the per-field writer byte for byte"""
+        rows = [
+            ['1234567890', 3, 'علی', '12.5', True],
+            ['12345678901234', '', '', 'x', None],
+            ['', '99', ' محمد رضا ', 1234567, False],
+        ]
+        buffer = bytearray(self.layout.record_length)
+
+        for row in rows:
+            expected = b' ' + b''.join(
+                reference_field(value, t, l, d, persian=(name == 'DSW_FNAME'))
+                for value, (name, t, l, d) in zip(row, FIELDS)
+            )
+            blocks = [self.layout.format(i, value) for i, value in enumerate(row)]
+            self.layout.pack_into(buffer, blocks)
+
+            self.assertEqual(bytes(buffer), expected)
+            self.assertEqual(self.layout.pack(blocks), expected)
+            self.assertEqual(self.layout.unpack(expected), blocks)
+
+    def test_format_into(self):
+        """Test values formatted into a reused buffer equal the packed blocks"""
+        rows = [
+            ['1234567890', 3, 'علی', '12.5', True],
+            ['', '', ' محمد رضا ', 'x', None],
+            ['12345678901234', '99', 'عبدالرحمن عبدالله', 7, False],
+        ]
+        buffer = bytearray(2 * self.layout.record_length)
+
+        for row in rows:
+            blocks = [self.layout.format(i, value) for i, value in enumerate(row)]
+            self.layout.format_into(buffer, row, offset=self.layout.record_length)
+            self.assertEqual(bytes(buffer[self.layout.record_length:]), self.layout.pack(blocks))
+        self.layout.format_into(buffer, rows[0], deleted=True)
+        self.assertEqual(buffer[0], ord('*'))
+
+    def test_constant_blocks(self):
+        """Test constant fields are formatted once by index"""
+        constants = self.layout.constant_blocks({'DSW_YY': 4, 'UNKNOWN': 1})
+        self.assertEqual(constants, {1: b' 4'})
+
+    def test_persian_requires_encoder(self):
+        """Test Persian fields cannot be compiled without an encoder"""
+        with self.assertRaises(ValueError):
+            RecordLayout(FIELDS, {'DSW_FNAME'})
+
+
+class TestNumericColumn(unittest.TestCase):
+    """Test cases for column-at-a-time numeric formatting"""
+
+    VALUES = ['', '0', '007', '32000000', '-5', ' 12', '12.7', '1e3', 'abc', None, 17,
+              '123456789012', '1234567890123', '۱۲۳', 'nan', 'inf', '12\0', ' ']
+
+    def expected(self, width: int, decimal: int = 0) -> list:
+        return [reference_field(value, 'N', width, decimal) for value in self.VALUES]
+
+    def bad_rows(self, width: int, decimal: int = 0) -> list:
+        return [row for row, block in enumerate(self.expected(width, decimal))
+                if block == b' ' * width]
+
+    def test_matches_field_formatter(self):
+        """Test column blocks equal the per-field formatter and bad rows are reported"""
+        for width, decimal in ((12, 0), (2, 0), (8, 2)):
+            blocks, bad_rows = format_numeric_column(self.VALUES, width, decimal)
+            self.assertEqual(blocks, self.expected(width, decimal))
+            self.assertEqual(bad_rows, self.bad_rows(width, decimal))
+            self.assertIn(self.VALUES.index('abc'), bad_rows)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_array_matches_field_formatter(self):
+        """Test the vectorized path gives the same blocks and bad rows"""
+        for width, decimal in ((12, 0), (2, 0), (8, 2)):
+            array, bad_rows = format_numeric_column_array(self.VALUES, width, decimal)
+            self.assertEqual(array.dtype, np.dtype(f'S{width}'))
+            self.assertEqual(array.tobytes(), b''.join(self.expected(width, decimal)))
+            self.assertEqual(bad_rows, self.bad_rows(width, decimal))
+
+        array, bad_rows = format_numeric_column_array([], 12)
+        self.assertEqual((len(array), bad_rows), (0, []))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_wide_values_match(self):
+        """Test values of more than 15 digits are formatted the same on both paths"""
+        values = ['123456789012345', '1234567890123456', '12345678901234567',
+                  '99999999999999999', '9999999999999999999', '']
+        blocks, bad_rows = format_numeric_column(values, 19)
+        array, array_bad_rows = format_numeric_column_array(values, 19)
+        self.assertEqual(array.tobytes(), b''.join(blocks))
+        self.assertEqual(array_bad_rows, bad_rows)
+        self.assertEqual(blocks[3], b' 100000000000000000')  # Rounded through float
+
+
+if __name__ == '__main__':
+    unittest.main()
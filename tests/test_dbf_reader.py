@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the memory-mapped DBF reader
+تست خواندن DBF با mmap
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from dbf_reader import DBFReader, parse_date, parse_logical, parse_numeric
+from csv_to_dbf_complete import CompleteDBFConverter
+
+try:
+    from dbfread import DBF
+except ImportError:
+    DBF = None  # Optional: only used as the reference reader
+
+REPO = Path(__file__).parent.parent
+SAMPLE_FILES = sorted(REPO.glob('finaltest/**/*.DBF')) + sorted(REPO.glob('tools/*.dbf'))
+
+
+class TestDBFReader(unittest.TestCase):
+    """Test cases for DBFReader"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'dskwor00.dbf'
+        with redirect_stdout(io.StringIO()):
+            CompleteDBFConverter(use_numpy=False).create_workers_file(
+                str(self.path),
+                [{'DSW_ID1': f'{i:08d}', 'DSW_FNAME': 'علی', 'DSW_MASH': str(1000 * i)}
+                 for i in range(4)],
+                '1234567890', 4, 7)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_header_and_fields(self):
+        """Test the header and field descriptors match the writer's layout"""
+        layout = CompleteDBFConverter().schema.worker_layout
+        with DBFReader(self.path) as dbf:
+            self.assertEqual(dbf.num_records, 4)
+            self.assertEqual(dbf.record_length, layout.record_length)
+            self.assertEqual(dbf.field_names, layout.names)
+            self.assertEqual([field.offset for field in dbf.fields], layout.offsets)
+
+    def test_records_are_views(self):
+        """Test records are memoryviews of the mapped file"""
+        with DBFReader(self.path) as dbf:
+            records = list(dbf)
+            self.assertIsInstance(records[0], memoryview)
+            self.assertEqual([bytes(record[dbf.slices['DSW_ID1']]) for record in records],
+                             [f'{i:08d}'.encode() for i in range(4)])
+            self.assertEqual(parse_numeric(bytes(records[3][dbf.slices['DSW_MASH']])), 3000)
+
+    def test_deleted_records_and_eof(self):
+        """Test deleted records are skipped and the EOF marker ends the table"""
+        data = bytearray(self.path.read_bytes())
+        with DBFReader(self.path) as dbf:
+            start, length = dbf.header_length, dbf.record_length
+        data[start + length] = ord('*')
+        data[start + 3 * length] = 0x1A
+        self.path.write_bytes(bytes(data))
+
+        with DBFReader(self.path) as dbf:
+            self.assertEqual(len(list(dbf)), 2)
+            self.assertEqual(len(list(dbf.records(include_deleted=True))), 3)
+
+    def test_parse_numeric(self):
+        """Test numeric fields parse like dbfread"""
+        self.assertEqual(parse_numeric(b'   1234'), 1234)
+        self.assertEqual(parse_numeric(b'  12,5'), 12.5)
+        self.assertEqual(parse_numeric(b'***42'), 42)
+        self.assertIsNone(parse_numeric(b'      '))
+
+    def test_parse_date_and_logical(self):
+        """Test D and L fields parse like dbfread"""
+        self.assertEqual(parse_date(b'20240101'), date(2024, 1, 1))
+        self.assertIsNone(parse_date(b'00000000'))
+        self.assertIsNone(parse_date(b'        '))
+        with self.assertRaises(ValueError):
+            parse_date(b'2024AB01')
+        self.assertEqual([parse_logical(value) for value in (b'T', b'y', b'F', b'n', b'?', b' ')],
+                         [True, True, False, False, None, None])
+        with self.assertRaises(ValueError):
+            parse_logical(b'X')
+
+    def test_not_a_dbf(self):
+        """Test empty and truncated files are rejected"""
+        for data in (b'', b'\x03\x19'):
+            self.path.write_bytes(data)
+            with self.assertRaises(ValueError):
+                DBFReader(self.path)
+
+    @unittest.skipIf(DBF is None, "dbfread not installed")
+    def test_same_as_dbfread(self):
+        """Test the sample files read the same as with dbfread"""
+        self.assertTrue(SAMPLE_FILES)
+        for path in SAMPLE_FILES:
+            expected = [list(record.values()) for record in DBF(str(path), raw=True)]
+            with DBFReader(path) as dbf:
+                records = [[bytes(record[dbf.slices[name]]) for name in dbf.field_names]
+                           for record in dbf]
+            self.assertEqual(records, expected, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the DBF to CSV converter
+تست تبدیل DBF به CSV
+"""
+
+import io
+import csv
+import sys
+import gzip
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from dbf_reader import DBFReader
+import dbf_to_csv
+from dbf_to_csv import DBFtoCSVConverter, OptionError, parse_where
+from csv_to_dbf_complete import CompleteDBFConverter
+
+
+class TestDBFtoCSV(unittest.TestCase):
+    """Test cases for column projection and --where filtering"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.dbf = self.base / 'dskwor00.dbf'
+        workers = [
+            {'DSW_ID1': f'{i:08d}', 'PER_NATCOD': f'{i:010d}',
+             'DSW_LNAME': 'احمدی' if i % 2 else 'کریمی',
+             'DSW_MASH': str(50000000 * i), 'DSW_BIME': str(3500000 * i)}
+            for i in range(6)
+        ]
+        workers[5]['DSW_MASH'] = ''
+        with redirect_stdout(io.StringIO()):
+            CompleteDBFConverter(use_numpy=False).create_workers_file(
+                str(self.dbf), workers, '1234567890', 4, 7)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _convert(self, output_name: str = 'out.csv', **options) -> list:
+        """Convert the test file and return the CSV rows"""
+        output = self.base / output_name
+        if output.exists():
+            output.unlink()
+        with redirect_stdout(io.StringIO()):
+            DBFtoCSVConverter(**options).convert(str(self.dbf), str(output))
+        if not output.exists():
+            return []
+        opener = gzip.open if output_name.endswith('.gz') else open
+        with opener(output, 'rt', encoding='utf-8') as f:
+            return list(csv.reader(f))
+
+    def test_all_columns(self):
+        """Test every field is written by default"""
+        rows = self._convert()
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[0][:4], ['DSW_ID', 'DSW_YY', 'DSW_MM', 'DSW_LISTNO'])
+
+    def test_columns(self):
+        """Test only the selected columns are written, in the given order"""
+        rows = self._convert(columns=['DSW_MASH', 'DSW_ID1', 'DSW_LNAME'],
+                             include_persian_hex=True)
+        self.assertEqual(rows[0], ['DSW_MASH', 'DSW_ID1', 'DSW_LNAME', 'DSW_LNAME_HEX'])
+        self.assertEqual(rows[2][:3], ['50000000', '00000001', 'احمدی'])
+
+    def test_where_numeric(self):
+        """Test numeric conditions compare numbers; empty fields never match"""
+        rows = self._convert(columns=['DSW_ID1'], where=['DSW_MASH>100000000'])
+        self.assertEqual([row[0] for row in rows[1:]], ['00000003', '00000004'])
+
+        rows = self._convert(columns=['DSW_ID1'],
+                             where=['DSW_MASH >= 100000000', 'DSW_BIME<14000000'])
+        self.assertEqual([row[0] for row in rows[1:]], ['00000002', '00000003'])
+
+    def test_where_text(self):
+        """Test Persian conditions compare decoded text"""
+        rows = self._convert(columns=['DSW_ID1'], where=['DSW_LNAME=کریمی', 'DSW_ID1!=00000000'])
+        self.assertEqual([row[0] for row in rows[1:]], ['00000002', '00000004'])
+
+    def test_chunked_output(self):
+        """Test small chunks and gzip output give the same rows"""
+        rows = self._convert(include_persian_hex=True)
+        self.assertEqual(self._convert(include_persian_hex=True, chunk_size=4), rows)
+        self.assertEqual(self._convert('out.csv.gz', include_persian_hex=True, chunk_size=1), rows)
+        self.assertEqual(self._convert(where=['DSW_MASH>1000000000'], chunk_size=2), [])
+
+    def test_non_persian_bytes_kept(self):
+        """Test bytes >= 0x80 in other character fields pass through as latin-1"""
+        with DBFReader(self.dbf) as dbf:
+            start = dbf.header_length + dbf.record_length + dbf.slices['DSW_ID1'].start
+        data = bytearray(self.dbf.read_bytes())
+        data[start:start + 8] = b'0000\xe9\xff1'.ljust(8)
+        self.dbf.write_bytes(bytes(data))
+
+        rows = self._convert(columns=['DSW_ID1'])
+        self.assertEqual(rows[2], ['0000\xe9\xff1'])
+        rows = self._convert(columns=['DSW_ID1'], where=['DSW_ID1=0000\xe9\xff1'])
+        self.assertEqual(rows[1:], [['0000\xe9\xff1']])
+
+    def test_invalid_options(self):
+        """Test bad conditions and unknown fields are rejected"""
+        for options in ({'where': ['DSW_MASH ~ 5']}, {'where': ['DSW_MASH>many']},
+                        {'where': ['DSW_SALARY>5']}, {'columns': ['DSW_SALARY']}):
+            with self.assertRaises(OptionError):
+                self._convert(**options)
+
+    def test_data_errors_are_not_usage_errors(self):
+        """Test the CLI reports bad options as usage errors but not bad files"""
+        output = str(self.base / 'out.csv')
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()), \
+                redirect_stderr(io.StringIO()), \
+                patch.object(sys, 'argv', ['dbf_to_csv.py', str(self.dbf), '-o', output,
+                                           '--where', 'DSW_SALARY>5']):
+            dbf_to_csv.main()
+
+        # A corrupt numeric field met by a --where test
+        with DBFReader(self.dbf) as dbf:
+            start = dbf.header_length + dbf.slices['DSW_MASH'].start
+        data = bytearray(self.dbf.read_bytes())
+        data[start:start + 3] = b'1x2'
+        self.dbf.write_bytes(bytes(data))
+        with self.assertRaises(ValueError) as raised, redirect_stdout(io.StringIO()), \
+                patch.object(sys, 'argv', ['dbf_to_csv.py', str(self.dbf), '-o', output,
+                                           '--where', 'DSW_MASH>5']):
+            dbf_to_csv.main()
+        self.assertNotIsInstance(raised.exception, OptionError)
+
+    def test_parse_where(self):
+        """Test condition parsing"""
+        self.assertEqual(parse_where('DSW_MASH>100000000'), ('DSW_MASH', '>', '100000000'))
+        self.assertEqual(parse_where(' DSW_LNAME = احمدی '), ('DSW_LNAME', '=', 'احمدی'))
+
+
+if __name__ == '__main__':
+    unittest.main()
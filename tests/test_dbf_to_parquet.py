@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the DBF to Parquet converter
+تست تبدیل DBF به Parquet
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+
+from dbf_reader import DBFReader
+from dbf_to_parquet import DBFtoParquetConverter, read_parquet, main, np, pa
+from csv_to_dbf_complete import CompleteDBFConverter
+
+if pa is not None:
+    import pyarrow.parquet as pq
+
+
+@unittest.skipIf(np is None or pa is None, "numpy/pyarrow not installed")
+class TestDBFtoParquet(unittest.TestCase):
+    """Test cases for DBFtoParquetConverter"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.lake = self.base / 'lake'
+        self.dbf = self.base / 'dskwor00.dbf'
+        self.workers = [
+            {'DSW_ID1': f'{i:08d}', 'DSW_LNAME': 'احمدی' if i % 2 else 'کریمی',
+             'DSW_MASH': str(50000000 * i)}
+            for i in range(5)
+        ]
+        self._write_workers('0123456789', 4, 7)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_workers(self, workshop_id: str, year: int, month: int):
+        with redirect_stdout(io.StringIO()):
+            CompleteDBFConverter(use_numpy=False).create_workers_file(
+                str(self.dbf), self.workers, workshop_id, year, month, '12')
+
+    def test_typed_columns(self):
+        """Test numbers are int64 with empty fields as null and Persian is decoded"""
+        # The writer pads numbers with zeros: blank one field by hand
+        with DBFReader(self.dbf) as dbf:
+            start = dbf.header_length + 2 * dbf.record_length + dbf.slices['DSW_MASH'].start
+            length = dbf.slices['DSW_MASH'].stop - dbf.slices['DSW_MASH'].start
+        data = bytearray(self.dbf.read_bytes())
+        data[start:start + length] = b' ' * length
+        self.dbf.write_bytes(bytes(data))
+
+        DBFtoParquetConverter().convert(self.dbf, self.lake)
+        table = read_parquet(self.lake, 'dskwor')
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.schema.field('DSW_MASH').type, pa.int64())
+        self.assertEqual(table.column('DSW_MASH').to_pylist(),
+                         [0, 50000000, None, 150000000, 200000000])
+        self.assertEqual(table.column('DSW_LNAME').to_pylist()[:2], ['کریمی', 'احمدی'])
+        self.assertEqual(set(table.column('DSW_ID').to_pylist()), {'0123456789'})
+        self.assertEqual(set(table.column('DSW_MM').to_pylist()), {7})
+
+    def test_partitions_and_row_groups(self):
+        """Test the part file path and its row groups"""
+        parts = DBFtoParquetConverter(row_group_size=2).convert(self.dbf, self.lake)
+        path = self.lake / 'dskwor' / 'DSW_YY=4' / 'DSW_MM=7' / 'DSW_ID=0123456789' / 'dskwor-12.parquet'
+        self.assertEqual(parts, [(str(path), 5)])
+        metadata = pq.ParquetFile(path).metadata
+        self.assertEqual(metadata.num_row_groups, 3)
+        self.assertNotIn('DSW_YY', pq.read_schema(path).names)
+
+    def test_reconvert_replaces_list(self):
+        """Test converting a list again replaces it and other months are kept"""
+        converter = DBFtoParquetConverter()
+        converter.convert(self.dbf, self.lake)
+        converter.convert(self.dbf, self.lake)
+        self._write_workers('0123456789', 4, 8)
+        converter.convert(self.dbf, self.lake)
+
+        self.assertEqual(read_parquet(self.lake, 'dskwor').num_rows, 10)
+        august = read_parquet(self.lake, 'dskwor', filters=[('DSW_MM', '=', 8)])
+        self.assertEqual(august.num_rows, 5)
+        self.assertEqual(len(list(self.lake.rglob('.*'))), 0)
+
+    def test_empty_file(self):
+        """Test a file without records writes no part and is reported"""
+        self.workers = []
+        self._write_workers('0123456789', 4, 7)
+        self.assertEqual(DBFtoParquetConverter().convert(self.dbf, self.lake), [])
+
+        argv = ['dbf_to_parquet.py', str(self.dbf), '--output', str(self.lake)]
+        with patch.object(sys, 'argv', argv), redirect_stdout(io.StringIO()) as out:
+            main()
+        self.assertIn(f"{self.dbf}: No records found in DBF file", out.getvalue())
+        self.assertFalse(self.lake.exists())
+
+    def test_not_an_sso_file(self):
+        """Test files without the partition fields are rejected"""
+        data = bytearray(self.dbf.read_bytes())
+        data[32:36] = b'XXX_'  # Rename the first field (DSW_ID)
+        self.dbf.write_bytes(bytes(data))
+        with self.assertRaises(ValueError):
+            DBFtoParquetConverter().convert(self.dbf, self.lake)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for Iran System encoding
+تست انکودر Iran System
+
+Checks the table-driven encoder against known bytes from real SSO DBF files
+and against the original per-byte algorithm.
+"""
+
+import sys
+import codecs
+import random
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+
+from iran_system_encoding import IranSystemEncoder, EncodingCache
+from iran_system_decoder import IranSystemDecoder
+import iran_system_codec
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def reference_encode(text: str) -> bytes:
+    """Original per-byte implementation, kept as the byte-exact reference"""
+    enc = IranSystemEncoder
+    padded = " " + enc.normalize_persian(text) + " "
+    src = padded.encode('cp1256', errors='replace')
+
+    result = []
+    prev_char = 0
+    for i in range(len(src)):
+        byte_val = src[i]
+        if enc.is_latin_letter(byte_val):
+            cur = enc.get_latin_letter(byte_val)
+            result.append(cur)
+            prev_char = cur
+        elif 0 < i < len(src) - 1:
+            cur = enc.get_iran_system_char(src[i - 1], byte_val, src[i + 1])
+            if cur == 145 and prev_char == 243:
+                result[-1] = 242
+            else:
+                result.append(cur)
+            prev_char = cur
+
+    if len(result) > 2:
+        result = result[1:-1]
+    if not enc.is_number(text):
+        result.reverse()
+    return bytes(result)
+
+
+def random_corpus(count: int = 3000, seed: int = 1403) -> list:
+    """Random strings mixing Persian letters, digits, Latin and spaces"""
+    alphabet = (list("ابپتثجچحخدذرزژسشصضطظعغفقکگلمنوهیآأإؤئءةيكى")
+                + [' '] * 6
+                + list("0123456789۰۱۲۳۴۵۶۷۸۹")
+                + list("abcXYZ()[]{}-/.,،؟?\t"))
+    rng = random.Random(seed)
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+            for _ in range(count)]
+
+
+class TestIranSystemEncoder(unittest.TestCase):
+    """Test cases for IranSystemEncoder"""
+
+    def test_known_samples(self):
+        """Test against bytes taken from real DBF files"""
+        samples = {
+            'علی': b'\xfc\xf3\xe4',
+            'حسن': b'\xf6\xa8\x9f',
+            'محمدحسین': b'\xf6\xfe\xa8\x9f\xa2\xf5\x9f\xf5',
+        }
+        for text, expected in samples.items():
+            self.assertEqual(IranSystemEncoder.unicode_to_iran_system(text), expected)
+
+    def test_lam_alef_ligature(self):
+        """Test لا is written as a single ligature byte"""
+        self.assertEqual(IranSystemEncoder.unicode_to_iran_system('لا'), b'\xf2')
+
+    def test_numbers_not_reversed(self):
+        """Test numeric text keeps its order and uses Iran System digits"""
+        self.assertEqual(IranSystemEncoder.unicode_to_iran_system('123'), b'\x81\x82\x83')
+        self.assertEqual(IranSystemEncoder.unicode_to_iran_system('۱۲۳'), b'\x81\x82\x83')
+
+    def test_empty_text(self):
+        """Test empty input keeps the legacy two-space result"""
+        self.assertEqual(IranSystemEncoder.unicode_to_iran_system(''), b'  ')
+
+    def test_normalization_avoids_replacement(self):
+        """Test characters missing from Windows-1256 do not become '?'"""
+        for text in ['٠١٢٣٤٥٦٧٨٩', 'خانۀ', 'ڪار', 'نرم\u200cافزار', 'مُحَمَّد', 'ٱ']:
+            self.assertNotIn(b'?', IranSystemEncoder.unicode_to_iran_system(text), text)
+
+    def test_normalization_table(self):
+        """Test normalization maps variants and drops diacritics"""
+        normalize = IranSystemEncoder.normalize_persian
+        self.assertEqual(normalize('کی'), 'كي')
+        self.assertEqual(normalize('۱۴۰۳٠٩'), '140309')
+        self.assertEqual(normalize('نرم\u200cافزار'), 'نرم افزار')
+        self.assertEqual(normalize('مُحَمَّد'), 'محمد')
+
+    def test_matches_reference(self):
+        """Test table-driven engine is byte-identical to the per-byte algorithm"""
+        for text in random_corpus():
+            self.assertEqual(
+                IranSystemEncoder.unicode_to_iran_system(text),
+                reference_encode(text),
+                f"Mismatch for {text!r}"
+            )
+
+
+class TestColumnEncoding(unittest.TestCase):
+    """Test cases for the batch column API"""
+
+    def test_encode_many_matches_single(self):
+        """Test batch encoding equals encoding each value separately"""
+        texts = random_corpus(500) * 2
+        encoder = IranSystemEncoder()
+        self.assertEqual(
+            encoder.encode_many(texts),
+            [IranSystemEncoder.unicode_to_iran_system(t) for t in texts]
+        )
+
+    def test_encode_column_fixed_width(self):
+        """Test column blocks are padded, truncated and blank-aware"""
+        encoder = IranSystemEncoder()
+        column = encoder.encode_column(['علی', '', None, ' محمد ', 'ا' * 30], 10)
+
+        self.assertTrue(all(len(block) == 10 for block in column))
+        self.assertEqual(column[0], b'\xfc\xf3\xe4' + b' ' * 7)
+        self.assertEqual(column[1], b' ' * 10)
+        self.assertEqual(column[2], b' ' * 10)
+        self.assertEqual(column[3][:4],
+                         IranSystemEncoder.unicode_to_iran_system(' محمد ')[:4])
+
+    def test_encode_column_strip(self):
+        """Test strip=True encodes the stripped value"""
+        encoder = IranSystemEncoder()
+        column = encoder.encode_column([' علی '], 5, strip=True)
+        self.assertEqual(column[0], b'\xfc\xf3\xe4  ')
+
+    def test_encode_into_buffer(self):
+        """Test encode_into fills only its slice of a reused record buffer"""
+        encoder = IranSystemEncoder()
+        buffer = bytearray(b'#' * 12)
+
+        written = encoder.encode_into(buffer, 1, 5, 'علی')
+        self.assertEqual(written, 3)
+        self.assertEqual(buffer, b'#\xfc\xf3\xe4  ######')
+
+        encoder.encode_into(buffer, 6, 2, 'علی')
+        self.assertEqual(buffer[6:], b'\xfc\xf3####')
+
+        encoder.encode_into(memoryview(buffer), 1, 5, '')
+        self.assertEqual(buffer[:6], b'#     ')
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_encode_column_array(self):
+        """Test NumPy column holds the same fixed-width blocks"""
+        encoder = IranSystemEncoder()
+        values = ['علی', '', 'فاطمه', 'علی']
+        array = encoder.encode_column_array(values, 8)
+
+        self.assertEqual(array.dtype, np.dtype('S8'))
+        self.assertEqual(array.tobytes(), b''.join(encoder.encode_column(values, 8)))
+
+
+class TestEncodingCache(unittest.TestCase):
+    """Test cases for the LRU encoding cache"""
+
+    def test_encode_uses_cache(self):
+        """Test repeated values are served from the cache"""
+        encoder = IranSystemEncoder(cache_size=16)
+        for text in ['مرد', 'زن', 'مرد', 'مرد', 'ایرانی']:
+            self.assertEqual(encoder.encode(text),
+                             IranSystemEncoder.unicode_to_iran_system(text))
+
+        stats = encoder.cache_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['evictions'], 0)
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first"""
+        cache = EncodingCache(maxsize=2)
+        cache.put('a', b'1')
+        cache.put('b', b'2')
+        cache.get('a')
+        cache.put('c', b'3')
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'1')
+
+    def test_disabled_cache(self):
+        """Test cache size 0 stores nothing"""
+        encoder = IranSystemEncoder(cache_size=0)
+        encoder.encode('علی')
+        encoder.encode('علی')
+        self.assertEqual(len(encoder.cache), 0)
+        self.assertEqual(encoder.cache_stats()['hits'], 0)
+
+
+class TestVendoredEncoder(unittest.TestCase):
+    """Test the copy vendored into sap_integration/sap_to_dbf_standalone.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+        import vendor_encoder
+        cls.vendor_encoder = vendor_encoder
+
+        # Run only the vendored block (the script itself needs pandas)
+        source = vendor_encoder.STANDALONE_SCRIPT.read_text(encoding='utf-8')
+        cls.block = vendor_encoder.extract_block(source)
+        namespace = {}
+        exec(compile(cls.block, str(vendor_encoder.STANDALONE_SCRIPT), 'exec'), namespace)
+        cls.VendoredEncoder = namespace['IranSystemEncoder']
+
+    def test_block_up_to_date(self):
+        """Test vendored block equals a fresh generation from the encoder"""
+        self.assertEqual(self.block, self.vendor_encoder.generate_block(),
+                         "Run: python tools/vendor_encoder.py")
+
+    def test_schema_block_up_to_date(self):
+        """Test vendored field lists equal the 'sap-2024' schema"""
+        source = self.vendor_encoder.STANDALONE_SCRIPT.read_text(encoding='utf-8')
+        block = self.vendor_encoder.extract_block(source,
+                                                  self.vendor_encoder.SCHEMA_BEGIN_MARKER,
+                                                  self.vendor_encoder.SCHEMA_END_MARKER)
+        self.assertEqual(block, self.vendor_encoder.generate_schema_block(),
+                         "Run: python tools/vendor_encoder.py")
+
+    def test_matches_canonical_encoder(self):
+        """Test vendored engine is byte-identical to IranSystemEncoder"""
+        vendored = self.VendoredEncoder()
+        extra = ['', 'لا', '123', '۱۴۰۳', 'نرم\u200cافزار', 'مُحَمَّد', 'خانۀ']
+        for text in random_corpus() + extra:
+            self.assertEqual(
+                vendored.encode(text),
+                IranSystemEncoder.unicode_to_iran_system(text),
+                f"Mismatch for {text!r}"
+            )
+
+
+class TestIranSystemDecoder(unittest.TestCase):
+    """Test cases for the table-driven decoder"""
+
+    @staticmethod
+    def reference_decode(data: bytes) -> str:
+        """Original per-byte dict lookup"""
+        mapping = IranSystemDecoder.IRAN_SYSTEM_TO_UNICODE
+        return ''.join(mapping.get(byte, '\uFFFD') for byte in data)[::-1]
+
+    def test_matches_reference(self):
+        """Test charmap decoding equals the per-byte lookup"""
+        rng = random.Random(1403)
+        samples = [bytes(range(256))] + [
+            bytes(rng.randrange(256) for _ in range(rng.randint(0, 30)))
+            for _ in range(2000)
+        ]
+        for data in samples:
+            self.assertEqual(IranSystemDecoder.decode(data), self.reference_decode(data))
+        self.assertEqual(IranSystemDecoder.decode(b'\xf2\xfc', reverse=False), 'لای')
+
+    def test_decode_column(self):
+        """Test column decoding strips like decode_field and caches repeats"""
+        decoder = IranSystemDecoder()
+        values = [b'\xfc\xf3\xe4   ', '\xfc\xf3\xe4\x00', None, b'', b'\xf6\xa8\x9f']
+        self.assertEqual(decoder.decode_column(values), ['علی', 'علی', '', '', 'حسن'])
+        self.assertEqual(decoder.decode_column(values[:2]),
+                         [IranSystemDecoder.decode_field(v) for v in values[:2]])
+
+        stats = decoder.cache_stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 3)
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test the throughput benchmark helpers (tools/benchmark_encoding.py)"""
+
+    @classmethod
+    def setUpClass(cls):
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+        import benchmark_encoding
+        cls.bench = benchmark_encoding
+
+    def test_run_benchmarks(self):
+        """Test every benchmark reports positive throughput"""
+        texts = self.bench.synthetic_corpus(50)
+        corpus = {
+            'texts': texts,
+            'encoded': [IranSystemEncoder.unicode_to_iran_system(t) for t in texts],
+        }
+        results = self.bench.run_benchmarks(corpus, repeat=1)
+
+        self.assertIn('encode', results)
+        self.assertIn('decode_column', results)
+        for result in results.values():
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertGreater(result['mb_per_sec'], 0)
+
+    def test_regression_flagging(self):
+        """Test only benchmarks slower than the tolerance are flagged"""
+        baseline = {'encode': {'ops_per_sec': 1000}, 'decode': {'ops_per_sec': 1000}}
+        results = {'encode': {'ops_per_sec': 700}, 'decode': {'ops_per_sec': 900},
+                   'new': {'ops_per_sec': 1}}
+        self.assertEqual(self.bench.compare_to_baseline(results, baseline, 0.25), ['encode'])
+
+
+class TestIranSystemCodec(unittest.TestCase):
+    """Test cases for the registered 'iran-system' codec"""
+
+    def test_encode(self):
+        """Test str.encode uses the context-sensitive encoder"""
+        self.assertEqual('علی'.encode('iran-system'), b'\xfc\xf3\xe4')
+        self.assertEqual(''.encode('iran-system'), b'')
+
+    def test_encode_errors(self):
+        """Test characters without a mapping follow the errors handler"""
+        text = 'علی ☃'
+        with self.assertRaises(UnicodeEncodeError) as raised:
+            text.encode('iran-system')
+        self.assertEqual((raised.exception.start, raised.exception.end), (4, 5))
+
+        self.assertEqual(text.encode('iran-system', errors='replace'),
+                         IranSystemEncoder.unicode_to_iran_system(text))
+        self.assertEqual(text.encode('iran-system', errors='replace'),
+                         'علی ?'.encode('iran-system'))
+        self.assertEqual(text.encode('iran-system', errors='ignore'),
+                         'علی '.encode('iran-system'))
+
+    def test_decode_matches_decoder(self):
+        """Test bytes.decode reversed equals IranSystemDecoder.decode"""
+        data = bytes(range(256))
+        self.assertEqual(data.decode('iran-system', errors='replace')[::-1],
+                         IranSystemDecoder.decode(data))
+        self.assertEqual(b'\xf2'.decode('iran_system'), 'لا')
+
+    def test_undefined_byte_strict(self):
+        """Test undefined bytes raise with errors='strict'"""
+        with self.assertRaises(UnicodeDecodeError):
+            b'\x7f'.decode('iran-system')
+
+    def test_incremental_encoder_buffers(self):
+        """Test incremental encoder emits the whole text on final"""
+        encoder = codecs.getincrementalencoder('iran-system')()
+        output = encoder.encode('عل') + encoder.encode('ی', final=True)
+        self.assertEqual(output, b'\xfc\xf3\xe4')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the SSO schema registry
+تست ساختار نسخه‌های DBF سازمان تامین اجتماعی
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+
+from sso_schema import (SCHEMAS, DEFAULT_SCHEMA, SSOSchema, get_schema,
+                        compile_schema, find_schema, all_persian_fields)
+
+
+class TestSchemaRegistry(unittest.TestCase):
+    """Test cases for the registered schemas"""
+
+    def test_record_lengths(self):
+        """Test layouts match docs/NEW_STRUCTURE_2024.md"""
+        expected = {
+            'pre-2024': (26, 609, 31, 398),
+            'sso-2024': (25, 311, 29, 469),
+        }
+        for version, (header_count, header_length, worker_count, worker_length) in expected.items():
+            schema = compile_schema(version)
+            self.assertEqual(len(schema.header_layout), header_count)
+            self.assertEqual(schema.header_layout.record_length, header_length)
+            self.assertEqual(len(schema.worker_layout), worker_count)
+            self.assertEqual(schema.worker_layout.record_length, worker_length)
+
+    def test_compiled_once(self):
+        """Test layouts and encoder are shared between callers"""
+        schema = compile_schema(DEFAULT_SCHEMA)
+        self.assertIs(compile_schema(DEFAULT_SCHEMA), schema)
+        self.assertIs(compile_schema(DEFAULT_SCHEMA).worker_layout, schema.worker_layout)
+        self.assertIsNot(compile_schema('pre-2024'), schema)
+
+    def test_unknown_version(self):
+        """Test unknown versions are rejected with the known ones listed"""
+        with self.assertRaises(ValueError) as context:
+            get_schema('sso-1999')
+        self.assertIn('sso-2024', str(context.exception))
+
+    def test_find_schema(self):
+        """Test a file's fields identify its version"""
+        for version, schema in SCHEMAS.items():
+            names = [field[0] for field in schema.worker_fields]
+            lengths = [field[2] for field in schema.worker_fields]
+            self.assertEqual(find_schema(names, lengths), version)
+        self.assertEqual(find_schema([field[0] for field in get_schema('pre-2024').header_fields]),
+                         'pre-2024')
+        self.assertIsNone(find_schema(['DSW_ID', 'DSW_YY']))
+
+    def test_persian_fields(self):
+        """Test readers see the Persian fields of every version"""
+        self.assertEqual(all_persian_fields(), get_schema('sso-2024').persian_fields)
+        self.assertLess(get_schema('pre-2024').worker_persian_fields,
+                        get_schema('sso-2024').worker_persian_fields)
+
+    def test_dbf_spec(self):
+        """Test the dbf library spec string"""
+        fields = [('DSW_ID', 'C', 10, 0), ('DSW_YY', 'N', 2, 0), ('DSW_RATE', 'N', 6, 2)]
+        self.assertEqual(SSOSchema.dbf_spec(fields),
+                         'DSW_ID C(10); DSW_YY N(2,0); DSW_RATE N(6,2)')
+
+
+class TestSchemaValidation(unittest.TestCase):
+    """Test cases for the compiled validators"""
+
+    def setUp(self):
+        self.schema = compile_schema('sso-2024')
+
+    def test_valid_record(self):
+        """Test a record that fits has no problems"""
+        record = {
+            'DSW_ID1': '12345678', 'DSW_FNAME': 'علی', 'DSW_DD': '30',
+            'DSW_MASH': '32000000', 'DSW_MAZ': '', 'UNKNOWN': 'x' * 500,
+        }
+        self.assertEqual(self.schema.validate_worker(record), [])
+
+    def test_problems(self):
+        """Test overflowing, non-numeric and non-ASCII values are reported"""
+        problems = self.schema.validate_worker({
+            'DSW_ID1': '123456789',
+            'DSW_FNAME': 'علی' * 30,
+            'DSW_DD': 'سی',
+            'DSW_MASH': '1234567890123',
+            'PER_NATCOD': '۱۲۳',
+        })
+        self.assertEqual([problem.split(':')[0] for problem in problems],
+                         ['DSW_ID1', 'DSW_FNAME', 'DSW_DD', 'DSW_MASH', 'PER_NATCOD'])
+
+    def test_header_widths_depend_on_version(self):
+        """Test the same header value fits one version but not the other"""
+        record = {'DSK_NAME': 'شرکت ' * 10}
+        self.assertEqual(len(self.schema.validate_header(record)), 1)
+        self.assertEqual(compile_schema('pre-2024').validate_header(record), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Iran System Encoder/Decoder Benchmark
+بنچمارک سرعت انکودر و دیکدر Iran System
+
+Measures ops/sec and MB/s for the encoder, the decoder and the fixed-width
+padding helpers on a realistic Persian corpus:
+
+    - Persian fields extracted from the sample DBFs in the repository
+      (finaltest/, bst/, final_samples/)
+    - Synthetic names, addresses and occupations
+
+Results are compared with a stored baseline (benchmark_baseline.json) and
+any benchmark slower than the allowed tolerance is flagged as a regression.
+MB/s is measured on the Iran System side (encoded output, decoded input).
+
+Usage:
+    # Run and compare with the stored baseline
+    python benchmark_encoding.py
+
+    # Store the current results as the new baseline
+    python benchmark_encoding.py --save-baseline
+
+    # Exit with code 1 when a regression is found (for CI)
+    python benchmark_encoding.py --check --tolerance 0.25
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.iran_system_encoding import IranSystemEncoder
+from utils.iran_system_decoder import IranSystemDecoder
+from utils.sso_schema import all_persian_fields
+
+try:
+    from dbfread import DBF
+except ImportError:
+    DBF = None  # Optional: without dbfread only the synthetic corpus is used
+
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# Sample DBFs used for the real-data corpus
+SAMPLE_DIRS = ['finaltest', 'bst', 'final_samples']
+
+BASELINE_FILE = Path(__file__).parent / 'benchmark_baseline.json'
+
+PERSIAN_FIELDS = all_persian_fields()
+
+# Field width used by the padding benchmarks (DSW_LNAME)
+PADDING_WIDTH = 60
+
+# Building blocks for the synthetic corpus
+FIRST_NAMES = ['علی', 'محمد', 'حسین', 'رضا', 'مهدی', 'فاطمه', 'زهرا', 'مریم',
+               'سارا', 'امیرحسین', 'محمدرضا', 'عبدالله', 'لیلا', 'نرگس', 'یاسمن']
+LAST_NAMES = ['احمدی', 'محمدی', 'حسینی', 'رضایی', 'کریمی', 'موسوی', 'جعفری',
+              'صادقی', 'قاسمی', 'نوروزی', 'طالبی', 'شجاعی', 'کاظم زاده', 'ملک پور']
+CITIES = ['تهران', 'اصفهان', 'شیراز', 'مشهد', 'تبریز', 'کرج', 'قم', 'اهواز',
+          'کرمانشاه', 'رشت', 'یزد', 'ارومیه']
+STREETS = ['خیابان آزادی', 'خیابان ولیعصر', 'بلوار کشاورز', 'میدان انقلاب',
+           'کوچه لاله', 'خیابان فلسطین', 'بزرگراه همت']
+OCCUPATIONS = ['کارگر ساده', 'کارمند اداری', 'راننده', 'نگهبان', 'حسابدار',
+               'مهندس عمران', 'تکنسین برق', 'آشپز', 'منشی', 'مدیر فروش',
+               'کارشناس منابع انسانی', 'اپراتور ماشین آلات']
+
+
+def synthetic_corpus(count: int = 5000, seed: int = 1403) -> List[str]:
+    """
+    Generate synthetic Persian field values
+
+    Args:
+        count: Number of values
+        seed: Random seed (the corpus is deterministic)
+
+    Returns:
+        List of names, addresses and occupations
+    """
+    rng = random.Random(seed)
+    generators = [
+        lambda: rng.choice(FIRST_NAMES),
+        lambda: rng.choice(LAST_NAMES),
+        lambda: f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        lambda: (f"{rng.choice(CITIES)} {rng.choice(STREETS)} "
+                 f"پلاک {rng.randint(1, 400)}"),
+        lambda: rng.choice(OCCUPATIONS),
+        lambda: rng.choice(['مرد', 'زن']),
+        lambda: 'ایرانی',
+    ]
+    return [rng.choice(generators)() for _ in range(count)]
+
+
+def dbf_corpus(root: Path = REPO_ROOT) -> List[bytes]:
+    """
+    Extract raw Iran System values of Persian fields from the sample DBFs
+
+    Args:
+        root: Repository root containing the sample directories
+
+    Returns:
+        List of raw field values (trailing spaces stripped, blanks skipped)
+    """
+    if DBF is None:
+        return []
+
+    values = []
+    for directory in SAMPLE_DIRS:
+        for path in sorted((root / directory).rglob('*')):
+            if path.suffix.lower() != '.dbf':
+                continue
+            for record in DBF(str(path), raw=True):
+                for field_name, value in record.items():
+                    if field_name in PERSIAN_FIELDS:
+                        value = value.rstrip(b' \x00')
+                        if value:
+                            values.append(value)
+    return values
+
+
+def build_corpus(synthetic_count: int = 5000) -> Dict[str, list]:
+    """
+    Build matching text and byte corpora
+
+    Args:
+        synthetic_count: Number of synthetic values to add
+
+    Returns:
+        Dictionary with 'texts' (Unicode, for the encoder) and
+        'encoded' (Iran System bytes, for the decoder)
+    """
+    raw_values = dbf_corpus()
+    texts = [IranSystemDecoder.decode(value) for value in raw_values]
+    texts += synthetic_corpus(synthetic_count)
+
+    return {
+        'texts': texts,
+        'encoded': [IranSystemEncoder.unicode_to_iran_system(t) for t in texts],
+        'dbf_values': len(raw_values),
+    }
+
+
+def _measure(func: Callable[[], object], ops: int, nbytes: int,
+             repeat: int) -> Dict[str, float]:
+    """Run func `repeat` times and report the best round"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    best = max(best, 1e-9)
+    return {
+        'seconds': best,
+        'ops_per_sec': ops / best,
+        'mb_per_sec': nbytes / best / (1024 * 1024),
+    }
+
+
+def run_benchmarks(corpus: Dict[str, list], repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Run all benchmarks on a corpus
+
+    Args:
+        corpus: Output of build_corpus()
+        repeat: Rounds per benchmark (best round is reported)
+
+    Returns:
+        Dictionary of benchmark name -> ops_per_sec, mb_per_sec, seconds
+    """
+    texts = corpus['texts']
+    encoded = corpus['encoded']
+    ops = len(texts)
+    encoded_bytes = sum(len(e) for e in encoded)
+    padded_bytes = ops * PADDING_WIDTH
+
+    encode = IranSystemEncoder.unicode_to_iran_system
+    decode = IranSystemDecoder.decode
+
+    def encode_cached():
+        encoder = IranSystemEncoder()
+        for text in texts:
+            encoder.encode(text)
+
+    def encode_column():
+        IranSystemEncoder().encode_column(texts, PADDING_WIDTH)
+
+    def encode_into():
+        encoder = IranSystemEncoder()
+        buffer = bytearray(PADDING_WIDTH)
+        for text in texts:
+            encoder.encode_into(buffer, 0, PADDING_WIDTH, text)
+
+    def decode_column():
+        IranSystemDecoder().decode_column(encoded)
+
+    benchmarks = {
+        'encode': (lambda: [encode(t) for t in texts], encoded_bytes),
+        'encode_cached': (encode_cached, encoded_bytes),
+        'encode_column': (encode_column, padded_bytes),
+        'encode_into': (encode_into, padded_bytes),
+        'decode': (lambda: [decode(e) for e in encoded], encoded_bytes),
+        'decode_column': (decode_column, encoded_bytes),
+    }
+
+    return {name: _measure(func, ops, nbytes, repeat)
+            for name, (func, nbytes) in benchmarks.items()}
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]],
+                        baseline: Dict[str, Dict[str, float]],
+                        tolerance: float = 0.25) -> List[str]:
+    """
+    Find benchmarks that got slower than the baseline
+
+    Args:
+        results: Output of run_benchmarks()
+        baseline: Stored results
+        tolerance: Allowed slowdown as a fraction (0.25 = 25% fewer ops/sec)
+
+    Returns:
+        Names of regressed benchmarks
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if result['ops_per_sec'] < baseline[name]['ops_per_sec'] * (1 - tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Dict[str, Dict[str, float]]:
+    """Load stored baseline results (empty if there is none)"""
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], corpus_size: int,
+                  path: Path = BASELINE_FILE):
+    """Store results as the new baseline"""
+    data = {
+        'python': sys.version.split()[0],
+        'corpus_size': corpus_size,
+        'results': {name: {key: round(value, 6 if key == 'seconds' else 2)
+                           for key, value in result.items()}
+                    for name, result in results.items()},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def print_results(results: Dict[str, Dict[str, float]],
+                  baseline: Dict[str, Dict[str, float]],
+                  regressions: List[str]):
+    """Print a results table with the change against the baseline"""
+    print(f"{'Benchmark':<16} {'ops/sec':>14} {'MB/s':>10} {'vs baseline':>12}")
+    print("-" * 56)
+    for name, result in results.items():
+        change = ''
+        if name in baseline:
+            ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+            change = f"{(ratio - 1) * 100:+.1f}%"
+        flag = '  ❌ REGRESSION' if name in regressions else ''
+        print(f"{name:<16} {result['ops_per_sec']:>14,.0f} "
+              f"{result['mb_per_sec']:>10.2f} {change:>12}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark Iran System encoder/decoder throughput'
+    )
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Rounds per benchmark (best round is reported)')
+    parser.add_argument('--synthetic', type=int, default=5000,
+                       help='Number of synthetic corpus values')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                       help='Allowed slowdown before flagging a regression (0.25 = 25%%)')
+    parser.add_argument('--baseline', default=str(BASELINE_FILE),
+                       help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Store the results as the new baseline')
+    parser.add_argument('--check', action='store_true',
+                       help='Exit with code 1 if a regression is found')
+
+    args = parser.parse_args()
+    baseline_path = Path(args.baseline)
+
+    print("=" * 80)
+    print("⏱️  Iran System Encoder/Decoder Benchmark")
+    print("=" * 80)
+
+    corpus = build_corpus(args.synthetic)
+    if DBF is None:
+        print("⚠️  dbfread not installed: sample DBF corpus skipped")
+    print(f"Corpus: {len(corpus['texts'])} values "
+          f"({corpus['dbf_values']} from sample DBFs, {args.synthetic} synthetic)")
+    print()
+
+    results = run_benchmarks(corpus, repeat=args.repeat)
+    baseline = load_baseline(baseline_path)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+
+    print_results(results, baseline, regressions)
+    print()
+
+    if args.save_baseline:
+        save_baseline(results, len(corpus['texts']), baseline_path)
+        print(f"💾 Baseline saved: {baseline_path}")
+    elif not baseline:
+        print("ℹ️  No baseline found (run with --save-baseline to store one)")
+    elif regressions:
+        print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        if args.check:
+            sys.exit(1)
+    else:
+        print("✅ No regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -21,15 +21,22 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from utils.iran_system_encoding import IranSystemEncoder
+from utils.sso_schema import compile_schema, get_schema
 import struct
 
 
 class CSVtoDBFConverter:
     """Convert CSV files to DBF format for Iranian Social Security"""
 
+    # SSO format version written by this converter
+    SCHEMA = 'pre-2024'
+
+    # Persian field names that need Iran System encoding
+    PERSIAN_FIELDS = get_schema(SCHEMA).worker_persian_fields
+
     def __init__(self):
-        self.encoder = IranSystemEncoder()
+        self.schema = compile_schema(self.SCHEMA)
+        self.encoder = self.schema.encoder
 
     def read_csv(self, csv_file: str) -> list:
         """Read CSV file and return list of dictionaries"""
@@ -55,40 +62,8 @@ class CSVtoDBFConverter:
         print("🔨 Creating DBF file with binary writing")
         print("=" * 80)
 
-        # DBF structure - dskwor00.dbf (31 fields)
-        fields = [
-            ('DSW_ID', 'C', 10, 0),
-            ('DSW_YY', 'N', 2, 0),
-            ('DSW_MM', 'N', 2, 0),
-            ('DSW_LISTNO', 'C', 12, 0),
-            ('DSW_ID1', 'C', 8, 0),
-            ('DSW_FNAME', 'C', 20, 0),
-            ('DSW_LNAME', 'C', 25, 0),
-            ('DSW_DNAME', 'C', 20, 0),
-            ('DSW_IDNO', 'C', 15, 0),
-            ('DSW_IDPLC', 'C', 30, 0),
-            ('DSW_IDATE', 'C', 8, 0),
-            ('DSW_BDATE', 'C', 8, 0),
-            ('DSW_SEX', 'C', 3, 0),
-            ('DSW_NAT', 'C', 10, 0),
-            ('DSW_OCP', 'C', 50, 0),
-            ('DSW_SDATE', 'C', 8, 0),
-            ('DSW_EDATE', 'C', 8, 0),
-            ('DSW_DD', 'N', 2, 0),
-            ('DSW_ROOZ', 'N', 12, 0),
-            ('DSW_MAH', 'N', 12, 0),
-            ('DSW_MAZ', 'N', 12, 0),
-            ('DSW_MASH', 'N', 12, 0),
-            ('DSW_TOTL', 'N', 12, 0),
-            ('DSW_BIME', 'N', 12, 0),
-            ('DSW_PRATE', 'N', 2, 0),
-            ('DSW_KOSO', 'N', 12, 0),
-            ('DSW_BIME20', 'N', 12, 0),
-            ('PER_NATCOD', 'C', 10, 0),
-            ('DSW_JOB', 'C', 10, 0),
-            ('DSW_INC', 'N', 19, 0),
-            ('DSW_SPOUSE', 'N', 19, 0),
-        ]
+        # DBF structure - dskwor00.dbf (31 fields, see utils/sso_schema.py)
+        fields = self.schema.worker_layout.fields
 
         # Calculate record length
         record_length = 1  # Deletion flag
@@ -99,6 +74,17 @@ class CSVtoDBFConverter:
         print(f"Number of records: {len(records)}")
         print()
 
+        # Encode Persian columns in bulk (identical values are encoded once)
+        persian_columns = {
+            field_name: self.encoder.encode_column(
+                [record.get(field_name, '') for record in records],
+                field_length,
+                strip=True
+            )
+            for field_name, field_type, field_length, field_decimal in fields
+            if field_type == 'C' and field_name in self.PERSIAN_FIELDS
+        }
+
         with open(output_file, 'wb') as f:
             # Write DBF header
             self._write_header(f, len(records), record_length, fields)
@@ -106,7 +92,10 @@ class CSVtoDBFConverter:
             # Write records
             for i, record in enumerate(records, 1):
                 print(f"Writing record {i}/{len(records)}: {record.get('DSW_FNAME', '')} {record.get('DSW_LNAME', '')}")
-                self._write_record(f, record, fields, workshop_id, year, month)
+                encoded_fields = {name: column[i - 1]
+                                  for name, column in persian_columns.items()}
+                self._write_record(f, record, fields, workshop_id, year, month,
+                                   encoded_fields)
 
             # Write end-of-file marker
             f.write(b'\x1A')
@@ -145,16 +134,26 @@ class CSVtoDBFConverter:
         f.write(b'\x0D')
 
     def _write_record(self, f, record: dict, fields: list,
-                     workshop_id: str, year: int, month: int):
-        """Write a single DBF record"""
+                     workshop_id: str, year: int, month: int,
+                     encoded_fields: dict = None):
+        """
+        Write a single DBF record
+
+        encoded_fields optionally maps field names to blocks already produced
+        by IranSystemEncoder.encode_column(); those are written as-is.
+        """
 
         # Deletion flag
         f.write(b' ')
 
-        # Persian field names that need Iran System encoding
-        persian_fields = {'DSW_FNAME', 'DSW_LNAME', 'DSW_DNAME', 'DSW_IDPLC', 'DSW_OCP'}
+        persian_fields = self.PERSIAN_FIELDS
+        encoded_fields = encoded_fields or {}
 
         for field_name, field_type, field_length, field_decimal in fields:
+            if field_name in encoded_fields:
+                f.write(encoded_fields[field_name])
+                continue
+
             # Get value from record or use default
             if field_name == 'DSW_ID':
                 value = workshop_id
@@ -170,7 +169,7 @@ class CSVtoDBFConverter:
                 # Character field
                 if field_name in persian_fields and value and str(value).strip():
                     # Use Iran System encoding for Persian text
-                    encoded = self.encoder.unicode_to_iran_system(str(value).strip())
+                    encoded = self.encoder.encode(str(value).strip())
                     # Pad or truncate to field length
                     if len(encoded) > field_length:
                         encoded = encoded[:field_length]
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch CSV to DBF Converter
+تبدیل دسته‌ای چند کارگاه در یک process
+
+Converts many workshops (one dskkar00/dskwor00 pair each) listed in a
+manifest CSV. Interpreter startup, imports and the schema/encoder setup are
+paid once per pool process instead of once per workshop, and the encoder
+cache stays warm from one workshop to the next.
+
+Manifest columns (one row per workshop, relative paths are resolved from
+the manifest's directory):
+
+    header_csv,workers_csv,output_dir,workshop_id,year,month,list_no
+    kar/1001.csv,wor/1001.csv,out/1001,1234567890,4,7,12
+    kar/1002.csv,wor/1002.csv,out/1002,,,,
+
+Empty workshop_id/year/month/list_no are taken from the header CSV
+(DSK_ID, DSK_YY, DSK_MM, DSK_LISTNO, zero-padded to 10 and 11 digits), as
+sap_integration/sap_xls_to_dbf.py does. header_csv, workers_csv and
+output_dir must be given on every row.
+
+Usage:
+    python csv_to_dbf_batch.py manifest.csv --jobs 4 --summary summary.csv
+
+    # Skip workshops whose input did not change since the last run
+    python csv_to_dbf_batch.py manifest.csv --deterministic --result-cache .sso_results
+"""
+
+import io
+import os
+import csv
+import sys
+import time
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+from typing import List
+
+# Add tools and src directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from csv_to_dbf_complete import CompleteDBFConverter, DEFAULT_SCHEMA, SCHEMAS
+from utils.result_cache import ResultCache
+
+
+MANIFEST_COLUMNS = ('header_csv', 'workers_csv', 'output_dir')
+OUTPUT_FILES = ('dskkar00.dbf', 'dskwor00.dbf')
+SUMMARY_COLUMNS = ('row', 'workshop_id', 'year', 'month', 'workers', 'bad_cells',
+                   'status', 'cached', 'seconds', 'output_dir', 'error')
+
+# (converter, deterministic, result cache) of the current process
+# (see _init_batch_converter)
+_batch_converter = None
+
+
+def read_manifest(manifest_file: str) -> List[dict]:
+    """
+    Read the workshop jobs of a manifest
+
+    Args:
+        manifest_file: Manifest CSV (see module docstring)
+
+    Returns:
+        One job per row with absolute paths and its 1-based manifest row
+
+    Raises:
+        ValueError: A required column is missing or empty on some row
+    """
+    base = Path(manifest_file).resolve().parent
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = [name for name in MANIFEST_COLUMNS if name not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Manifest needs columns: {', '.join(missing)}")
+        rows = list(reader)
+
+    jobs = []
+    for row, entry in enumerate(rows, 1):
+        job = {key: (value or '').strip() for key, value in entry.items() if key}
+        empty = [name for name in MANIFEST_COLUMNS if not job[name]]
+        if empty:
+            # An empty path would resolve to the manifest's own directory
+            raise ValueError(f"Manifest row {row}: empty {', '.join(empty)}")
+        for name in MANIFEST_COLUMNS:
+            job[name] = str(base / job[name])
+        job['row'] = row
+        jobs.append(job)
+    return jobs
+
+
+def _init_batch_converter(schema: str, cache_size: int, use_numpy: bool, backend: str,
+                          file_date: date = None, deterministic: bool = False,
+                          result_cache: str = None):
+    """Process pool initializer: one converter per process, reused for every workshop"""
+    global _batch_converter
+    converter = CompleteDBFConverter(cache_size=cache_size, use_numpy=use_numpy,
+                                     schema=schema, backend=backend, file_date=file_date)
+    _batch_converter = (converter, deterministic and file_date is None,
+                        ResultCache(result_cache) if result_cache else None)
+
+
+def convert_workshop(job: dict) -> dict:
+    """
+    Convert one workshop with the converter of this process
+
+    The converter's output is written to convert.log in the workshop's
+    output directory instead of the console.
+
+    Returns:
+        Summary row (see SUMMARY_COLUMNS); failures are reported, not raised
+    """
+    converter, period_dates, result_cache = _batch_converter
+    result = dict.fromkeys(SUMMARY_COLUMNS, '')
+    result.update(row=job['row'], output_dir=job['output_dir'], status='error', cached=False)
+    start = time.perf_counter()
+    log = io.StringIO()
+
+    try:
+        output_dir = Path(job['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        with redirect_stdout(log):
+            header_data = converter.read_csv(job['header_csv'])[0]  # First row only
+
+            workshop_id = job.get('workshop_id') or header_data.get('DSK_ID', '').zfill(10)
+            year = int(job.get('year') or header_data.get('DSK_YY', '0'))
+            month = int(job.get('month') or header_data.get('DSK_MM', '0'))
+            list_no = job.get('list_no') or header_data.get('DSK_LISTNO', '').zfill(11)
+            result.update(workshop_id=workshop_id, year=year, month=month)
+            if period_dates:
+                converter.file_date = converter.period_date(year, month)
+
+            if result_cache is not None:
+                key = converter.result_key([job['header_csv'], job['workers_csv']],
+                                           workshop_id, year, month, list_no)
+                result['cached'] = result_cache.get(key, output_dir, OUTPUT_FILES)
+
+            if result['cached']:
+                print(f"♻️  Input unchanged: DBF files copied from result cache {key}")
+                with open(output_dir / 'dskwor00.dbf', 'rb') as f:
+                    f.seek(4)
+                    result['workers'] = struct.unpack('<I', f.read(4))[0]
+            else:
+                workers_data = converter.read_csv(job['workers_csv'])
+                result['workers'] = len(workers_data)
+
+                converter.create_header_file(str(output_dir / 'dskkar00.dbf'),
+                                             header_data, workers_data, year, month)
+                converter.create_workers_file(str(output_dir / 'dskwor00.dbf'),
+                                              workers_data, workshop_id, year, month, list_no)
+                result['bad_cells'] = sum(len(rows) for rows in converter.bad_cells.values())
+
+                if result_cache is not None:
+                    result_cache.put(key, output_dir, OUTPUT_FILES)
+
+        result['status'] = 'ok'
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        if Path(job['output_dir']).is_dir():
+            (Path(job['output_dir']) / 'convert.log').write_text(log.getvalue(), encoding='utf-8')
+
+    return result
+
+
+def run_batch(jobs: List[dict], processes: int = 1, schema: str = DEFAULT_SCHEMA,
+              cache_size: int = 8192, use_numpy: bool = None,
+              backend: str = 'file', file_date: date = None,
+              deterministic: bool = False, result_cache: str = None) -> List[dict]:
+    """
+    Convert every workshop job
+
+    Args:
+        jobs: Jobs from read_manifest()
+        processes: Pool processes (1 converts in this process)
+        schema, cache_size, use_numpy, backend, file_date: CompleteDBFConverter options
+        deterministic: Stamp each workshop's period date (when file_date is not given)
+        result_cache: ResultCache directory for skipping unchanged workshops
+
+    Returns:
+        Summary rows in manifest order
+    """
+    options = (schema, cache_size, use_numpy, backend, file_date, deterministic, result_cache)
+
+    if processes <= 1 or len(jobs) <= 1:
+        _init_batch_converter(*options)
+        return [convert_workshop(job) for job in jobs]
+
+    # Largest workers files first, so a big workshop does not start last
+    def input_size(job: dict) -> int:
+        try:
+            return os.path.getsize(job['workers_csv'])
+        except OSError:
+            return 0
+
+    ordered = sorted(jobs, key=input_size, reverse=True)
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_batch_converter,
+                             initargs=options) as pool:
+        results = {result['row']: result for result in pool.map(convert_workshop, ordered)}
+    return [results[job['row']] for job in jobs]
+
+
+def write_summary(summary_file: str, results: List[dict]):
+    """Write the per-workshop summary CSV"""
+    with open(summary_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert many workshops listed in a manifest CSV to DBF pairs'
+    )
+    parser.add_argument('manifest', help='Manifest CSV (header_csv, workers_csv, output_dir, ...)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                       help='Workshops converted in parallel (default: CPU count)')
+    parser.add_argument('--summary', default='batch_summary.csv',
+                       help='Per-workshop result CSV (default: batch_summary.csv)')
+    parser.add_argument('--cache-size', type=int, default=8192,
+                       help='Persian encoding cache size per process (0 disables caching)')
+    parser.add_argument('--no-numpy', action='store_true',
+                       help='Write records field by field even if NumPy is installed')
+    parser.add_argument('--backend', choices=CompleteDBFConverter.BACKENDS, default='file',
+                       help="Workers file writer: buffered 'file' or preallocated 'mmap'")
+    parser.add_argument('--file-date', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                       help='Date stamped in the DBF headers (default: today)')
+    parser.add_argument('--deterministic', action='store_true',
+                       help="Stamp the first day of each workshop's period instead of today")
+    parser.add_argument('--result-cache', metavar='DIR',
+                       help='Copy the DBF pair of an earlier run for workshops whose '
+                            'input did not change (use with --deterministic)')
+    parser.add_argument('--schema', choices=list(SCHEMAS), default=DEFAULT_SCHEMA,
+                       help=f'SSO format version (default: {DEFAULT_SCHEMA})')
+
+    args = parser.parse_args()
+
+    jobs = read_manifest(args.manifest)
+    print(f"📂 {len(jobs)} workshops in {args.manifest} ({args.jobs} processes)")
+
+    start = time.perf_counter()
+    results = run_batch(jobs, processes=args.jobs, schema=args.schema,
+                        cache_size=args.cache_size,
+                        use_numpy=False if args.no_numpy else None,
+                        backend=args.backend, file_date=args.file_date,
+                        deterministic=args.deterministic, result_cache=args.result_cache)
+    elapsed = time.perf_counter() - start
+
+    write_summary(args.summary, results)
+
+    failed = [result for result in results if result['status'] != 'ok']
+    cached = sum(1 for result in results if result['cached'])
+    for result in failed:
+        print(f"❌ Row {result['row']} ({result['output_dir']}): {result['error']}")
+
+    print()
+    print("=" * 80)
+    print(f"✅ {len(results) - len(failed)} of {len(results)} workshops converted "
+          f"in {elapsed:.1f}s ({sum(r['workers'] or 0 for r in results)} workers, "
+          f"{cached} from result cache)")
+    print("=" * 80)
+    print(f"📄 Summary: {args.summary}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
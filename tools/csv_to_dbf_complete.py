@@ -8,25 +8,114 @@ Usage:
     python csv_to_dbf_complete.py header.csv workers.csv \
         --workshop-id "1234567890" --year 3 --month 9 \
         --output-dir output
+
+    # Constant memory for very large workers files
+    python csv_to_dbf_complete.py header.csv workers.csv \
+        --workshop-id "1234567890" --year 3 --month 9 \
+        --output-dir output --stream
+
+    # Files in the structure before 1403
+    python csv_to_dbf_complete.py header.csv workers.csv \
+        --workshop-id "1234567890" --year 2 --month 9 \
+        --output-dir output --schema pre-2024
 """
 
+import io
 import csv
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+from datetime import date, timedelta
+from itertools import chain, islice
 from pathlib import Path
+from typing import Iterable, Iterator
 import struct
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from utils.iran_system_encoding import IranSystemEncoder
+from utils.dbf_layout import (RecordLayout, PERSIAN, NUMERIC, format_numeric_column,
+                              format_numeric_column_array)
+from utils.block_writer import BlockWriter
+from utils.dbf_mmap import MappedDBF
+from utils.record_cache import RecordCache, layout_fingerprint
+from utils.result_cache import ResultCache
+from utils.sso_schema import DEFAULT_SCHEMA, SCHEMAS, compile_schema, get_schema
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: without NumPy records are written field by field
 
 
 class CompleteDBFConverter:
     """Convert CSV files to complete DBF set (header + workers)"""
 
-    def __init__(self):
-        self.encoder = IranSystemEncoder()
+    # Field layouts of the default schema (see utils/sso_schema.py)
+    HEADER_FIELDS = get_schema(DEFAULT_SCHEMA).header_fields
+    WORKER_FIELDS = get_schema(DEFAULT_SCHEMA).worker_fields
+    HEADER_PERSIAN_FIELDS = get_schema(DEFAULT_SCHEMA).header_persian_fields
+    WORKER_PERSIAN_FIELDS = get_schema(DEFAULT_SCHEMA).worker_persian_fields
+
+    # Worker fields with the same value for every record (from arguments)
+    WORKSHOP_FIELDS = ('DSW_ID', 'DSW_YY', 'DSW_MM', 'DSW_LISTNO')
+
+    # Parallel encoding (jobs > 1): smaller lists are encoded in-process,
+    # larger ones in blocks of PARALLEL_CHUNK_SIZE workers per task
+    PARALLEL_MIN_WORKERS = 20000
+    PARALLEL_CHUNK_SIZE = 4096
+
+    # Writer backends of create_workers_file()
+    BACKENDS = ('file', 'mmap')
+
+    def __init__(self, cache_size: int = 8192, use_numpy: bool = None, jobs: int = 1,
+                 schema: str = DEFAULT_SCHEMA, backend: str = 'file',
+                 record_cache: RecordCache = None, write_queue: int = 0,
+                 file_date: date = None):
+        """
+        Initialize converter
+
+        Args:
+            cache_size: Size of the Persian field encoding cache (0 disables it)
+            use_numpy: Assemble worker records as a NumPy record array
+                       (default: only when NumPy is installed)
+            jobs: Worker processes for encoding large workers files (1 = in-process)
+            schema: SSO format version (see utils/sso_schema.py)
+            backend: How create_workers_file() writes: 'file' (buffered writes)
+                     or 'mmap' (file preallocated and filled in place)
+            record_cache: Open RecordCache; create_workers_file() then reuses
+                          the encoded records of unchanged worker rows
+                          (the caller closes it)
+            write_queue: Encode workers in blocks and write them on a background
+                         thread through a queue of this many blocks (0 writes
+                         from the encoding thread; 'file' backend and streaming)
+            file_date: Date stamped in the DBF headers (bytes 1-3); None uses
+                       today, a fixed date (e.g. period_date()) makes the output
+                       depend on the input only
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, not {backend!r}")
+        self.backend = backend
+        self.record_cache = record_cache
+        self.write_queue = write_queue
+        self.file_date = file_date
+        # Field name -> rows (0-based) of numeric cells written as blanks
+        # in the last workers file
+        self.bad_cells = {}
+        self.cache_size = cache_size
+        self.jobs = max(1, jobs)
+        # Layouts and the encoding cache are compiled once per schema and
+        # shared by the converters of a process (the cache stays warm);
+        # cache_stats() reports the lookups of this converter's last file
+        self.schema = compile_schema(schema, cache_size)
+        self.encoder = self.schema.encoder
+        self._cache_start = self.encoder.cache_stats()
+        self._cache_end = None
+        self._pool_cache = dict.fromkeys(CACHE_COUNTS, 0)
+        self.use_numpy = (np is not None) if use_numpy is None else use_numpy
+        if self.use_numpy and np is None:
+            raise ImportError("numpy is required for use_numpy=True")
 
     def read_csv(self, csv_file: str) -> list:
         """Read CSV file and return list of dictionaries"""
@@ -34,8 +123,40 @@ class CompleteDBFConverter:
             reader = csv.DictReader(f)
             return list(reader)
 
+    def iter_csv(self, csv_file: str) -> Iterator[dict]:
+        """Read CSV file one row at a time (dictionaries)"""
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+    def validate_header(self, header_data: dict) -> int:
+        """Print header values that do not fit the schema; return the number of problems"""
+        problems = self.schema.validate_header(header_data)
+        for problem in problems:
+            print(f"⚠️  Header: {problem}")
+        return len(problems)
+
+    def iter_validated(self, workers: Iterable[dict], max_reports: int = 20) -> Iterator[dict]:
+        """
+        Yield worker records unchanged, printing values that do not fit the schema
+
+        Args:
+            workers: Iterable of worker records (list or iter_csv())
+            max_reports: Problems printed before the rest are only counted
+        """
+        reported = 0
+        for row, worker in enumerate(workers, 1):
+            for problem in self.schema.validate_worker(worker):
+                reported += 1
+                if reported <= max_reports:
+                    print(f"⚠️  Worker {row}: {problem}")
+            yield worker
+
+        if reported > max_reports:
+            print(f"⚠️  ... and {reported - max_reports} more problems")
+
     def create_header_file(self, output_file: str, header_data: dict,
-                          workers_data: list, year: int, month: int):
+                          workers_data: list, year: int, month: int,
+                          totals: dict = None):
         """
         Create dskkar00.dbf (header file with summary data)
 
@@ -45,49 +166,20 @@ class CompleteDBFConverter:
             workers_data: List of worker records (for calculating totals)
             year: Year (2 digits)
             month: Month (1-12)
+            totals: Precomputed totals (e.g. from create_workers_file_streaming());
+                    workers_data is ignored when given
         """
         print("=" * 80)
         print("🔨 Creating Header File (dskkar00.dbf)")
         print("=" * 80)
 
-        # Header file structure - NEW SSO 2024 FORMAT (25 fields)
-        # ⚠️  DSK_TBIM20 REMOVED in new structure!
-        fields = [
-            ('DSK_ID', 'C', 10, 0),       # Workshop ID
-            ('DSK_NAME', 'C', 30, 0),     # Workshop name (Persian) - Changed: 100→30
-            ('DSK_FARM', 'C', 30, 0),     # Employer name (Persian) - Changed: 100→30
-            ('DSK_ADRS', 'C', 40, 0),     # Address (Persian) - Changed: 100→40
-            ('DSK_KIND', 'N', 1, 0),      # Kind
-            ('DSK_YY', 'N', 2, 0),        # Year
-            ('DSK_MM', 'N', 2, 0),        # Month
-            ('DSK_LISTNO', 'C', 12, 0),   # List number
-            ('DSK_DISC', 'C', 30, 0),     # Description (Persian) - Changed: 100→30
-            ('DSK_NUM', 'N', 5, 0),       # Number of workers
-            ('DSK_TDD', 'N', 6, 0),       # Total days
-            ('DSK_TROOZ', 'N', 12, 0),    # Total daily wage
-            ('DSK_TMAH', 'N', 12, 0),     # Total monthly wage - Changed: 13→12
-            ('DSK_TMAZ', 'N', 12, 0),     # Total benefits
-            ('DSK_TMASH', 'N', 12, 0),    # Total insurable
-            ('DSK_TTOTL', 'N', 12, 0),    # Total amount - Changed: 13→12
-            ('DSK_TBIME', 'N', 12, 0),    # Total insurance
-            ('DSK_TKOSO', 'N', 12, 0),    # Total deductions
-            ('DSK_BIC', 'N', 12, 0),      # Unknown
-            ('DSK_RATE', 'N', 5, 0),      # Rate
-            ('DSK_PRATE', 'N', 2, 0),     # Rate percentage
-            # DSK_TBIM20 DELETED in new structure!
-            ('DSK_BIMH', 'N', 12, 0),     # Insurance premium
-            ('MON_PYM', 'C', 3, 0),       # Payment month
-            ('DSK_INC', 'N', 12, 0),      # Total INC (جمع پایه سنواتی) - Excel: DSK_TINC
-            ('DSK_SPOUSE', 'N', 12, 0),   # Total SPOUS (جمع حق تاهل) - Excel: DSK_TSPOUS
-        ]
-
         # Calculate totals from workers data
-        totals = self._calculate_totals(workers_data)
+        if totals is None:
+            totals = self._calculate_totals(workers_data)
 
-        # Calculate record length
-        record_length = 1  # Deletion flag
-        for field in fields:
-            record_length += field[2]
+        layout = self.schema.header_layout
+        fields = layout.fields
+        record_length = layout.record_length
 
         print(f"Record length: {record_length} bytes")
         print(f"Number of workers: {totals['num_workers']}")
@@ -98,7 +190,7 @@ class CompleteDBFConverter:
             self._write_dbf_header(f, 1, record_length, fields)  # Only 1 record in header file
 
             # Write single record
-            self._write_header_record(f, header_data, totals, fields, year, month)
+            self._write_header_record(f, header_data, totals, layout, year, month)
 
             # End of file marker
             f.write(b'\x1A')
@@ -124,73 +216,436 @@ class CompleteDBFConverter:
         print("🔨 Creating Workers File (dskwor00.dbf)")
         print("=" * 80)
 
-        # Workers file structure - NEW SSO 2024 FORMAT (29 fields)
-        # ⚠️  DSW_KOSO and DSW_BIME20 REMOVED in new structure!
-        # ⚠️  Field order changed: DSW_JOB and PER_NATCOD positions swapped
-        # ⚠️  DSW_SPOUSE type changed: N→C (Number to Character!)
-        fields = [
-            ('DSW_ID', 'C', 10, 0),
-            ('DSW_YY', 'N', 2, 0),
-            ('DSW_MM', 'N', 2, 0),
-            ('DSW_LISTNO', 'C', 12, 0),
-            ('DSW_ID1', 'C', 8, 0),
-            ('DSW_FNAME', 'C', 60, 0),    # Changed: 20→60 (3x larger!)
-            ('DSW_LNAME', 'C', 60, 0),    # Changed: 25→60
-            ('DSW_DNAME', 'C', 60, 0),    # Changed: 20→60
-            ('DSW_IDNO', 'C', 15, 0),
-            ('DSW_IDPLC', 'C', 30, 0),
-            ('DSW_IDATE', 'C', 8, 0),
-            ('DSW_BDATE', 'C', 8, 0),
-            ('DSW_SEX', 'C', 3, 0),
-            ('DSW_NAT', 'C', 10, 0),
-            ('DSW_OCP', 'C', 50, 0),
-            ('DSW_SDATE', 'C', 8, 0),
-            ('DSW_EDATE', 'C', 8, 0),
-            ('DSW_DD', 'N', 2, 0),
-            ('DSW_ROOZ', 'N', 12, 0),
-            ('DSW_MAH', 'N', 12, 0),
-            ('DSW_MAZ', 'N', 12, 0),
-            ('DSW_MASH', 'N', 12, 0),
-            ('DSW_TOTL', 'N', 12, 0),
-            ('DSW_BIME', 'N', 12, 0),
-            ('DSW_PRATE', 'N', 2, 0),
-            # DSW_KOSO DELETED in new structure!
-            # DSW_BIME20 DELETED in new structure!
-            ('DSW_JOB', 'C', 6, 0),       # Changed: position 29→26, length 10→6
-            ('PER_NATCOD', 'C', 10, 0),   # Changed: position 28→27
-            ('DSW_INC', 'N', 12, 0),      # Changed: 19→12
-            ('DSW_SPOUSE', 'C', 10, 0),   # Changed: N19→C10 (type and length!)
-        ]
-
-        # Calculate record length
-        record_length = 1
-        for field in fields:
-            record_length += field[2]
+        layout = self.schema.worker_layout
+        fields = layout.fields
+        record_length = layout.record_length
+        self.bad_cells = {}
+        self._cache_start = self.encoder.cache_stats()
+        self._cache_end = None
+        self._pool_cache = dict.fromkeys(CACHE_COUNTS, 0)
 
         print(f"Record length: {record_length} bytes")
         print(f"Number of records: {len(workers_data)}")
         print()
 
-        with open(output_file, 'wb') as f:
-            # Write header
-            self._write_dbf_header(f, len(workers_data), record_length, fields)
+        workshop_values = dict(zip(self.WORKSHOP_FIELDS,
+                                   (workshop_id, year, month, list_no)))
 
-            # Write records
-            for i, record in enumerate(workers_data, 1):
-                print(f"Writing worker {i}/{len(workers_data)}: {record.get('DSW_FNAME', '')} {record.get('DSW_LNAME', '')}")
-                self._write_worker_record(f, record, fields, workshop_id, year, month, list_no)
+        # Unchanged rows come from the record cache, the rest are encoded
+        block = None
+        if self.record_cache is not None:
+            block = self._encode_workers_cached(layout, workers_data, workshop_values)
 
-            # End of file marker
-            f.write(b'\x1A')
+        if self.backend == 'mmap':
+            # File preallocated to its exact size; records are filled in place
+            with MappedDBF(output_file, layout, len(workers_data)) as mapped:
+                self._write_dbf_header(mapped.map, len(workers_data), record_length, fields)
+                if block is not None:
+                    mapped.write_records(0, block)
+                else:
+                    self._write_worker_records(mapped.map, workers_data, layout,
+                                               workshop_values, mapped)
+                # End of file marker is written by MappedDBF
+        else:
+            with open(output_file, 'wb') as f:
+                # Write header
+                self._write_dbf_header(f, len(workers_data), record_length, fields)
+
+                # Write records
+                if block is not None:
+                    f.write(block)
+                elif self.write_queue:
+                    with BlockWriter(f, self.write_queue) as writer:
+                        self._write_worker_blocks(writer, workers_data, layout,
+                                                  workshop_values)
+                    self.print_writer_stats(writer)
+                else:
+                    self._write_worker_records(f, workers_data, layout, workshop_values)
+
+                # End of file marker
+                f.write(b'\x1A')
 
         print()
         print(f"✅ Workers file created: {output_file}")
+        self.print_bad_cells()
+        self._cache_end = self.encoder.cache_stats()
+        self.print_cache_stats()
+        if self.record_cache is not None:
+            self.print_record_cache_stats()
+        print("=" * 80)
+
+    def _encode_workers_cached(self, layout: RecordLayout, workers_data: list,
+                               workshop_values: dict) -> bytearray:
+        """
+        Encode worker records through the record cache
+
+        Each row is keyed by a hash of its values (workshop fields excluded).
+        Cached records get this run's workshop fields patched in and report
+        their stored bad cells; the other rows are encoded as usual and
+        stored in the cache.
+
+        Returns:
+            All records, in order, as one block
+        """
+        cache = self.record_cache
+        record_length = layout.record_length
+        constants = layout.constant_blocks(workshop_values)
+        key_names = [name for index, name in enumerate(layout.names) if index not in constants]
+
+        fingerprint = layout_fingerprint(layout)
+        keys = [cache.key(fingerprint, [record.get(name, '') for name in key_names])
+                for record in workers_data]
+        found = cache.get_many(keys)
+
+        miss_rows = [row for row, key in enumerate(keys) if key not in found]
+        print(f"Record cache: {len(workers_data) - len(miss_rows)} cached, "
+              f"{len(miss_rows)} to encode")
+
+        encoded = b''
+        if miss_rows:
+            encoded = self._encode_worker_records(
+                layout, [workers_data[row] for row in miss_rows], workshop_values)
+            # Bad cells were counted among the encoded rows
+            self.bad_cells = {name: [miss_rows[row] for row in rows]
+                              for name, rows in self.bad_cells.items()}
+
+        block = bytearray(len(workers_data) * record_length)
+        bad_fields = {}
+        for name, rows in self.bad_cells.items():
+            for row in rows:
+                bad_fields.setdefault(row, []).append(name)
+        new_records = {}
+
+        for i, row in enumerate(miss_rows):
+            record = encoded[i * record_length:(i + 1) * record_length]
+            block[row * record_length:(row + 1) * record_length] = record
+            new_records[keys[row]] = (record, bad_fields.get(row, ()))
+
+        # Cached records with this run's workshop fields
+        patches = [(layout.slices[index], value) for index, value in constants.items()]
+        for row, key in enumerate(keys):
+            if key not in found:
+                continue
+            record, names = found[key]
+            start = row * record_length
+            block[start:start + record_length] = record
+            for field_slice, value in patches:
+                block[start + field_slice.start:start + field_slice.stop] = value
+            for name in names:
+                self._add_bad_cells(name, [row])
+
+        # Fields and rows in file order, as an uncached run reports them
+        self.bad_cells = {name: sorted(self.bad_cells[name])
+                          for name in layout.names if name in self.bad_cells}
+
+        cache.put_many((key, record, names) for key, (record, names) in new_records.items())
+        cache.commit()
+        return block
+
+    def _encode_worker_records(self, layout: RecordLayout, workers_data: list,
+                               workshop_values: dict) -> bytes:
+        """Encode workers into one block, in the process pool when it is large enough"""
+        if self.jobs > 1 and len(workers_data) >= self.PARALLEL_MIN_WORKERS:
+            buffer = io.BytesIO()
+            size = self.PARALLEL_CHUNK_SIZE
+            chunks = (workers_data[i:i + size] for i in range(0, len(workers_data), size))
+            self._write_worker_blocks_parallel(buffer, chunks, layout, workshop_values)
+            return buffer.getvalue()
+        return self._encode_worker_block(layout, workers_data, workshop_values)
+
+    def _write_worker_blocks(self, writer: BlockWriter, workers_data: list,
+                             layout: RecordLayout, workshop_values: dict):
+        """
+        Write all worker records as blocks through a background writer
+
+        Each block is queued as soon as it is encoded, so the next one is
+        encoded while the previous one is written.
+        """
+        size = self.PARALLEL_CHUNK_SIZE
+        chunks = (workers_data[i:i + size] for i in range(0, len(workers_data), size))
+
+        if self.jobs > 1 and len(workers_data) >= self.PARALLEL_MIN_WORKERS:
+            print(f"Writing {len(workers_data)} workers with {self.jobs} processes")
+            self._write_worker_blocks_parallel(writer, chunks, layout, workshop_values)
+            return
+
+        print(f"Writing {len(workers_data)} workers in blocks of {size} "
+              f"(writer queue: {writer.depth} blocks)")
+        for first_row, chunk in zip(range(0, len(workers_data), size), chunks):
+            writer.write(self._encode_worker_block(layout, chunk, workshop_values, first_row))
+
+    def _write_worker_records(self, f, workers_data: list, layout: RecordLayout,
+                              workshop_values: dict, mapped: MappedDBF = None):
+        """
+        Write all worker records after the DBF header
+
+        Args:
+            f: Open output file, or the map of a MappedDBF (file-like)
+            mapped: The MappedDBF when writing through mmap; records are then
+                    assembled directly in the mapped file
+        """
+        record_length = layout.record_length
+
+        if self.jobs > 1 and len(workers_data) >= self.PARALLEL_MIN_WORKERS:
+            print(f"Writing {len(workers_data)} workers with {self.jobs} processes")
+            size = self.PARALLEL_CHUNK_SIZE
+            chunks = (workers_data[i:i + size] for i in range(0, len(workers_data), size))
+            self._write_worker_blocks_parallel(f, chunks, layout, workshop_values)
+        elif self.use_numpy:
+            print(f"Writing {len(workers_data)} workers as a NumPy record array")
+            if mapped is not None:
+                # Record array backed by the mapped file itself; the map
+                # cannot be closed while the view or the array uses it
+                view = mapped.records(0, len(workers_data))
+                records = np.frombuffer(view, dtype=self._worker_dtype(layout))
+                try:
+                    self._worker_records_array(layout, workers_data, workshop_values,
+                                               out=records)
+                finally:
+                    del records
+                    try:
+                        view.release()
+                    except BufferError:
+                        pass  # Held by the traceback of an error: released with it
+            else:
+                self._write_worker_records_numpy(f, workers_data, layout, workshop_values)
+        else:
+            plan = self._worker_record_plan(layout, workers_data, workshop_values)
+
+            # One record buffer reused for the whole file
+            record_buffer = bytearray(record_length)
+
+            for i, record in enumerate(workers_data):
+                print(f"Writing worker {i + 1}/{len(workers_data)}: {record.get('DSW_FNAME', '')} {record.get('DSW_LNAME', '')}")
+                if mapped is not None:
+                    layout.pack_into(mapped.map, [step(record, i) for step in plan],
+                                     offset=mapped.record_offset(i))
+                else:
+                    self._write_worker_record(f, record, i, layout, plan, record_buffer)
+
+    def create_workers_file_streaming(self, output_file: str, workers: Iterable[dict],
+                                      workshop_id: str, year: int, month: int,
+                                      list_no: str = "", chunk_size: int = 4096) -> dict:
+        """
+        Create dskwor00.dbf from an iterable of worker records in constant memory
+
+        Records are written chunk by chunk while the header totals are
+        accumulated; the record count in the DBF header (bytes 4-7) is
+        patched at the end. The output is identical to create_workers_file().
+        The record count is not known up front, so this always writes through
+        a buffered file (the 'mmap' backend needs the final size).
+
+        Args:
+            output_file: Output DBF filename
+            workers: Iterable of worker records (e.g. iter_csv())
+            workshop_id: Workshop ID
+            year: Year (2 digits)
+            month: Month (1-12)
+            list_no: List number (optional)
+            chunk_size: Workers encoded and written per chunk (the unit of
+                        work for the process pool when jobs > 1 and the
+                        stream has at least PARALLEL_MIN_WORKERS workers)
+
+        Returns:
+            Totals for the header file (same as _calculate_totals())
+        """
+        print("=" * 80)
+        print("🔨 Creating Workers File (dskwor00.dbf) - streaming")
         print("=" * 80)
 
+        layout = self.schema.worker_layout
+        fields = layout.fields
+        record_length = layout.record_length
+        self.bad_cells = {}
+        self._cache_start = self.encoder.cache_stats()
+        self._cache_end = None
+        self._pool_cache = dict.fromkeys(CACHE_COUNTS, 0)
+
+        print(f"Record length: {record_length} bytes")
+        print(f"Chunk size: {chunk_size} workers")
+        print()
+
+        totals = self._new_totals()
+        workshop_values = dict(zip(self.WORKSHOP_FIELDS,
+                                   (workshop_id, year, month, list_no)))
+        workers = iter(workers)
+
+        with open(output_file, 'wb') as out:
+            # Record count is not known yet - patched below
+            self._write_dbf_header(out, 0, record_length, fields)
+
+            # Blocks go through the background writer when write_queue is set
+            writer = BlockWriter(out, self.write_queue) if self.write_queue else None
+            with writer or nullcontext(out) as f:
+                chunks = self._iter_chunks(workers, chunk_size, totals)
+                written = 0
+
+                if self.jobs > 1:
+                    # As in create_workers_file(), only PARALLEL_MIN_WORKERS
+                    # workers or more are worth the process pool: read ahead
+                    # up to that many to find out
+                    ahead = []
+                    while totals['num_workers'] < self.PARALLEL_MIN_WORKERS:
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            break
+                        ahead.append(chunk)
+                    chunks = chain(ahead, chunks)
+                    if totals['num_workers'] >= self.PARALLEL_MIN_WORKERS:
+                        written = self._write_worker_blocks_parallel(f, chunks, layout,
+                                                                     workshop_values)
+
+                for chunk in chunks:
+                    f.write(self._encode_worker_block(layout, chunk, workshop_values, written))
+                    written += len(chunk)
+                    print(f"Written {written} workers")
+
+                # End of file marker
+                f.write(b'\x1A')
+
+            if writer is not None:
+                self.print_writer_stats(writer)
+
+            # Back-patch the record count (header bytes 4-7)
+            out.seek(4)
+            out.write(struct.pack('<I', totals['num_workers']))
+
+        print()
+        print(f"✅ Workers file created: {output_file} ({totals['num_workers']} records)")
+        self.print_bad_cells()
+        self._cache_end = self.encoder.cache_stats()
+        self.print_cache_stats()
+        print("=" * 80)
+
+        return totals
+
+    def _iter_chunks(self, workers: Iterator[dict], chunk_size: int,
+                     totals: dict) -> Iterator[list]:
+        """Yield lists of up to chunk_size workers, adding each to totals"""
+        while True:
+            chunk = list(islice(workers, chunk_size))
+            if not chunk:
+                return
+            for worker in chunk:
+                self._add_to_totals(totals, worker)
+            yield chunk
+
+    def _write_worker_blocks_parallel(self, f, chunks: Iterable[list],
+                                      layout: RecordLayout, workshop_values: dict) -> int:
+        """
+        Encode chunks of workers in a process pool and write the blocks
+
+        Records have a fixed length, so the file position of every block is
+        known when its chunk is submitted; blocks are written there as soon
+        as they are ready. At most 2 * jobs chunks are in flight, so memory
+        stays bounded for streamed input. The file is left positioned after
+        the last record.
+
+        Returns:
+            Number of records written
+        """
+        data_start = f.tell()
+        record_length = layout.record_length
+        rows = 0
+        pending = {}
+
+        def write_done(futures):
+            for future in futures:
+                first_row = pending.pop(future)
+                block, bad_cells, cache_counts = future.result()
+                f.seek(data_start + first_row * record_length)
+                f.write(block)
+                for field_name, bad_rows in bad_cells.items():
+                    self._add_bad_cells(field_name, bad_rows, first_row)
+                for key, count in cache_counts.items():
+                    self._pool_cache[key] += count
+
+        with ProcessPoolExecutor(max_workers=self.jobs,
+                                 initializer=_init_block_encoder,
+                                 initargs=(self.schema.version, self.cache_size,
+                                           self.use_numpy)) as executor:
+            for chunk in chunks:
+                if len(pending) >= 2 * self.jobs:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    write_done(done)
+
+                future = executor.submit(_encode_block_in_process, chunk, workshop_values)
+                pending[future] = rows
+                rows += len(chunk)
+
+            write_done(list(pending))
+
+        f.seek(data_start + rows * record_length)
+        print(f"Written {rows} workers (encoded in {self.jobs} processes)")
+        return rows
+
+    def _add_bad_cells(self, field_name: str, rows: list, first_row: int = 0):
+        """Record rows of a numeric column that were written as blanks"""
+        if rows:
+            self.bad_cells.setdefault(field_name, []).extend(first_row + row for row in rows)
+
+    def print_bad_cells(self, max_rows: int = 10):
+        """Print the numeric cells of the last workers file that were not numbers"""
+        for field_name, rows in self.bad_cells.items():
+            shown = ', '.join(str(row + 1) for row in sorted(rows)[:max_rows])
+            more = f" and {len(rows) - max_rows} more" if len(rows) > max_rows else ''
+            print(f"⚠️  {field_name}: {len(rows)} values are not numbers, written as blanks "
+                  f"(workers {shown}{more})")
+
+    @staticmethod
+    def print_writer_stats(writer: BlockWriter):
+        """Print how long encoding waited for the background writer"""
+        print(f"Writer thread: {writer.blocks} blocks, {writer.bytes_written / 1e6:.1f} MB, "
+              f"encoder waited {writer.wait_time:.2f}s for disk")
+
+    def print_record_cache_stats(self):
+        """Print hit/miss statistics of the on-disk record cache"""
+        stats = self.record_cache.cache_stats()
+        print(f"Record cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"(hit rate {stats['hit_rate']:.1%}), {stats['stored']} records stored "
+              f"in {self.record_cache.path}")
+
+    def cache_stats(self) -> dict:
+        """
+        Statistics of the Persian field encoding cache for the last workers file
+
+        The cache is shared by every converter of the process, so hits,
+        misses and evictions are counted over the last create_workers_file()
+        call (from construction until one finishes), including the lookups
+        of the pool processes when jobs > 1; size and maxsize describe this
+        process's shared cache.
+        """
+        stats = dict(self._cache_end or self.encoder.cache_stats())
+        for key in CACHE_COUNTS:
+            stats[key] += self._pool_cache[key] - self._cache_start[key]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def print_cache_stats(self):
+        """Print hit/miss statistics of the Persian field encoding cache"""
+        stats = self.cache_stats()
+        if any(self._pool_cache.values()):
+            # Each pool process had its own cache: only the counts add up
+            entries = f"{self.jobs} processes"
+        else:
+            entries = f"{stats['size']}/{stats['maxsize']} entries"
+        print(f"Encoding cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions "
+              f"(hit rate {stats['hit_rate']:.1%}, {entries})")
+
     def _calculate_totals(self, workers_data: list) -> dict:
         """Calculate totals from workers data"""
-        totals = {
-            'num_workers': len(workers_data),
+        totals = self._new_totals()
+        for worker in workers_data:
+            self._add_to_totals(totals, worker)
+        return totals
+
+    @staticmethod
+    def _new_totals() -> dict:
+        """Return zeroed header totals"""
+        return {
+            'num_workers': 0,
             'total_days': 0,
             'total_rooz': 0,
             'total_mah': 0,
@@ -201,23 +656,55 @@ class CompleteDBFConverter:
             'total_koso': 0,  # Note: DSW_KOSO removed in new structure, but kept for backward compat
         }
 
-        for worker in workers_data:
-            totals['total_days'] += int(worker.get('DSW_DD', 0) or 0)
-            totals['total_rooz'] += int(worker.get('DSW_ROOZ', 0) or 0)
-            totals['total_mah'] += int(worker.get('DSW_MAH', 0) or 0)
-            totals['total_maz'] += int(worker.get('DSW_MAZ', 0) or 0)
-            totals['total_mash'] += int(worker.get('DSW_MASH', 0) or 0)
-            totals['total_totl'] += int(worker.get('DSW_TOTL', 0) or 0)
-            totals['total_bime'] += int(worker.get('DSW_BIME', 0) or 0)
-            # DSW_KOSO removed in new SSO structure, but calculate if present for backward compat
-            totals['total_koso'] += int(worker.get('DSW_KOSO', 0) or 0)
+    @staticmethod
+    def _add_to_totals(totals: dict, worker: dict):
+        """Add one worker record to the header totals"""
+        totals['num_workers'] += 1
+        totals['total_days'] += int(worker.get('DSW_DD', 0) or 0)
+        totals['total_rooz'] += int(worker.get('DSW_ROOZ', 0) or 0)
+        totals['total_mah'] += int(worker.get('DSW_MAH', 0) or 0)
+        totals['total_maz'] += int(worker.get('DSW_MAZ', 0) or 0)
+        totals['total_mash'] += int(worker.get('DSW_MASH', 0) or 0)
+        totals['total_totl'] += int(worker.get('DSW_TOTL', 0) or 0)
+        totals['total_bime'] += int(worker.get('DSW_BIME', 0) or 0)
+        # DSW_KOSO removed in new SSO structure, but calculate if present for backward compat
+        totals['total_koso'] += int(worker.get('DSW_KOSO', 0) or 0)
 
-        return totals
+    def result_key(self, input_files: list, workshop_id: str, year: int, month: int,
+                   list_no: str = "") -> str:
+        """
+        ResultCache key of converting input_files with these arguments
+
+        Covers the schema, the encoder tables and the header date, so a key
+        is only reused for byte-identical output.
+        """
+        return ResultCache.key(input_files, self.schema.version,
+                               layout_fingerprint(self.schema.header_layout),
+                               layout_fingerprint(self.schema.worker_layout),
+                               workshop_id, year, month, list_no,
+                               (self.file_date or date.today()).isoformat())
+
+    @staticmethod
+    def period_date(year: int, month: int) -> date:
+        """
+        Gregorian date of the first day of a Jalali period, for file_date
+
+        Nowruz is taken as 21 March, so the date can be a day off; it only
+        has to be the same for every run of the period.
+
+        Args:
+            year: Jalali year (2 digits: 3 = 1403, 99 = 1399)
+            month: Jalali month (1-12)
+        """
+        if not 1 <= month <= 12:
+            raise ValueError(f"month must be between 1 and 12, not {month}")
+        jalali_year = year if year >= 100 else (1300 if year >= 50 else 1400) + year
+        days = (month - 1) * 31 if month <= 7 else 186 + (month - 7) * 30
+        return date(jalali_year + 621, 3, 21) + timedelta(days=days)
 
     def _write_dbf_header(self, f, num_records: int, record_length: int, fields: list):
         """Write DBF file header"""
-        from datetime import datetime
-        now = datetime.now()
+        now = self.file_date or date.today()
 
         # Header (32 bytes)
         header = struct.pack('<B', 0x03)  # dBase III (byte 0)
@@ -246,13 +733,11 @@ class CompleteDBFConverter:
         f.write(b'\x0D')
 
     def _write_header_record(self, f, header_data: dict, totals: dict,
-                             fields: list, year: int, month: int):
-        """Write header file record"""
-        f.write(b' ')  # Deletion flag
-
-        persian_fields = {'DSK_NAME', 'DSK_FARM', 'DSK_ADRS', 'DSK_DISC'}
+                             layout: RecordLayout, year: int, month: int):
+        """Write header file record (formatted into one buffer, one write)"""
+        values = []
 
-        for field_name, field_type, field_length, field_decimal in fields:
+        for index, field_name in enumerate(layout.names):
             # Get value
             if field_name == 'DSK_YY':
                 value = year
@@ -290,91 +775,174 @@ class CompleteDBFConverter:
             else:
                 value = header_data.get(field_name, '')
 
-            # Write field
-            if field_type == 'C':
-                if field_name in persian_fields and value and str(value).strip():
-                    # Persian field - use Iran System encoding
-                    # Don't strip! Spaces are important for Iran System visual order
-                    text_value = str(value)
-                    encoded = self.encoder.unicode_to_iran_system(text_value)
-                    if len(encoded) > field_length:
-                        encoded = encoded[:field_length]
-                    else:
-                        encoded = encoded + (b' ' * (field_length - len(encoded)))
-                    f.write(encoded)
-                else:
-                    # Regular text
-                    # Special handling for MON_PYM: keep it empty if value is 0 or empty
-                    if field_name == 'MON_PYM' and (not value or value == 0 or str(value).strip() == '0'):
-                        f.write(b' ' * field_length)
-                    else:
-                        text = str(value)[:field_length].ljust(field_length)
-                        f.write(text.encode('ascii', errors='replace'))
-            elif field_type == 'N':
-                try:
-                    if field_decimal > 0:
-                        num_str = f"{float(value):{field_length}.{field_decimal}f}"
-                    else:
-                        num_str = f"{int(float(value) if value else 0):>{field_length}d}"
-                except:
-                    num_str = ' ' * field_length
-                f.write(num_str[:field_length].rjust(field_length).encode('ascii'))
-
-    def _write_worker_record(self, f, record: dict, fields: list,
-                            workshop_id: str, year: int, month: int, list_no: str):
-        """Write worker record"""
-        f.write(b' ')  # Deletion flag
-
-        # Persian fields that use Iran System encoding
-        persian_fields = {
-            'DSW_FNAME',   # First name
-            'DSW_LNAME',   # Last name
-            'DSW_DNAME',   # Father's name
-            'DSW_IDPLC',   # ID issue place
-            'DSW_OCP',     # Occupation
-            'DSW_SEX',     # Sex (مرد/زن)
-            'DSW_NAT',     # Nationality (ایرانی)
-            # Note: DSW_JOB is a numeric job code, not Persian text
-        }
+            # Special handling for MON_PYM: keep it empty if value is 0 or empty
+            if field_name == 'MON_PYM' and (not value or value == 0 or str(value).strip() == '0'):
+                value = ''
 
-        for field_name, field_type, field_length, field_decimal in fields:
-            # Get value
-            if field_name == 'DSW_ID':
-                value = workshop_id
-            elif field_name == 'DSW_YY':
-                value = year
-            elif field_name == 'DSW_MM':
-                value = month
-            elif field_name == 'DSW_LISTNO':
-                value = list_no
+            values.append(value)
+
+        record = bytearray(layout.record_length)
+        layout.format_into(record, values)
+        f.write(record)
+
+    def _worker_record_plan(self, layout: RecordLayout, workers_data: list,
+                            workshop_values: dict, first_row: int = 0) -> list:
+        """
+        Compile how each worker field is produced
+
+        Returns one step per field, called as step(record, row) -> bytes:
+        workshop fields are formatted once, Persian columns are encoded in
+        bulk (identical values are encoded once), numeric columns are
+        formatted in one pass (bad cells are recorded in bad_cells, counted
+        from first_row) and the rest are formatted per record with the
+        field's precompiled formatter.
+        """
+        constants = layout.constant_blocks(workshop_values)
+        plan = []
+
+        for index, field_name in enumerate(layout.names):
+            if index in constants:
+                plan.append(lambda record, row, block=constants[index]: block)
+            elif layout.kinds[index] == PERSIAN:
+                column = self.encoder.encode_column(
+                    [record.get(field_name, '') for record in workers_data],
+                    layout.widths[index]
+                )
+                plan.append(lambda record, row, column=column: column[row])
+            elif layout.kinds[index] == NUMERIC:
+                column, bad_rows = format_numeric_column(
+                    [record.get(field_name, '') for record in workers_data],
+                    layout.widths[index], layout.decimals[index]
+                )
+                self._add_bad_cells(field_name, bad_rows, first_row)
+                plan.append(lambda record, row, column=column: column[row])
             else:
-                value = record.get(field_name, '')
-
-            # Write field
-            if field_type == 'C':
-                if field_name in persian_fields and value and str(value).strip():
-                    # Persian field - use Iran System encoding
-                    # Don't strip! Spaces are important for Iran System visual order
-                    text_value = str(value)
-                    encoded = self.encoder.unicode_to_iran_system(text_value)
-                    if len(encoded) > field_length:
-                        encoded = encoded[:field_length]
-                    else:
-                        encoded = encoded + (b' ' * (field_length - len(encoded)))
-                    f.write(encoded)
-                else:
-                    # Regular text
-                    text = str(value)[:field_length].ljust(field_length)
-                    f.write(text.encode('ascii', errors='replace'))
-            elif field_type == 'N':
-                try:
-                    if field_decimal > 0:
-                        num_str = f"{float(value):{field_length}.{field_decimal}f}"
-                    else:
-                        num_str = f"{int(float(value) if value else 0):>{field_length}d}"
-                except:
-                    num_str = ' ' * field_length
-                f.write(num_str[:field_length].rjust(field_length).encode('ascii'))
+                formatter = layout.formatter(field_name)
+                plan.append(lambda record, row, name=field_name, formatter=formatter:
+                            formatter(record.get(name, '')))
+
+        return plan
+
+    def _write_worker_records_numpy(self, f, workers_data: list, layout: RecordLayout,
+                                    workshop_values: dict):
+        """Write all worker records at once as a NumPy structured array"""
+        records = self._worker_records_array(layout, workers_data, workshop_values)
+
+        # tofile() writes through the OS file descriptor
+        f.flush()
+        records.tofile(f)
+
+    @staticmethod
+    def _worker_dtype(layout: RecordLayout):
+        """NumPy dtype of one record: deletion flag + an 'S<length>' column per field"""
+        return np.dtype([('_DELETED', 'S1')] +
+                        [(name, f'S{width}')
+                         for name, width in zip(layout.names, layout.widths)])
+
+    def _worker_records_array(self, layout: RecordLayout, workers_data: list,
+                              workshop_values: dict, out=None, first_row: int = 0):
+        """
+        Assemble worker records as a NumPy structured array
+
+        Every field becomes an 'S<length>' column of the record array, so the
+        records are assembled column by column; the array's buffer is the
+        records exactly as they appear in the file.
+
+        Args:
+            out: Array of _worker_dtype(layout) to fill (e.g. backed by a
+                 mapped file); a new array is allocated when omitted
+            first_row: Row number of workers_data[0] for bad_cells
+        """
+        records = out
+        if records is None:
+            records = np.empty(len(workers_data), dtype=self._worker_dtype(layout))
+        records['_DELETED'] = b' '  # Deletion flag
+
+        # Same value for every worker - format once and broadcast
+        constants = layout.constant_blocks(workshop_values)
+
+        for index, field_name in enumerate(layout.names):
+            width = layout.widths[index]
+            if index in constants:
+                records[field_name] = constants[index]
+            elif layout.kinds[index] == PERSIAN:
+                records[field_name] = self.encoder.encode_column_array(
+                    [record.get(field_name, '') for record in workers_data],
+                    width
+                )
+            elif layout.kinds[index] == NUMERIC:
+                records[field_name], bad_rows = format_numeric_column_array(
+                    [record.get(field_name, '') for record in workers_data],
+                    width, layout.decimals[index]
+                )
+                self._add_bad_cells(field_name, bad_rows, first_row)
+            else:
+                formatter = layout.formatter(field_name)
+                blocks = [formatter(record.get(field_name, '')) for record in workers_data]
+                records[field_name] = np.frombuffer(b''.join(blocks), dtype=f'S{width}')
+
+        return records
+
+    def _encode_worker_block(self, layout: RecordLayout, workers_data: list,
+                             workshop_values: dict, first_row: int = 0) -> bytes:
+        """Encode workers into one contiguous block of fixed-width records"""
+        if self.use_numpy:
+            return self._worker_records_array(layout, workers_data, workshop_values,
+                                              first_row=first_row).tobytes()
+
+        plan = self._worker_record_plan(layout, workers_data, workshop_values, first_row)
+        record_length = layout.record_length
+        block = bytearray(len(workers_data) * record_length)
+
+        for row, record in enumerate(workers_data):
+            layout.pack_into(block, [step(record, row) for step in plan],
+                             offset=row * record_length)
+
+        return bytes(block)
+
+    @staticmethod
+    def _write_worker_record(f, record: dict, row: int, layout: RecordLayout,
+                             plan: list, buffer: bytearray):
+        """
+        Write worker record
+
+        The fields are produced by plan (see _worker_record_plan), packed into
+        buffer (a reusable bytearray of the record length) with the layout's
+        struct and written with a single write.
+        """
+        layout.pack_into(buffer, [step(record, row) for step in plan])
+        f.write(buffer)
+
+
+# Per-process state of the parallel block encoder
+_block_encoder = None
+
+# Encoding cache counters summed over the pool processes
+CACHE_COUNTS = ('hits', 'misses', 'evictions')
+
+
+def _init_block_encoder(schema: str, cache_size: int, use_numpy: bool):
+    """Process pool initializer: one converter and compiled schema per process"""
+    global _block_encoder
+    converter = CompleteDBFConverter(cache_size=cache_size, use_numpy=use_numpy,
+                                     schema=schema)
+    _block_encoder = (converter, converter.schema.worker_layout)
+
+
+def _encode_block_in_process(workers_data: list, workshop_values: dict) -> tuple:
+    """
+    Process pool task: encode one chunk of workers into a block of records
+
+    Returns:
+        (block, bad_cells, cache_counts) - bad cell rows are counted from the
+        chunk start; cache_counts are this task's encoding cache lookups
+    """
+    converter, layout = _block_encoder
+    converter.bad_cells = {}
+    before = converter.encoder.cache_stats()
+    block = converter._encode_worker_block(layout, workers_data, workshop_values)
+    after = converter.encoder.cache_stats()
+    return block, converter.bad_cells, {key: after[key] - before[key] for key in CACHE_COUNTS}
 
 
 def main():
@@ -388,40 +956,146 @@ def main():
     parser.add_argument('--month', type=int, required=True, help='Month (1-12)')
     parser.add_argument('--list-no', default='', help='List number')
     parser.add_argument('--output-dir', default='.', help='Output directory')
+    parser.add_argument('--cache-size', type=int, default=8192,
+                       help='Persian encoding cache size (0 disables caching)')
+    parser.add_argument('--no-numpy', action='store_true',
+                       help='Write records field by field even if NumPy is installed')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream the workers CSV in constant memory (header file is written last)')
+    parser.add_argument('--chunk-size', type=int, default=4096,
+                       help='Workers per chunk in --stream mode')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Processes for encoding large workers files (default: 1)')
+    parser.add_argument('--backend', choices=CompleteDBFConverter.BACKENDS, default='file',
+                       help="Workers file writer: buffered 'file' or preallocated 'mmap' "
+                            "(ignored with --stream)")
+    parser.add_argument('--write-queue', type=int, default=0, metavar='N',
+                       help='Write worker blocks on a background thread with up to N '
+                            'blocks queued (e.g. 2 on slow/NFS storage; default: off)')
+    parser.add_argument('--record-cache', metavar='FILE',
+                       help='SQLite cache of encoded worker records reused by the next '
+                            'run (not used with --stream)')
+    parser.add_argument('--file-date', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                       help='Date stamped in the DBF headers (default: today)')
+    parser.add_argument('--deterministic', action='store_true',
+                       help='Stamp the first day of the --year/--month period instead of '
+                            'today, so the same input always gives the same files')
+    parser.add_argument('--result-cache', metavar='DIR',
+                       help='Reuse the DBF pair of an earlier run with the same input '
+                            'files and arguments (use with --deterministic)')
+    parser.add_argument('--schema', choices=list(SCHEMAS), default=DEFAULT_SCHEMA,
+                       help=f'SSO format version (default: {DEFAULT_SCHEMA})')
+    parser.add_argument('--validate', action='store_true',
+                       help='Report values that do not fit the field widths/types')
 
     args = parser.parse_args()
 
-    # Create converter
-    converter = CompleteDBFConverter()
+    record_cache = RecordCache(args.record_cache) if args.record_cache else None
 
-    # Read CSVs
-    print("📂 Reading CSV files...")
-    header_data = converter.read_csv(args.header_csv)[0]  # First row only
-    workers_data = converter.read_csv(args.workers_csv)
-    print(f"✅ Loaded header + {len(workers_data)} workers")
-    print()
+    # The record cache is pruned and committed even if the conversion fails
+    try:
+        file_date = args.file_date
+        if file_date is None and args.deterministic:
+            file_date = CompleteDBFConverter.period_date(args.year, args.month)
 
-    # Create output directory
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Create DBF files
-    converter.create_header_file(
-        str(output_dir / 'dskkar00.dbf'),
-        header_data,
-        workers_data,
-        args.year,
-        args.month
-    )
+        # Create converter
+        converter = CompleteDBFConverter(
+            cache_size=args.cache_size,
+            use_numpy=False if args.no_numpy else None,
+            jobs=args.jobs,
+            schema=args.schema,
+            backend=args.backend,
+            record_cache=record_cache,
+            write_queue=args.write_queue,
+            file_date=file_date
+        )
 
-    converter.create_workers_file(
-        str(output_dir / 'dskwor00.dbf'),
-        workers_data,
-        args.workshop_id,
-        args.year,
-        args.month,
-        args.list_no
-    )
+        # Create output directory
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_files = ('dskkar00.dbf', 'dskwor00.dbf')
+
+        # Unchanged input: copy the files of the earlier run
+        result_cache = None
+        cached = False
+        if args.result_cache:
+            result_cache = ResultCache(args.result_cache)
+            if file_date is None:
+                print("⚠️  --result-cache without --deterministic/--file-date: "
+                      "results are only reused on the same day")
+            result_key = converter.result_key([args.header_csv, args.workers_csv],
+                                              args.workshop_id, args.year, args.month,
+                                              args.list_no)
+            cached = result_cache.get(result_key, output_dir, output_files)
+
+        if cached:
+            print(f"♻️  Input unchanged: DBF files copied from result cache "
+                  f"{args.result_cache}/{result_key}")
+        elif args.stream:
+            print("📂 Reading header CSV...")
+            header_data = converter.read_csv(args.header_csv)[0]  # First row only
+            print()
+
+            workers = converter.iter_csv(args.workers_csv)
+            if args.validate:
+                converter.validate_header(header_data)
+                workers = converter.iter_validated(workers)
+
+            # Workers first: totals are accumulated while streaming
+            totals = converter.create_workers_file_streaming(
+                str(output_dir / 'dskwor00.dbf'),
+                workers,
+                args.workshop_id,
+                args.year,
+                args.month,
+                args.list_no,
+                chunk_size=args.chunk_size
+            )
+
+            converter.create_header_file(
+                str(output_dir / 'dskkar00.dbf'),
+                header_data,
+                None,
+                args.year,
+                args.month,
+                totals=totals
+            )
+        else:
+            # Read CSVs
+            print("📂 Reading CSV files...")
+            header_data = converter.read_csv(args.header_csv)[0]  # First row only
+            workers_data = converter.read_csv(args.workers_csv)
+            print(f"✅ Loaded header + {len(workers_data)} workers")
+            print()
+
+            if args.validate:
+                converter.validate_header(header_data)
+                workers_data = list(converter.iter_validated(workers_data))
+                print()
+
+            # Create DBF files
+            converter.create_header_file(
+                str(output_dir / 'dskkar00.dbf'),
+                header_data,
+                workers_data,
+                args.year,
+                args.month
+            )
+
+            converter.create_workers_file(
+                str(output_dir / 'dskwor00.dbf'),
+                workers_data,
+                args.workshop_id,
+                args.year,
+                args.month,
+                args.list_no
+            )
+    finally:
+        if record_cache is not None:
+            record_cache.close()
+
+    if result_cache is not None and not cached:
+        result_cache.put(result_key, output_dir, output_files)
 
     print()
     print("=" * 80)
@@ -14,45 +14,153 @@ Usage:
     # Only show hex (no decoding)
     python dbf_to_csv.py dskwor00.dbf --output workers.csv --include-hex --no-decode
 
+    # Compressed on the fly
+    python dbf_to_csv.py dskwor00.dbf --output workers.csv.gz
+
+    # Some columns of the rows that match a condition
+    python dbf_to_csv.py dskwor00.dbf --output high.csv \
+        --columns PER_NATCOD,DSW_ID1,DSW_MASH,DSW_BIME --where "DSW_MASH>100000000"
+
 Features:
     - Decodes Iran System encoded Persian text to Unicode
     - Supports all Persian letters with context-sensitive forms
     - Optional hex output for verification
+    - Reads the DBF through a memory map (no dbfread needed)
 """
 
+import re
 import csv
+import gzip
 import argparse
+import operator
 import sys
+from contextlib import ExitStack
 from pathlib import Path
-from dbfread import DBF
 
 # Add parent directory to path to import local modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.utils.iran_system_decoder import IranSystemDecoder
+from src.utils.dbf_reader import (DBFReader, parse_date, parse_float, parse_logical,
+                                  parse_numeric)
+from src.utils.sso_schema import all_persian_fields, find_schema
+
+
+# FIELD OP VALUE, e.g. "DSW_MASH>100000000" or "DSW_LNAME = احمدی"
+WHERE_PATTERN = re.compile(r'^\s*(\w+)\s*(>=|<=|!=|==|=|>|<)\s*(.*?)\s*$')
+
+
+class OptionError(ValueError):
+    """A --columns/--where option does not fit the input file"""
+
+
+def parse_where(expression: str) -> tuple:
+    """
+    Parse a --where condition
+
+    Returns:
+        (field name, operator, value)
+
+    Raises:
+        OptionError: The expression is not FIELD OP VALUE
+    """
+    match = WHERE_PATTERN.match(expression)
+    if not match:
+        raise OptionError(f"--where must look like FIELD>VALUE (operators: "
+                         f"> >= < <= = !=), not {expression!r}")
+    return match.groups()
 
 
 class DBFtoCSVConverter:
     """Convert DBF files to CSV format with Iran System decoding"""
 
-    def __init__(self, include_persian_hex: bool = False, decode_persian: bool = True):
+    OPERATORS = {
+        '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+        '=': operator.eq, '==': operator.eq, '!=': operator.ne,
+    }
+
+    def __init__(self, include_persian_hex: bool = False, decode_persian: bool = True,
+                 columns: list = None, where: list = None, chunk_size: int = 4096):
         """
         Initialize converter
 
         Args:
             include_persian_hex: If True, include Persian fields as hex strings
             decode_persian: If True, decode Persian text using Iran System decoder
+            columns: Fields to write, in this order (default: all)
+            where: Conditions (see parse_where()) a record must all meet to
+                   be written; they are tested on the raw field bytes
+            chunk_size: Records converted and written at a time
         """
         self.include_persian_hex = include_persian_hex
         self.decode_persian = decode_persian
+        self.columns = columns
+        self.where = [parse_where(condition) for condition in where or []]
+        self.chunk_size = max(1, chunk_size)
         self.decoder = IranSystemDecoder()
 
+    def _record_test(self, field, field_slice: slice, op: str, value: str):
+        """
+        Function testing one condition on a record view
+
+        Numeric fields are compared as numbers (empty fields never match),
+        Persian fields as decoded text and other fields as latin-1 text
+        (the raw bytes, as in the CSV output).
+        """
+        compare = self.OPERATORS[op]
+
+        if field.type in ('N', 'F'):
+            try:
+                number = float(value)
+            except ValueError:
+                raise OptionError(f"--where {field.name}: {value!r} is not a number")
+
+            def test(record):
+                parsed = parse_numeric(bytes(record[field_slice]))
+                return parsed is not None and compare(parsed, number)
+        elif field.name in all_persian_fields():
+            def test(record):
+                return compare(IranSystemDecoder.decode_field(bytes(record[field_slice])), value)
+        else:
+            def test(record):
+                text = bytes(record[field_slice]).rstrip(b'\0 ')
+                return compare(text.decode('latin-1').strip(), value)
+
+        return test
+
+    @staticmethod
+    def _field_parser(field):
+        """
+        Function turning a field's raw bytes into its value (as dbfread does)
+
+        Character fields stay bytes (spaces and NULs stripped), numeric
+        fields become int/float/None, date fields date/None and logical
+        fields True/False/None. Other types (no SSO file has them) are kept
+        as stripped latin-1 text, which is where this differs from dbfread.
+        """
+        parsers = {'N': parse_numeric, 'F': parse_float, 'D': parse_date, 'L': parse_logical}
+        if field.type == 'C':
+            return lambda data: bytes(data).rstrip(b'\0 ')
+        if field.type in parsers:
+            parse = parsers[field.type]
+            return lambda data: parse(bytes(data))
+        return lambda data: bytes(data).decode('latin-1').strip()
+
     def convert(self, dbf_file: str, output_csv: str):
         """
         Convert DBF to CSV
 
+        Records are converted and written chunk_size at a time, so memory
+        does not grow with the file. An output name ending in .gz is written
+        gzip-compressed.
+
         Args:
             dbf_file: Input DBF file path
             output_csv: Output CSV file path
+
+        Raises:
+            OptionError: A --columns/--where field is not in the file, or a
+                         numeric condition's value is not a number
+            ValueError: The file is not a DBF file or has a corrupt field
         """
         print("=" * 80)
         print("📂 Converting DBF to CSV")
@@ -61,73 +169,129 @@ class DBFtoCSVConverter:
         print(f"Output: {output_csv}")
         print()
 
-        # Persian field names (fields using Iran System encoding)
-        persian_fields = {
-            'DSW_FNAME',    # First name
-            'DSW_LNAME',    # Last name
-            'DSW_DNAME',    # Father's name
-            'DSW_IDPLC',    # ID place
-            'DSW_OCP',      # Occupation
-            'DSW_SEX',      # Sex (مرد/زن)
-            'DSW_NAT',      # Nationality (ایرانی)
-            # Note: DSW_JOB is a numeric job code, not Persian text
-            'DSK_NAME',     # Workshop name (in header file)
-            'DSK_FARM',     # Manager name (in header file)
-            'DSK_ADRS',     # Address (in header file)
-            'DSK_DISC',     # Description (in header file)
-        }
-
-        # Open DBF with latin-1 to preserve raw bytes
-        db = DBF(dbf_file, encoding='latin-1', char_decode_errors='ignore')
-        records = list(db)
-
-        print(f"Total records: {len(records)}")
+        # Persian field names (fields using Iran System encoding) of every
+        # known SSO schema, so files of any version are decoded
+        persian_fields = all_persian_fields()
+
+        # Fields are sliced from the mapped records as raw bytes: Persian
+        # columns are decoded in one batch per chunk, and the hex output
+        # needs the raw bytes anyway
+        with DBFReader(dbf_file) as db, ExitStack() as output:
+            fields = {field.name: field for field in db.fields}
+            field_names = list(self.columns or db.field_names)
+            unknown = [name for name in field_names + [name for name, _, _ in self.where]
+                       if name not in fields]
+            if unknown:
+                raise OptionError(f"No field {', '.join(unknown)} in {dbf_file} "
+                                 f"(fields: {', '.join(fields)})")
+
+            schema = find_schema(db.field_names, [field.length for field in db.fields])
+            print(f"Schema: {schema or 'unknown'}")
+
+            # Only the written fields are parsed, and only for matching records
+            tests = [self._record_test(fields[name], db.slices[name], op, value)
+                     for name, op, value in self.where]
+            parsers = [(name, db.slices[name], self._field_parser(fields[name]))
+                       for name in field_names]
+
+            # Get all field names (including _HEX fields if present)
+            all_fields = []
+            for field in field_names:
+                all_fields.append(field)
+                if self.include_persian_hex and field in persian_fields:
+                    all_fields.append(field + '_HEX')
+
+            writer = None
+            sample = None
+            total = 0
+            converted = 0
+            records = []
+
+            def write_chunk():
+                nonlocal writer, sample, converted
+                output_records = self._output_records(records, field_names, persian_fields)
+                if writer is None:
+                    # Opened with the first record: no file for an empty result
+                    writer = csv.DictWriter(output.enter_context(self._open_output(output_csv)),
+                                            fieldnames=all_fields)
+                    writer.writeheader()
+                    sample = output_records[0]
+                writer.writerows(output_records)
+                converted += len(output_records)
+                records.clear()
+
+            for record in db:
+                total += 1
+                if all(test(record) for test in tests):
+                    records.append({name: parse(record[field_slice])
+                                    for name, field_slice, parse in parsers})
+                    if len(records) == self.chunk_size:
+                        write_chunk()
+            if records:
+                write_chunk()
+
+        print(f"Total records: {total}")
+        if self.where:
+            print(f"Matching --where: {converted}")
         print()
 
-        if len(records) == 0:
-            print("⚠️  No records found in DBF file")
+        if converted == 0:
+            print("⚠️  No matching records" if total else "⚠️  No records found in DBF file")
             return
 
-        # Get field names from first record
-        field_names = list(records[0].keys())
+        print(f"✅ Converted {converted} records")
+        print(f"📄 Output: {output_csv}")
+        print("=" * 80)
+
+        # Show sample
+        print()
+        print("📋 Sample (first record):")
+        print("-" * 80)
+        for key, value in list(sample.items())[:10]:
+            print(f"  {key:<20}: {value}")
+        print()
+
+    @staticmethod
+    def _open_output(output_csv: str):
+        """Open the output CSV for writing (gzip-compressed for a .gz name)"""
+        if str(output_csv).endswith('.gz'):
+            return gzip.open(output_csv, 'wt', compresslevel=6, encoding='utf-8', newline='')
+        return open(output_csv, 'w', encoding='utf-8', newline='')
+
+    def _output_records(self, records: list, field_names: list, persian_fields) -> list:
+        """Turn a chunk of parsed records into CSV rows"""
+        # Decode Persian columns (visual order reversed to logical order)
+        decoded_columns = {}
+        if self.decode_persian:
+            for field_name in field_names:
+                if field_name in persian_fields:
+                    decoded_columns[field_name] = self.decoder.decode_column(
+                        record[field_name] for record in records
+                    )
 
         # Prepare output records
         output_records = []
 
-        for i, record in enumerate(records, 1):
+        for i, record in enumerate(records):
             output_record = {}
 
             for field_name in field_names:
                 value = record.get(field_name)
 
                 if field_name in persian_fields:
-                    # Persian field - decode using Iran System decoder
-                    if value:
-                        if isinstance(value, str):
-                            raw_bytes = value.encode('latin-1').rstrip(b' \x00')
-                        elif isinstance(value, bytes):
-                            raw_bytes = value.rstrip(b' \x00')
-                        else:
-                            raw_bytes = b''
-
-                        # Decode to Unicode if enabled
-                        if self.decode_persian:
-                            decoded_text = self.decoder.decode(raw_bytes)
-                            output_record[field_name] = decoded_text
-                        else:
-                            output_record[field_name] = ''
-
-                        # Include hex if requested
-                        if self.include_persian_hex:
-                            output_record[field_name + '_HEX'] = raw_bytes.hex()
+                    # Persian field - decoded above (empty if decoding is disabled)
+                    if self.decode_persian:
+                        output_record[field_name] = decoded_columns[field_name][i]
                     else:
                         output_record[field_name] = ''
-                        if self.include_persian_hex:
-                            output_record[field_name + '_HEX'] = ''
+
+                    # Include hex if requested
+                    if self.include_persian_hex:
+                        output_record[field_name + '_HEX'] = value.hex() if value else ''
                 else:
-                    # Non-Persian field - copy as-is
-                    if isinstance(value, str):
-                        output_record[field_name] = value.strip()
+                    # Non-Persian field - copy as-is (bytes read as latin-1)
+                    if isinstance(value, bytes):
+                        output_record[field_name] = value.decode('latin-1').strip()
                     elif isinstance(value, (int, float)):
                         output_record[field_name] = value
                     else:
@@ -135,32 +299,7 @@ class DBFtoCSVConverter:
 
             output_records.append(output_record)
 
-        # Write CSV
-        if output_records:
-            with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-                # Get all field names (including _HEX fields if present)
-                all_fields = []
-                for field in field_names:
-                    all_fields.append(field)
-                    if self.include_persian_hex and field in persian_fields:
-                        all_fields.append(field + '_HEX')
-
-                writer = csv.DictWriter(f, fieldnames=all_fields)
-                writer.writeheader()
-                writer.writerows(output_records)
-
-        print(f"✅ Converted {len(output_records)} records")
-        print(f"📄 Output: {output_csv}")
-        print("=" * 80)
-
-        # Show sample
-        if len(output_records) > 0:
-            print()
-            print("📋 Sample (first record):")
-            print("-" * 80)
-            for key, value in list(output_records[0].items())[:10]:
-                print(f"  {key:<20}: {value}")
-            print()
+        return output_records
 
 
 def main():
@@ -168,22 +307,36 @@ def main():
         description='Convert DBF to CSV format with Iran System decoding'
     )
     parser.add_argument('dbf_file', help='Input DBF file')
-    parser.add_argument('--output', '-o', required=True, help='Output CSV file')
+    parser.add_argument('--output', '-o', required=True,
+                       help='Output CSV file (gzip-compressed if the name ends in .gz)')
     parser.add_argument('--include-hex', action='store_true',
                        help='Include Persian fields as hex strings (in addition to decoded text)')
     parser.add_argument('--no-decode', action='store_true',
                        help='Disable Persian text decoding (only show hex if --include-hex is used)')
+    parser.add_argument('--columns', type=lambda value: [name.strip() for name in value.split(',')],
+                       help='Comma-separated fields to write, e.g. PER_NATCOD,DSW_ID1,DSW_MASH')
+    parser.add_argument('--where', action='append', metavar='CONDITION',
+                       help='Only write records where FIELD OP VALUE holds, e.g. '
+                            '"DSW_MASH>100000000" (repeat for AND)')
+    parser.add_argument('--chunk-size', type=int, default=4096,
+                       help='Records converted and written at a time (default: 4096)')
 
     args = parser.parse_args()
 
     # Create converter
-    converter = DBFtoCSVConverter(
-        include_persian_hex=args.include_hex,
-        decode_persian=not args.no_decode
-    )
-
-    # Convert
-    converter.convert(args.dbf_file, args.output)
+    try:
+        converter = DBFtoCSVConverter(
+            include_persian_hex=args.include_hex,
+            decode_persian=not args.no_decode,
+            columns=args.columns,
+            where=args.where,
+            chunk_size=args.chunk_size
+        )
+
+        # Convert (errors in the file itself are not usage errors)
+        converter.convert(args.dbf_file, args.output)
+    except OptionError as e:
+        parser.error(str(e))
 
     print("✅ Conversion complete!")
 
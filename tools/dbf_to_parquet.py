@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DBF to Parquet Converter
+تبدیل فایل‌های DBF تامین اجتماعی به Parquet
+
+Converts dskkar00/dskwor00 files into a Parquet dataset for analysis:
+Persian fields decoded from Iran System to Unicode, numeric fields as int64
+(empty fields are null), compressed column by column and written in row
+groups. Each table is partitioned Hive-style by year, month and workshop:
+
+    lake/dskwor/DSW_YY=4/DSW_MM=7/DSW_ID=1234567890/dskwor-12.parquet
+    lake/dskkar/DSK_YY=4/DSK_MM=7/DSK_ID=1234567890/dskkar-12.parquet
+
+The part file is named after the list number, so converting a list again
+replaces it and other lists of the same month sit next to it.
+
+Usage:
+    python dbf_to_parquet.py dskkar00.dbf dskwor00.dbf --output lake
+
+    # Five years of submissions
+    python dbf_to_parquet.py archive/*/DSKWOR00.DBF --output lake --row-group-size 50000
+
+Reading (the workshop ID stays text, so leading zeros are kept):
+
+    from dbf_to_parquet import read_parquet
+    table = read_parquet('lake', 'dskwor', filters=[('DSW_YY', '=', 4)])
+
+Requires numpy and pyarrow.
+"""
+
+import os
+import re
+import sys
+import argparse
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import quote
+
+# Add parent directory to path to import local modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.utils.dbf_columns import load_dbf_columns
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional: needed (with pyarrow) for Parquet output
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # Optional: only this tool needs pyarrow
+
+# Field prefix -> table name
+TABLES = {'DSK_': 'dskkar', 'DSW_': 'dskwor'}
+
+# Partition value of an empty field (read back as null)
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+
+def partition_fields(table: str) -> list:
+    """Partition fields of a table: year, month, workshop ID"""
+    prefix = {name: prefix for prefix, name in TABLES.items()}[table]
+    return [prefix + 'YY', prefix + 'MM', prefix + 'ID']
+
+
+def read_parquet(root: str, table: str = 'dskwor', filters: list = None):
+    """
+    Read a converted table with its partition fields
+
+    Args:
+        root: Output directory of dbf_to_parquet
+        table: 'dskwor' or 'dskkar'
+        filters: pyarrow filters, e.g. [('DSW_YY', '=', 4)]
+
+    Returns:
+        pyarrow Table (partition fields last)
+    """
+    year, month, workshop = partition_fields(table)
+    schema = pa.schema([(year, pa.int64()), (month, pa.int64()), (workshop, pa.string())])
+    return pq.read_table(Path(root) / table, filters=filters,
+                         partitioning=ds.partitioning(schema, flavor='hive'))
+
+
+class DBFtoParquetConverter:
+    """Convert SSO DBF files to a partitioned Parquet dataset"""
+
+    COMPRESSIONS = ('zstd', 'snappy', 'gzip', 'none')
+
+    def __init__(self, row_group_size: int = 65536, compression: str = 'zstd'):
+        """
+        Initialize converter
+
+        Args:
+            row_group_size: Maximum records per Parquet row group
+            compression: Parquet compression codec (see COMPRESSIONS)
+
+        Raises:
+            ImportError: numpy or pyarrow is not installed
+        """
+        if np is None or pa is None:
+            raise ImportError("numpy and pyarrow are required for Parquet output "
+                              "(pip install numpy pyarrow)")
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r} "
+                             f"(choose from {', '.join(self.COMPRESSIONS)})")
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+
+    def read_table(self, dbf_file: str) -> tuple:
+        """
+        Read a DBF file as a typed Arrow table
+
+        Args:
+            dbf_file: dskkar or dskwor DBF file
+
+        Returns:
+            (table name, pyarrow Table)
+
+        Raises:
+            ValueError: The file lacks the partition fields of both tables
+        """
+        columns = load_dbf_columns(dbf_file)
+        names = [name for name in TABLES.values() if set(partition_fields(name)) <= set(columns)]
+        if not names:
+            raise ValueError(f"{dbf_file}: not an SSO dskkar/dskwor file")
+
+        arrays = [self._column(columns, field) for field in columns.fields]
+        table = pa.table(arrays, names=[field.name for field in columns.fields])
+        return names[0], table
+
+    @staticmethod
+    def _column(columns, field):
+        """Arrow array of one field: int64/float64 for numbers, text otherwise"""
+        values = columns[field.name]
+        if field.type not in ('N', 'F'):
+            return pa.array(values, type=pa.string())
+
+        # Empty fields are null
+        number_type = pa.int64() if values.dtype == np.int64 else pa.float64()
+        return pa.array(values, type=number_type, mask=columns.blanks(field.name))
+
+    def convert(self, dbf_file: str, output_dir: str) -> list:
+        """
+        Convert a DBF file into the dataset under output_dir
+
+        Args:
+            dbf_file: dskkar or dskwor DBF file
+            output_dir: Dataset root (one subdirectory per table)
+
+        Returns:
+            [(part file, records), ...]
+        """
+        name, table = self.read_table(dbf_file)
+        keys = partition_fields(name)
+        list_field = keys[0][:4] + 'LISTNO'
+
+        # Records by partition and list number (normally a single group)
+        groups = defaultdict(list)
+        key_columns = [table.column(key).to_pylist() for key in keys]
+        if list_field in table.column_names:
+            key_columns.append(table.column(list_field).to_pylist())
+        for row, group in enumerate(zip(*key_columns)):
+            groups[group].append(row)
+
+        data = table.drop_columns(keys)
+        parts = []
+        for group, rows in groups.items():
+            directory = Path(output_dir, name, *(
+                f"{key}={NULL_PARTITION if value in (None, '') else quote(str(value), safe='')}"
+                for key, value in zip(keys, group)))
+            list_no = group[3] if len(group) > 3 else ''
+            stem = f"{name}-{re.sub(r'[^0-9A-Za-z_-]', '_', list_no)}" if list_no else name
+            path = directory / f"{stem}.parquet"
+
+            directory.mkdir(parents=True, exist_ok=True)
+            # Written under a hidden name and renamed: readers never see a partial file
+            temp = directory / f".{stem}.parquet.tmp"
+            pq.write_table(data if len(groups) == 1 else data.take(rows), temp,
+                           row_group_size=self.row_group_size,
+                           compression=self.compression)
+            os.replace(temp, path)
+            parts.append((str(path), len(rows)))
+
+        return parts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert SSO DBF files to a partitioned Parquet dataset'
+    )
+    parser.add_argument('dbf_files', nargs='+', help='dskkar/dskwor DBF files')
+    parser.add_argument('--output', '-o', required=True, help='Dataset directory')
+    parser.add_argument('--row-group-size', type=int, default=65536,
+                       help='Maximum records per row group (default: 65536)')
+    parser.add_argument('--compression', choices=DBFtoParquetConverter.COMPRESSIONS,
+                       default='zstd', help='Compression codec (default: zstd)')
+
+    args = parser.parse_args()
+
+    try:
+        converter = DBFtoParquetConverter(args.row_group_size, args.compression)
+    except ImportError as e:
+        parser.error(str(e))
+
+    print("=" * 80)
+    print("📂 Converting DBF to Parquet")
+    print("=" * 80)
+
+    failed = 0
+    for dbf_file in args.dbf_files:
+        try:
+            parts = converter.convert(dbf_file, args.output)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            failed += 1
+            continue
+        if not parts:
+            print(f"⚠️  {dbf_file}: No records found in DBF file")
+        for path, records in parts:
+            print(f"✅ {dbf_file} → {path} ({records} records)")
+
+    print("=" * 80)
+    if failed:
+        print(f"❌ {failed} of {len(args.dbf_files)} files failed")
+        sys.exit(1)
+    print(f"✅ Conversion complete! Dataset: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
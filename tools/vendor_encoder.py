@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vendor the Iran System encoder into sap_to_dbf_standalone.py
+کپی انکودر Iran System داخل اسکریپت مستقل SAP
+
+sap_integration/sap_to_dbf_standalone.py must run on the SAP server without
+the rest of the repository, so it carries its own copy of the encoder. This
+script regenerates that copy from the compiled tables of
+src/utils/iran_system_encoding.py, so both paths produce identical bytes.
+The script's field lists are vendored the same way from the 'sap-2024'
+schema of src/utils/sso_schema.py.
+
+Usage:
+    # Rewrite the vendored blocks after changing the encoder or the schema
+    python tools/vendor_encoder.py
+
+    # Only check that the vendored blocks are up to date (exit code 1 if not)
+    python tools/vendor_encoder.py --check
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils import iran_system_encoding
+from utils.iran_system_encoding import IranSystemEncoder
+from utils.sso_schema import get_schema
+
+
+STANDALONE_SCRIPT = (Path(__file__).parent.parent /
+                     'sap_integration' / 'sap_to_dbf_standalone.py')
+
+BEGIN_MARKER = '# BEGIN VENDORED iran_system_encoding'
+END_MARKER = '# END VENDORED iran_system_encoding'
+
+SCHEMA_BEGIN_MARKER = '# BEGIN VENDORED sso_schema'
+SCHEMA_END_MARKER = '# END VENDORED sso_schema'
+
+# Schema written by the standalone script
+STANDALONE_SCHEMA = 'sap-2024'
+
+ENGINE_TEMPLATE = '''{begin}
+# Generated by tools/vendor_encoder.py from src/utils/iran_system_encoding.py
+# Do not edit by hand - change the encoder and run the vendor script again.
+
+_IS_NORMALIZATION_TABLE = {normalization}
+
+_IS_PREV_CLASS = tuple(flag << 9 for flag in bytes.fromhex(
+{prev_class}))
+
+_IS_NEXT_CLASS = tuple(flag << 8 for flag in bytes.fromhex(
+{next_class}))
+
+_IS_FORM_TABLE = bytes.fromhex(
+{forms})
+
+
+class IranSystemEncoder:
+    """تبدیل متن فارسی به Iran System encoding (same engine as iran_system_encoding.py)"""
+
+    def __init__(self, cache_size=8192):
+        self.cache_size = cache_size
+        self.cache = {{}}
+
+    @staticmethod
+    def unicode_to_iran_system(text):
+        """Convert Unicode Persian text to Iran System encoding"""
+        normalized = text.translate(_IS_NORMALIZATION_TABLE)
+        if not normalized:
+            return b'  '
+
+        src = (" " + normalized + " ").encode('cp1256', errors='replace')
+        prev_class = _IS_PREV_CLASS
+        next_class = _IS_NEXT_CLASS
+        forms = _IS_FORM_TABLE
+        result = bytes([forms[prev_class[p] | next_class[n] | c]
+                        for p, c, n in zip(src, src[1:], src[2:])])
+
+        # لا ligature
+        if b'\\xf3\\x91' in result:
+            result = result.replace(b'\\xf3\\x91', b'\\xf2')
+
+        # Reverse for RTL (unless it's a number)
+        if not text.strip().replace(' ', '').isdigit():
+            result = result[::-1]
+        return result
+
+    def encode(self, text):
+        """تبدیل متن فارسی به Iran System encoding (cached)"""
+        result = self.cache.get(text)
+        if result is None:
+            result = self.unicode_to_iran_system(text)
+            if len(self.cache) < self.cache_size:
+                self.cache[text] = result
+        return result
+{end}'''
+
+SCHEMA_TEMPLATE = '''{begin}
+# Generated by tools/vendor_encoder.py from the {version!r} schema of src/utils/sso_schema.py
+# Do not edit by hand - change the schema and run the vendor script again.
+
+_HEADER_FIELDS = {header_fields}
+
+_WORKER_FIELDS = {worker_fields}
+
+_PERSIAN_FIELDS = {persian_fields}
+{end}'''
+
+
+def _hex_lines(data: bytes, width: int = 64) -> str:
+    """Format bytes as indented hex string literals, width bytes per line"""
+    text = data.hex()
+    step = width * 2
+    return '\n'.join(f"    '{text[i:i + step]}'" for i in range(0, len(text), step))
+
+
+def generate_block() -> str:
+    """Generate the vendored encoder block from the canonical module"""
+    normalization = ',\n'.join(
+        f'    {code}: {value!r}'
+        for code, value in sorted(IranSystemEncoder.NORMALIZATION_TABLE.items())
+    )
+
+    prev_flags = bytes(c >> 9 for c in iran_system_encoding._PREV_CLASS)
+    next_flags = bytes(c >> 8 for c in iran_system_encoding._NEXT_CLASS)
+
+    return ENGINE_TEMPLATE.format(
+        begin=BEGIN_MARKER,
+        end=END_MARKER,
+        normalization='{\n' + normalization + ',\n}',
+        prev_class=_hex_lines(prev_flags),
+        next_class=_hex_lines(next_flags),
+        forms=_hex_lines(iran_system_encoding._FORM_TABLE),
+    )
+
+
+def _field_list(fields: list) -> str:
+    """Format a field list as a list literal, one field per line"""
+    return '[\n' + ''.join(f'    {field!r},\n' for field in fields) + ']'
+
+
+def generate_schema_block(version: str = STANDALONE_SCHEMA) -> str:
+    """Generate the vendored field lists from the schema registry"""
+    schema = get_schema(version)
+    persian_fields = ''.join(f'    {name!r},\n' for name in sorted(schema.persian_fields))
+
+    return SCHEMA_TEMPLATE.format(
+        begin=SCHEMA_BEGIN_MARKER,
+        end=SCHEMA_END_MARKER,
+        version=version,
+        header_fields=_field_list(schema.header_fields),
+        worker_fields=_field_list(schema.worker_fields),
+        persian_fields='{\n' + persian_fields + '}',
+    )
+
+
+def extract_block(source: str, begin: str = BEGIN_MARKER, end: str = END_MARKER) -> str:
+    """Return the vendored block (markers included) from a script's source"""
+    start = source.index(begin)
+    stop = source.index(end) + len(end)
+    return source[start:stop]
+
+
+# Vendored blocks: (begin marker, end marker, generator)
+BLOCKS = [
+    (BEGIN_MARKER, END_MARKER, generate_block),
+    (SCHEMA_BEGIN_MARKER, SCHEMA_END_MARKER, generate_schema_block),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Vendor the Iran System encoder and SSO schema into sap_to_dbf_standalone.py'
+    )
+    parser.add_argument('--check', action='store_true',
+                       help='Only check that the vendored copies are up to date')
+    parser.add_argument('--script', default=str(STANDALONE_SCRIPT),
+                       help='Script containing the vendored blocks')
+
+    args = parser.parse_args()
+
+    script = Path(args.script)
+    source = script.read_text(encoding='utf-8')
+    updated = source
+    for begin, end, generate in BLOCKS:
+        updated = updated.replace(extract_block(updated, begin, end), generate())
+
+    if args.check:
+        if updated != source:
+            print(f"❌ Vendored encoder/schema in {script} is out of date")
+            print("Run: python tools/vendor_encoder.py")
+            sys.exit(1)
+        print(f"✅ Vendored encoder and schema in {script} are up to date")
+        return
+
+    if updated == source:
+        print(f"✅ Vendored encoder and schema in {script} are already up to date")
+        return
+
+    script.write_text(updated, encoding='utf-8')
+    print(f"✅ Vendored encoder and schema written to {script}")
+
+
+if __name__ == '__main__':
+    main()